@@ -6754,7 +6754,8 @@ def discover_refresh(prd, regenerate_docs, regenerate_pack, question_set, force)
         # Check if we need to force refresh or if cache is invalid
         if not force:
             # Check if cache is still valid
-            if engine._is_cache_valid(Path(original_target), {'question_set': question_set}, force):
+            cache_key = engine._generate_cache_key(Path(original_target), {'question_set': question_set})
+            if engine._is_cache_valid(cache_key, force):
                 click.echo("✅ Cache is still valid, skipping refresh")
                 return
         
@@ -6,13 +6,178 @@ and patterns to understand the codebase at a deeper level.
 """
 
 import ast
+import copy
+import hashlib
+import importlib
+import os
 import re
+import tempfile
 import time
 import json
+from collections import deque
+from itertools import islice
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Set, Tuple
 from pathlib import Path
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+
+# Decision points for cyclomatic complexity (standard McCabe). else/finally/
+# default and ':' are intentionally excluded: they do not add a branch.
+COMPLEXITY_TOKENS = ('if', 'elif', 'for', 'while', 'except', 'and', 'or', 'case', '&&', '||')
+COMPLEXITY_PATTERN = re.compile(
+    r'(?<= )(?:' + '|'.join(re.escape(token) for token in COMPLEXITY_TOKENS) + r')(?=[ (\n])'
+)
+
+# Source suffixes with language-specific patterns
+PYTHON_SUFFIXES = frozenset({'.py'})
+JS_SUFFIXES = frozenset({'.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs'})
+
+# Function definitions: Python def, JavaScript function (exported or not)
+# and arrow functions bound to a const
+PY_FUNCTION_PATTERN = re.compile(r'\bdef\s+\w+\s*\(')
+JS_FUNCTION_PATTERN = re.compile(r'\bfunction\s+\w+\s*\(|\bconst\s+\w+\s*=\s*\(')
+FUNCTION_PATTERN = re.compile(f'{PY_FUNCTION_PATTERN.pattern}|{JS_FUNCTION_PATTERN.pattern}')
+FUNCTION_PATTERNS_BY_SUFFIX = {
+    **{suffix: PY_FUNCTION_PATTERN for suffix in PYTHON_SUFFIXES},
+    **{suffix: JS_FUNCTION_PATTERN for suffix in JS_SUFFIXES},
+}
+
+# Markers used by the design-pattern heuristics; files with other suffixes
+# keep the Python markers
+CONSTRUCTOR_MARKERS = {suffix: 'constructor(' for suffix in JS_SUFFIXES}
+FUNCTION_MARKERS = {suffix: 'function ' for suffix in JS_SUFFIXES}
+
+# Class definitions (Python and JavaScript, exported or not)
+CLASS_PATTERN = re.compile(r'\bclass\s+\w+')
+
+# Parser modules imported on first use by the manifest detectors
+_lazy_modules: Dict[str, Any] = {}
+
+
+def _lazy_import(name: str) -> Optional[Any]:
+    """Import a module on first use and cache it, or None if unavailable."""
+    if name not in _lazy_modules:
+        try:
+            _lazy_modules[name] = importlib.import_module(name)
+        except ImportError:
+            _lazy_modules[name] = None
+    return _lazy_modules[name]
+
+
+def _current_umask() -> int:
+    """Return the process umask (it can only be read by setting it)."""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Mode open(path, 'w') would create files with. Atomic writes go through
+# mkstemp, which creates 0600, so they chmod to this before the swap.
+NEW_FILE_MODE = 0o666 & ~_current_umask()
+
+
+# Analyses kept in the in-memory metrics history
+MAX_METRICS_HISTORY = 100
+
+# Trend name -> dot-separated metric path it is computed from
+TREND_METRICS = {
+    'features_trend': 'features.count',
+    'gaps_trend': 'gaps.count',
+    'quality_trend': 'quality_metrics.overall_score',
+    'complexity_trend': 'complexity_metrics.cyclomatic_complexity',
+    'performance_trend': 'total_elapsed_seconds',
+    'success_rate_trend': 'summary.success_rate'
+}
+
+# discovery_report.json format version; part of the analysis fingerprint
+REPORT_VERSION = '1.0.0'
+
+# Namespace-qualified pom.xml tags, built once
+MAVEN_NS = '{http://maven.apache.org/POM/4.0.0}'
+MAVEN_DEPENDENCY_TAG = MAVEN_NS + 'dependency'
+MAVEN_GROUP_ID_TAG = MAVEN_NS + 'groupId'
+MAVEN_ARTIFACT_ID_TAG = MAVEN_NS + 'artifactId'
+MAVEN_VERSION_TAG = MAVEN_NS + 'version'
+MAVEN_COORDINATE_TAGS = frozenset({MAVEN_GROUP_ID_TAG, MAVEN_ARTIFACT_ID_TAG, MAVEN_VERSION_TAG})
+
+# Phase result keys counted into detection_results['detection_types']
+DETECTION_TYPES = ('technologies', 'frameworks', 'libraries', 'tools')
+
+# Manifests _detect_from_config_files reads languages and dependencies from
+MANIFEST_FILES = frozenset({
+    'package.json', 'requirements.txt', 'pyproject.toml', 'go.mod', 'Cargo.toml', 'pom.xml'
+})
+
+# Conventional top-level directories reported as project structure
+COMMON_DIRS = frozenset({
+    'src', 'app', 'apps', 'lib', 'libs', 'packages', 'components',
+    'pages', 'views', 'templates', 'static', 'public', 'assets',
+    'config', 'configs', 'settings', 'utils', 'helpers', 'services',
+    'models', 'entities', 'controllers', 'routes', 'middleware',
+    'tests', 'test', 'specs', 'docs', 'documentation'
+})
+
+# npm package name -> test runner / build tool it indicates
+TEST_RUNNER_PACKAGES = {
+    'jest': 'Jest',
+    'vitest': 'Vitest',
+    'mocha': 'Mocha',
+    'jasmine': 'Jasmine',
+    'cypress': 'Cypress',
+    'playwright': 'Playwright',
+    'puppeteer': 'Puppeteer'
+}
+BUILD_TOOL_PACKAGES = {
+    'webpack': 'Webpack',
+    'vite': 'Vite',
+    'rollup': 'Rollup',
+    'esbuild': 'esbuild',
+    'parcel': 'Parcel',
+    'babel': 'Babel',
+    'typescript': 'TypeScript Compiler'
+}
+
+# Top-level config file -> test runner / build tool it indicates
+TEST_CONFIG_FILES = {
+    'jest.config.js': 'Jest',
+    'jest.config.ts': 'Jest',
+    'vitest.config.js': 'Vitest',
+    'vitest.config.ts': 'Vitest',
+    'pytest.ini': 'pytest',
+    'cypress.config.js': 'Cypress',
+    'playwright.config.js': 'Playwright'
+}
+BUILD_CONFIG_FILES = {
+    'webpack.config.js': 'Webpack',
+    'webpack.config.ts': 'Webpack',
+    'vite.config.js': 'Vite',
+    'vite.config.ts': 'Vite',
+    'rollup.config.js': 'Rollup',
+    'rollup.config.ts': 'Rollup',
+    'babel.config.js': 'Babel',
+    'babel.config.json': 'Babel',
+    'tsconfig.json': 'TypeScript Compiler',
+    'tsconfig.build.json': 'TypeScript Compiler',
+    'build.gradle': 'Gradle',
+    'Makefile': 'Make'
+}
+
+# Test runner requirement names at the start of a requirements.txt line,
+# followed by a version specifier, extras, marker, whitespace or line end
+REQUIREMENTS_TEST_RUNNER_PATTERN = re.compile(
+    r'^[ \t]*(pytest|unittest|nose|tox)(?=[<>=!~\[;\s]|$)', re.MULTILINE | re.IGNORECASE
+)
+
+# Directories never descended into when walking a project tree
+WALK_SKIP_DIRS = frozenset({'node_modules', '.git', 'venv', '.venv', 'dist', '__pycache__'})
+
 
 class CodeAnalyzer:
     """Performs deep code analysis for discovery."""
@@ -20,34 +185,51 @@ class CodeAnalyzer:
     def __init__(self):
         """Initialize the code analyzer."""
         self.analysis_cache = {}
-        self.metrics_history = []
+        self.metrics_history: deque = deque(maxlen=MAX_METRICS_HISTORY)
+        self._trend_series: Dict[str, Dict[str, Any]] = {}
         self.start_time = None
         self.end_time = None
+        self._phase_ns: Dict[str, int] = {}
+        self._failed_phases: Set[str] = set()
     
-    def analyze(self, target: Path, interview_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze(self, target: Path, interview_data: Dict[str, Any],
+                prefetched: Optional[Dict[Any, Any]] = None) -> Dict[str, Any]:
         """Perform deep analysis of the target code.
         
         Args:
             target: Path to analyze
             interview_data: Data from interview phase
+            prefetched: Cache entries returned by ``prefetch(target)``
             
         Returns:
             Analysis results dictionary with metrics
         """
+        self.analysis_cache.clear()
+        if prefetched:
+            self.analysis_cache.update(prefetched)
+        
+        # Reuse the last report if neither the target nor the interview changed
+        fingerprint = self._analysis_fingerprint(target, interview_data)
+        cached_analysis = self._load_cached_analysis(fingerprint)
+        if cached_analysis is not None:
+            return cached_analysis
+        
         # Start timing
         self.start_time = time.time()
+        self._phase_ns = {}
+        self._failed_phases = set()
         
         # Perform analysis with timing for each phase
         analysis_phases = {
-            'detected': self._timed_analysis('detect_stack_and_structure', self._detect_stack_and_structure, target),
-            'relationships': self._timed_analysis('analyze_relationships', self._analyze_relationships, target),
-            'complexity_metrics': self._timed_analysis('calculate_complexity_metrics', self._calculate_complexity_metrics, target),
-            'code_patterns': self._timed_analysis('identify_code_patterns', self._identify_code_patterns, target),
-            'architecture': self._timed_analysis('analyze_architecture', self._analyze_architecture, target),
-            'quality_indicators': self._timed_analysis('assess_quality_indicators', self._assess_quality_indicators, target),
-            'security_concerns': self._timed_analysis('check_security_concerns', self._check_security_concerns, target),
-            'performance_indicators': self._timed_analysis('analyze_performance_indicators', self._analyze_performance_indicators, target),
-            'maintainability': self._timed_analysis('assess_maintainability', self._assess_maintainability, target)
+            'detected': self._timed_analysis('detected', self._detect_stack_and_structure, target),
+            'relationships': self._timed_analysis('relationships', self._analyze_relationships, target),
+            'complexity_metrics': self._timed_analysis('complexity_metrics', self._calculate_complexity_metrics, target),
+            'code_patterns': self._timed_analysis('code_patterns', self._identify_code_patterns, target),
+            'architecture': self._timed_analysis('architecture', self._analyze_architecture, target),
+            'quality_indicators': self._timed_analysis('quality_indicators', self._assess_quality_indicators, target),
+            'security_concerns': self._timed_analysis('security_concerns', self._check_security_concerns, target),
+            'performance_indicators': self._timed_analysis('performance_indicators', self._analyze_performance_indicators, target),
+            'maintainability': self._timed_analysis('maintainability', self._assess_maintainability, target)
         }
         
         # End timing
@@ -61,8 +243,86 @@ class CodeAnalyzer:
         analysis_data['metrics'] = metrics
         
         # Store metrics in history
-        self._store_metrics_history(metrics)
+        self._store_metrics_history(metrics, analysis_phases, fingerprint)
+        
+        return analysis_data
+    
+    def prefetch(self, target: Path) -> Dict[Any, Any]:
+        """Do the target's top-level scan or file read ahead of ``analyze()``.
+        
+        Needs nothing from the interview, so the engine runs it on a background
+        thread while the interview is conducted and passes the result to
+        ``analyze(prefetched=...)``.
+        
+        Args:
+            target: Path that will be analyzed
+            
+        Returns:
+            Analysis cache entries to seed the next analysis with
+        """
+        self.analysis_cache.clear()
+        try:
+            if target.is_dir():
+                self._scan_target(target)
+            elif target.is_file():
+                self._read_source(target)
+        except (OSError, UnicodeDecodeError):
+            pass  # The analysis phases report unreadable targets themselves
+        return dict(self.analysis_cache)
+    
+    def _analysis_fingerprint(self, target: Path, interview_data: Dict[str, Any]) -> Optional[str]:
+        """Fingerprint everything an analysis of ``target`` depends on.
+        
+        Covers the target's own mtime/size and, for directories, the mtime/size
+        of every top-level file the detectors may read, plus the interview data.
+        
+        Args:
+            target: Path to analyze
+            interview_data: Data from interview phase
+            
+        Returns:
+            Short hex digest, or None if the target cannot be stat'ed
+        """
+        try:
+            target_stat = target.stat()
+            parts = [REPORT_VERSION, str(target), target_stat.st_mtime_ns, target_stat.st_size]
+            if target.is_dir():
+                files, dirs = self._scan_target(target)
+                entries = self._list_entries(target)
+                for name in sorted(files):
+                    entry_stat = entries[name].stat()
+                    parts.append((name, entry_stat.st_mtime_ns, entry_stat.st_size))
+                if '.github' in dirs:
+                    parts.append(('.github/workflows', 'workflows' in self._scan_target(target / '.github')[1]))
+            parts.append(json.dumps(interview_data, sort_keys=True, default=str))
+        except OSError:
+            return None
+        
+        return hashlib.sha256(repr(parts).encode()).hexdigest()[:16]
+    
+    def _load_cached_analysis(self, fingerprint: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Load the analysis stored in discovery_report.json if its fingerprint matches.
+        
+        Args:
+            fingerprint: Fingerprint of the requested analysis
+            
+        Returns:
+            Analysis results dictionary with metrics, or None on a miss
+        """
+        if fingerprint is None:
+            return None
+        
+        try:
+            with open(self._get_report_path(), 'r', encoding='utf-8') as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            return None
         
+        if report.get('report_metadata', {}).get('fingerprint') != fingerprint or 'analysis' not in report:
+            return None
+        
+        analysis_data = report['analysis']
+        analysis_data['metrics'] = report['metrics']
         return analysis_data
     
     def _analyze_relationships(self, target: Path) -> Dict[str, Any]:
@@ -86,8 +346,7 @@ class CodeAnalyzer:
     def _analyze_python_relationships(self, file_path: Path) -> Dict[str, Any]:
         """Analyze Python-specific relationships."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_source(file_path)
             
             tree = ast.parse(content)
             
@@ -142,8 +401,7 @@ class CodeAnalyzer:
     def _analyze_js_relationships(self, file_path: Path) -> Dict[str, Any]:
         """Analyze JavaScript/TypeScript-specific relationships."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_source(file_path)
             
             imports = []
             exports = []
@@ -193,8 +451,7 @@ class CodeAnalyzer:
             return {}
         
         try:
-            with open(target, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._read_source(target)
             
             lines = content.splitlines()
             non_empty_lines = [line for line in lines if line.strip()]
@@ -204,7 +461,7 @@ class CodeAnalyzer:
                 'total_lines': len(lines),
                 'cyclomatic_complexity': self._calculate_cyclomatic_complexity(content),
                 'nesting_depth': self._calculate_max_nesting_depth(content),
-                'function_count': self._count_functions(content),
+                'function_count': self._count_functions(content, target.suffix),
                 'class_count': self._count_classes(content)
             }
             
@@ -214,19 +471,8 @@ class CodeAnalyzer:
     
     def _calculate_cyclomatic_complexity(self, content: str) -> int:
         """Calculate cyclomatic complexity."""
-        # Simple complexity calculation based on control flow statements
-        complexity_keywords = [
-            'if', 'elif', 'else', 'for', 'while', 'try', 'except', 'finally',
-            'and', 'or', 'case', 'default', '&&', '||', '?', ':', 'switch'
-        ]
-        
-        complexity = 1  # Base complexity
-        for keyword in complexity_keywords:
-            complexity += content.count(f' {keyword} ')
-            complexity += content.count(f' {keyword}(')
-            complexity += content.count(f' {keyword}\n')
-        
-        return complexity
+        # Base complexity plus one per control flow decision point
+        return 1 + len(COMPLEXITY_PATTERN.findall(content))
     
     def _calculate_max_nesting_depth(self, content: str) -> int:
         """Calculate maximum nesting depth."""
@@ -249,33 +495,20 @@ class CodeAnalyzer:
         
         return max_depth // 4  # Assuming 4-space indentation
     
-    def _count_functions(self, content: str) -> int:
-        """Count function definitions."""
-        function_patterns = [
-            r'def\s+\w+\s*\(',  # Python
-            r'function\s+\w+\s*\(',  # JavaScript
-            r'const\s+\w+\s*=\s*\(',  # Arrow functions
-            r'export\s+function\s+\w+\s*\('  # Exported functions
-        ]
-        
-        count = 0
-        for pattern in function_patterns:
-            count += len(re.findall(pattern, content))
-        
-        return count
+    def _count_functions(self, content: str, suffix: Optional[str] = None) -> int:
+        """Count function definitions.
+        
+        Args:
+            content: Source text
+            suffix: File suffix used to pick the language's pattern; unknown
+                or missing suffixes scan for every language's definitions
+        """
+        pattern = FUNCTION_PATTERNS_BY_SUFFIX.get(suffix, FUNCTION_PATTERN)
+        return len(pattern.findall(content))
     
     def _count_classes(self, content: str) -> int:
         """Count class definitions."""
-        class_patterns = [
-            r'class\s+\w+',  # Python and JavaScript
-            r'export\s+class\s+\w+'  # Exported classes
-        ]
-        
-        count = 0
-        for pattern in class_patterns:
-            count += len(re.findall(pattern, content))
-        
-        return count
+        return len(CLASS_PATTERN.findall(content))
     
     def _identify_code_patterns(self, target: Path) -> List[Dict[str, Any]]:
         """Identify common code patterns."""
@@ -283,14 +516,16 @@ class CodeAnalyzer:
         
         if target.is_file():
             try:
-                with open(target, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = self._read_source(target)
                 
                 # Design patterns
-                if 'class ' in content and 'def __init__' in content:
+                constructor_marker = CONSTRUCTOR_MARKERS.get(target.suffix, 'def __init__')
+                function_marker = FUNCTION_MARKERS.get(target.suffix, 'def ')
+                
+                if 'class ' in content and constructor_marker in content:
                     patterns.append({'type': 'design_pattern', 'name': 'class_based', 'confidence': 0.8})
                 
-                if 'def ' in content and 'return ' in content:
+                if function_marker in content and 'return ' in content:
                     patterns.append({'type': 'design_pattern', 'name': 'functional', 'confidence': 0.7})
                 
                 if 'import ' in content and 'from ' in content:
@@ -323,8 +558,7 @@ class CodeAnalyzer:
         
         if target.is_file():
             try:
-                with open(target, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = self._read_source(target)
                 
                 # Detect architectural layers
                 if 'controller' in target.name.lower() or 'ctrl' in target.name.lower():
@@ -340,7 +574,8 @@ class CodeAnalyzer:
                     architecture['layers'].append('view')
                 
                 # Detect architectural patterns
-                if 'class ' in content and 'def __init__' in content:
+                constructor_marker = CONSTRUCTOR_MARKERS.get(target.suffix, 'def __init__')
+                if 'class ' in content and constructor_marker in content:
                     architecture['patterns'].append('object_oriented')
                 
                 if 'async ' in content or 'await ' in content:
@@ -365,8 +600,7 @@ class CodeAnalyzer:
         
         if target.is_file():
             try:
-                with open(target, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = self._read_source(target)
                 
                 # Documentation assessment
                 doc_lines = len([line for line in content.splitlines() if line.strip().startswith('#')])
@@ -406,8 +640,7 @@ class CodeAnalyzer:
         
         if target.is_file():
             try:
-                with open(target, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = self._read_source(target)
                 
                 # Common security issues
                 if 'eval(' in content:
@@ -450,8 +683,7 @@ class CodeAnalyzer:
         
         if target.is_file():
             try:
-                with open(target, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = self._read_source(target)
                 
                 # Count loops
                 loop_patterns = ['for ', 'while ', 'for(', 'while(']
@@ -484,8 +716,7 @@ class CodeAnalyzer:
         
         if target.is_file():
             try:
-                with open(target, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = self._read_source(target)
                 
                 score = 100
                 factors = []
@@ -599,14 +830,17 @@ class CodeAnalyzer:
             'build_tools': []
         }
         
+        # Parse manifests once and share them across detectors
+        manifests = self._load_manifests(target)
+        
         # Detect languages and frameworks from config files
-        detected.update(self._detect_from_config_files(target))
+        detected.update(self._detect_from_config_files(target, manifests))
         
         # Detect project structure
         detected['project_structure'] = self._detect_project_structure(target)
         
         # Detect test runners
-        detected['test_runners'] = self._detect_test_runners(target)
+        detected['test_runners'] = self._detect_test_runners(target, manifests)
         
         # Detect CI systems
         detected['ci_systems'] = self._detect_ci_systems(target)
@@ -615,12 +849,33 @@ class CodeAnalyzer:
         detected['package_managers'] = self._detect_package_managers(target)
         
         # Detect build tools
-        detected['build_tools'] = self._detect_build_tools(target)
+        detected['build_tools'] = self._detect_build_tools(target, manifests)
         
         return detected
     
-    def _detect_from_config_files(self, target: Path) -> Dict[str, Any]:
+    def _load_manifests(self, target: Path) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Parse the project manifests present in a directory.
+        
+        Args:
+            target: Directory to inspect
+            
+        Returns:
+            Parsed manifests keyed by 'package_json', 'pyproject' and
+            'cargo_toml'; missing or unparseable manifests map to None
+        """
+        files, dirs = self._scan_target(target)
+        return {
+            'package_json': self._load_json(target / 'package.json') if 'package.json' in files else None,
+            'pyproject': self._load_toml(target / 'pyproject.toml') if 'pyproject.toml' in files else None,
+            'cargo_toml': self._load_toml(target / 'Cargo.toml') if 'Cargo.toml' in files else None
+        }
+    
+    def _detect_from_config_files(self, target: Path,
+                                  manifests: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Detect technologies from configuration files."""
+        if manifests is None:
+            manifests = self._load_manifests(target)
+        
         detected = {
             'languages': [],
             'frameworks': [],
@@ -628,69 +883,66 @@ class CodeAnalyzer:
             'package_managers': []
         }
         
+        files, dirs = self._scan_target(target)
+        
+        # Most targets have at most one manifest; with none there is nothing to read
+        if files.isdisjoint(MANIFEST_FILES):
+            return detected
+        
         # Check for package.json (Node.js/JavaScript/TypeScript)
-        package_json = target / 'package.json'
-        if package_json.exists():
-            try:
-                import json
-                with open(package_json, 'r') as f:
-                    data = json.load(f)
-                
-                detected['package_managers'].append('npm')
-                if 'pnpm' in str(target / 'pnpm-lock.yaml'):
-                    detected['package_managers'].append('pnpm')
-                if 'yarn' in str(target / 'yarn.lock'):
-                    detected['package_managers'].append('yarn')
-                
-                # Detect languages
-                if 'typescript' in data.get('devDependencies', {}):
-                    detected['languages'].append('TypeScript')
-                else:
-                    detected['languages'].append('JavaScript')
-                
-                # Detect frameworks
-                dependencies = {**data.get('dependencies', {}), **data.get('devDependencies', {})}
-                
-                if 'react' in dependencies:
-                    detected['frameworks'].append('React')
-                if 'vue' in dependencies:
-                    detected['frameworks'].append('Vue.js')
-                if 'angular' in dependencies:
-                    detected['frameworks'].append('Angular')
-                if 'express' in dependencies:
-                    detected['frameworks'].append('Express.js')
-                if 'next' in dependencies:
-                    detected['frameworks'].append('Next.js')
-                if 'nuxt' in dependencies:
-                    detected['frameworks'].append('Nuxt.js')
-                if 'svelte' in dependencies:
-                    detected['frameworks'].append('Svelte')
-                if 'fastapi' in dependencies:
-                    detected['frameworks'].append('FastAPI')
-                if 'django' in dependencies:
-                    detected['frameworks'].append('Django')
-                if 'flask' in dependencies:
-                    detected['frameworks'].append('Flask')
-                
-                # Extract dependencies
-                for dep, version in dependencies.items():
-                    detected['dependencies'].append({
-                        'name': dep,
-                        'version': version,
-                        'type': 'npm'
-                    })
-                    
-            except (json.JSONDecodeError, FileNotFoundError):
-                pass
+        data = manifests['package_json']
+        if data is not None:
+            detected['package_managers'].append('npm')
+            if 'pnpm-lock.yaml' in files:
+                detected['package_managers'].append('pnpm')
+            if 'yarn.lock' in files:
+                detected['package_managers'].append('yarn')
+            
+            # Detect languages
+            if 'typescript' in data.get('devDependencies', {}):
+                detected['languages'].append('TypeScript')
+            else:
+                detected['languages'].append('JavaScript')
+            
+            # Detect frameworks
+            dependencies = {**data.get('dependencies', {}), **data.get('devDependencies', {})}
+            
+            if 'react' in dependencies:
+                detected['frameworks'].append('React')
+            if 'vue' in dependencies:
+                detected['frameworks'].append('Vue.js')
+            if 'angular' in dependencies:
+                detected['frameworks'].append('Angular')
+            if 'express' in dependencies:
+                detected['frameworks'].append('Express.js')
+            if 'next' in dependencies:
+                detected['frameworks'].append('Next.js')
+            if 'nuxt' in dependencies:
+                detected['frameworks'].append('Nuxt.js')
+            if 'svelte' in dependencies:
+                detected['frameworks'].append('Svelte')
+            if 'fastapi' in dependencies:
+                detected['frameworks'].append('FastAPI')
+            if 'django' in dependencies:
+                detected['frameworks'].append('Django')
+            if 'flask' in dependencies:
+                detected['frameworks'].append('Flask')
+            
+            # Extract dependencies
+            for dep, version in dependencies.items():
+                detected['dependencies'].append({
+                    'name': dep,
+                    'version': version,
+                    'type': 'npm'
+                })
         
         # Check for requirements.txt (Python)
-        requirements_txt = target / 'requirements.txt'
-        if requirements_txt.exists():
+        if 'requirements.txt' in files:
             detected['languages'].append('Python')
             detected['package_managers'].append('pip')
             
             try:
-                with open(requirements_txt, 'r') as f:
+                with open(target / 'requirements.txt', 'r') as f:
                     for line in f:
                         line = line.strip()
                         if line and not line.startswith('#'):
@@ -711,35 +963,27 @@ class CodeAnalyzer:
                 pass
         
         # Check for pyproject.toml (Python)
-        pyproject_toml = target / 'pyproject.toml'
-        if pyproject_toml.exists():
+        if 'pyproject.toml' in files:
             detected['languages'].append('Python')
             detected['package_managers'].append('pip')
             
-            try:
-                import toml
-                with open(pyproject_toml, 'r') as f:
-                    data = toml.load(f)
-                
-                # Extract dependencies
-                if 'project' in data and 'dependencies' in data['project']:
-                    for dep in data['project']['dependencies']:
-                        detected['dependencies'].append({
-                            'name': dep,
-                            'version': 'latest',
-                            'type': 'pip'
-                        })
-            except (toml.TomlDecodeError, FileNotFoundError, ImportError):
-                pass
+            # Extract dependencies
+            data = manifests['pyproject'] or {}
+            if 'project' in data and 'dependencies' in data['project']:
+                for dep in data['project']['dependencies']:
+                    detected['dependencies'].append({
+                        'name': dep,
+                        'version': 'latest',
+                        'type': 'pip'
+                    })
         
         # Check for go.mod (Go)
-        go_mod = target / 'go.mod'
-        if go_mod.exists():
+        if 'go.mod' in files:
             detected['languages'].append('Go')
             detected['package_managers'].append('go mod')
             
             try:
-                with open(go_mod, 'r') as f:
+                with open(target / 'go.mod', 'r') as f:
                     for line in f:
                         line = line.strip()
                         if line.startswith('require '):
@@ -755,273 +999,338 @@ class CodeAnalyzer:
                 pass
         
         # Check for Cargo.toml (Rust)
-        cargo_toml = target / 'Cargo.toml'
-        if cargo_toml.exists():
+        if 'Cargo.toml' in files:
             detected['languages'].append('Rust')
             detected['package_managers'].append('cargo')
             
-            try:
-                import toml
-                with open(cargo_toml, 'r') as f:
-                    data = toml.load(f)
-                
-                # Extract dependencies
-                if 'dependencies' in data:
-                    for dep, version in data['dependencies'].items():
-                        if isinstance(version, str):
-                            detected['dependencies'].append({
-                                'name': dep,
-                                'version': version,
-                                'type': 'cargo'
-                            })
-            except (toml.TomlDecodeError, FileNotFoundError, ImportError):
-                pass
+            # Extract dependencies
+            data = manifests['cargo_toml'] or {}
+            if 'dependencies' in data:
+                for dep, version in data['dependencies'].items():
+                    if isinstance(version, str):
+                        detected['dependencies'].append({
+                            'name': dep,
+                            'version': version,
+                            'type': 'cargo'
+                        })
         
         # Check for pom.xml (Java)
-        pom_xml = target / 'pom.xml'
-        if pom_xml.exists():
+        if 'pom.xml' in files:
             detected['languages'].append('Java')
             detected['package_managers'].append('maven')
+            detected['dependencies'].extend(self._parse_pom_dependencies(target / 'pom.xml'))
+        
+        return detected
+    
+    def _parse_pom_dependencies(self, pom_xml: Path) -> List[Dict[str, Any]]:
+        """Extract Maven dependencies from a pom.xml.
+        
+        Streams ``<dependency>`` elements with ``iterparse`` (lxml when installed,
+        ElementTree otherwise), clearing each one once read so memory stays
+        bounded on large multi-module poms.
+        
+        Args:
+            pom_xml: Path to the pom.xml file
             
+        Returns:
+            Dependency dictionaries in the same shape as the other manifests
+        """
+        dependencies = []
+        
+        def add_dependency(dependency):
+            # One pass over the children instead of a find() per coordinate
+            coordinates = {}
+            for child in dependency:
+                if child.tag in MAVEN_COORDINATE_TAGS and child.tag not in coordinates:
+                    coordinates[child.tag] = child.text or ''
+            
+            group_id = coordinates.get(MAVEN_GROUP_ID_TAG)
+            artifact_id = coordinates.get(MAVEN_ARTIFACT_ID_TAG)
+            if group_id is not None and artifact_id is not None:
+                dependencies.append({
+                    'name': f"{group_id}:{artifact_id}",
+                    'version': coordinates.get(MAVEN_VERSION_TAG, 'latest'),
+                    'type': 'maven'
+                })
+        
+        etree = _lazy_import('lxml.etree')
+        if etree is not None:
             try:
-                import xml.etree.ElementTree as ET
-                tree = ET.parse(pom_xml)
-                root = tree.getroot()
-                
-                # Extract dependencies
-                for dependency in root.findall('.//{http://maven.apache.org/POM/4.0.0}dependency'):
-                    group_id = dependency.find('{http://maven.apache.org/POM/4.0.0}groupId')
-                    artifact_id = dependency.find('{http://maven.apache.org/POM/4.0.0}artifactId')
-                    version = dependency.find('{http://maven.apache.org/POM/4.0.0}version')
-                    
-                    if group_id is not None and artifact_id is not None:
-                        detected['dependencies'].append({
-                            'name': f"{group_id.text}:{artifact_id.text}",
-                            'version': version.text if version is not None else 'latest',
-                            'type': 'maven'
-                        })
-            except (ET.ParseError, FileNotFoundError):
+                for _, dependency in etree.iterparse(str(pom_xml), tag=MAVEN_DEPENDENCY_TAG):
+                    add_dependency(dependency)
+                    dependency.clear()
+            except (etree.ParseError, OSError):
                 pass
+            return dependencies
         
-        return detected
+        ET = _lazy_import('xml.etree.ElementTree')
+        try:
+            for _, element in ET.iterparse(pom_xml):
+                if element.tag == MAVEN_DEPENDENCY_TAG:
+                    add_dependency(element)
+                    element.clear()
+        except (ET.ParseError, FileNotFoundError):
+            pass
+        return dependencies
     
     def _detect_project_structure(self, target: Path) -> List[str]:
         """Detect project structure patterns."""
-        structure = []
-        
-        # Common directory patterns
-        common_dirs = [
-            'src', 'app', 'apps', 'lib', 'libs', 'packages', 'components',
-            'pages', 'views', 'templates', 'static', 'public', 'assets',
-            'config', 'configs', 'settings', 'utils', 'helpers', 'services',
-            'models', 'entities', 'controllers', 'routes', 'middleware',
-            'tests', 'test', 'specs', 'docs', 'documentation'
-        ]
+        files, dirs = self._scan_target(target)
         
-        for item in target.iterdir():
-            if item.is_dir() and item.name in common_dirs:
-                structure.append(item.name)
+        # Common directory patterns; only directories are in ``dirs``, so
+        # plain files never reach the membership test
+        structure = sorted(dirs & COMMON_DIRS)
         
         # Detect specific patterns
-        if (target / 'src').exists():
+        if 'src' in dirs:
             structure.append('src_based')
-        if (target / 'app').exists():
+        if 'app' in dirs:
             structure.append('app_based')
-        if (target / 'packages').exists():
+        if 'packages' in dirs:
             structure.append('monorepo')
-        if (target / 'lib').exists():
+        if 'lib' in dirs:
             structure.append('library')
         
         return structure
     
-    def _detect_test_runners(self, target: Path) -> List[str]:
+    def _detect_test_runners(self, target: Path,
+                             manifests: Optional[Dict[str, Any]] = None) -> List[str]:
         """Detect test runners and testing frameworks."""
-        test_runners = []
+        if manifests is None:
+            manifests = self._load_manifests(target)
+        
+        test_runners = set()
+        files, dirs = self._scan_target(target)
         
         # Check package.json for test runners
-        package_json = target / 'package.json'
-        if package_json.exists():
-            try:
-                import json
-                with open(package_json, 'r') as f:
-                    data = json.load(f)
-                
-                dependencies = {**data.get('dependencies', {}), **data.get('devDependencies', {})}
-                
-                if 'jest' in dependencies:
-                    test_runners.append('Jest')
-                if 'vitest' in dependencies:
-                    test_runners.append('Vitest')
-                if 'mocha' in dependencies:
-                    test_runners.append('Mocha')
-                if 'jasmine' in dependencies:
-                    test_runners.append('Jasmine')
-                if 'cypress' in dependencies:
-                    test_runners.append('Cypress')
-                if 'playwright' in dependencies:
-                    test_runners.append('Playwright')
-                if 'puppeteer' in dependencies:
-                    test_runners.append('Puppeteer')
-                    
-            except (json.JSONDecodeError, FileNotFoundError):
-                pass
+        data = manifests['package_json']
+        if data is not None:
+            dependencies = data.get('dependencies', {}).keys() | data.get('devDependencies', {}).keys()
+            for package in TEST_RUNNER_PACKAGES.keys() & dependencies:
+                test_runners.add(TEST_RUNNER_PACKAGES[package])
         
         # Check for Python test runners
-        requirements_txt = target / 'requirements.txt'
-        if requirements_txt.exists():
+        if 'requirements.txt' in files:
             try:
-                with open(requirements_txt, 'r') as f:
+                with open(target / 'requirements.txt', 'r') as f:
                     content = f.read()
                 
-                if 'pytest' in content:
-                    test_runners.append('pytest')
-                if 'unittest' in content:
-                    test_runners.append('unittest')
-                if 'nose' in content:
-                    test_runners.append('nose')
-                if 'tox' in content:
-                    test_runners.append('tox')
+                # Match requirement names exactly, so pytest-cov is not pytest
+                for match in REQUIREMENTS_TEST_RUNNER_PATTERN.finditer(content):
+                    test_runners.add(match.group(1).lower())
                     
             except FileNotFoundError:
                 pass
         
         # Check for test configuration files
-        test_configs = [
-            'jest.config.js', 'jest.config.ts', 'vitest.config.js', 'vitest.config.ts',
-            'pytest.ini', 'setup.cfg', 'tox.ini', 'cypress.config.js', 'playwright.config.js'
-        ]
-        
-        for config in test_configs:
-            if (target / config).exists():
-                if 'jest' in config:
-                    test_runners.append('Jest')
-                elif 'vitest' in config:
-                    test_runners.append('Vitest')
-                elif 'pytest' in config:
-                    test_runners.append('pytest')
-                elif 'cypress' in config:
-                    test_runners.append('Cypress')
-                elif 'playwright' in config:
-                    test_runners.append('Playwright')
-        
-        return list(set(test_runners))  # Remove duplicates
+        for config in TEST_CONFIG_FILES.keys() & files:
+            test_runners.add(TEST_CONFIG_FILES[config])
+        
+        return sorted(test_runners)
     
     def _detect_ci_systems(self, target: Path) -> List[str]:
         """Detect CI/CD systems."""
         ci_systems = []
+        files, dirs = self._scan_target(target)
         
         # Check for GitHub Actions
-        if (target / '.github' / 'workflows').exists():
+        if '.github' in dirs and 'workflows' in self._scan_target(target / '.github')[1]:
             ci_systems.append('GitHub Actions')
         
         # Check for GitLab CI
-        if (target / '.gitlab-ci.yml').exists():
+        if '.gitlab-ci.yml' in files:
             ci_systems.append('GitLab CI')
         
         # Check for Jenkins
-        if (target / 'Jenkinsfile').exists():
+        if 'Jenkinsfile' in files:
             ci_systems.append('Jenkins')
         
         # Check for CircleCI
-        if (target / '.circleci').exists():
+        if '.circleci' in dirs:
             ci_systems.append('CircleCI')
         
         # Check for Travis CI
-        if (target / '.travis.yml').exists():
+        if '.travis.yml' in files:
             ci_systems.append('Travis CI')
         
         # Check for Azure DevOps
-        if (target / 'azure-pipelines.yml').exists():
+        if 'azure-pipelines.yml' in files:
             ci_systems.append('Azure DevOps')
         
         return ci_systems
     
     def _detect_package_managers(self, target: Path) -> List[str]:
         """Detect package managers."""
-        package_managers = []
+        package_managers = set()
+        files, dirs = self._scan_target(target)
         
         # Check for lock files and config files
-        if (target / 'package.json').exists():
-            package_managers.append('npm')
-        if (target / 'pnpm-lock.yaml').exists():
-            package_managers.append('pnpm')
-        if (target / 'yarn.lock').exists():
-            package_managers.append('yarn')
-        if (target / 'requirements.txt').exists():
-            package_managers.append('pip')
-        if (target / 'pyproject.toml').exists():
-            package_managers.append('pip')
-        if (target / 'go.mod').exists():
-            package_managers.append('go mod')
-        if (target / 'Cargo.toml').exists():
-            package_managers.append('cargo')
-        if (target / 'pom.xml').exists():
-            package_managers.append('maven')
-        if (target / 'gradle').exists() or (target / 'build.gradle').exists():
-            package_managers.append('gradle')
-        
-        return list(set(package_managers))  # Remove duplicates
+        if 'package.json' in files:
+            package_managers.add('npm')
+        if 'pnpm-lock.yaml' in files:
+            package_managers.add('pnpm')
+        if 'yarn.lock' in files:
+            package_managers.add('yarn')
+        if 'requirements.txt' in files:
+            package_managers.add('pip')
+        if 'pyproject.toml' in files:
+            package_managers.add('pip')
+        if 'go.mod' in files:
+            package_managers.add('go mod')
+        if 'Cargo.toml' in files:
+            package_managers.add('cargo')
+        if 'pom.xml' in files:
+            package_managers.add('maven')
+        if 'gradle' in dirs or 'build.gradle' in files:
+            package_managers.add('gradle')
+        
+        return sorted(package_managers)
     
-    def _detect_build_tools(self, target: Path) -> List[str]:
+    def _detect_build_tools(self, target: Path,
+                            manifests: Optional[Dict[str, Any]] = None) -> List[str]:
         """Detect build tools and bundlers."""
-        build_tools = []
+        if manifests is None:
+            manifests = self._load_manifests(target)
+        
+        build_tools = set()
+        files, dirs = self._scan_target(target)
         
         # Check package.json for build tools
-        package_json = target / 'package.json'
-        if package_json.exists():
-            try:
-                import json
-                with open(package_json, 'r') as f:
-                    data = json.load(f)
-                
-                dependencies = {**data.get('dependencies', {}), **data.get('devDependencies', {})}
-                
-                if 'webpack' in dependencies:
-                    build_tools.append('Webpack')
-                if 'vite' in dependencies:
-                    build_tools.append('Vite')
-                if 'rollup' in dependencies:
-                    build_tools.append('Rollup')
-                if 'esbuild' in dependencies:
-                    build_tools.append('esbuild')
-                if 'parcel' in dependencies:
-                    build_tools.append('Parcel')
-                if 'babel' in dependencies:
-                    build_tools.append('Babel')
-                if 'typescript' in dependencies:
-                    build_tools.append('TypeScript Compiler')
-                    
-            except (json.JSONDecodeError, FileNotFoundError):
-                pass
+        data = manifests['package_json']
+        if data is not None:
+            dependencies = data.get('dependencies', {}).keys() | data.get('devDependencies', {}).keys()
+            for package in BUILD_TOOL_PACKAGES.keys() & dependencies:
+                build_tools.add(BUILD_TOOL_PACKAGES[package])
         
         # Check for build configuration files
-        build_configs = [
-            'webpack.config.js', 'webpack.config.ts', 'vite.config.js', 'vite.config.ts',
-            'rollup.config.js', 'rollup.config.ts', 'babel.config.js', 'babel.config.json',
-            'tsconfig.json', 'tsconfig.build.json', 'build.gradle', 'Makefile'
-        ]
-        
-        for config in build_configs:
-            if (target / config).exists():
-                if 'webpack' in config:
-                    build_tools.append('Webpack')
-                elif 'vite' in config:
-                    build_tools.append('Vite')
-                elif 'rollup' in config:
-                    build_tools.append('Rollup')
-                elif 'babel' in config:
-                    build_tools.append('Babel')
-                elif 'tsconfig' in config:
-                    build_tools.append('TypeScript Compiler')
-                elif 'gradle' in config:
-                    build_tools.append('Gradle')
-                elif 'Makefile' in config:
-                    build_tools.append('Make')
-        
-        return list(set(build_tools))  # Remove duplicates
+        for config in BUILD_CONFIG_FILES.keys() & files:
+            build_tools.add(BUILD_CONFIG_FILES[config])
+        
+        return sorted(build_tools)
+    
+    def _load_json(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Parse a JSON manifest once per analysis and share it across detectors.
+        
+        Args:
+            path: Manifest file to parse
+            
+        Returns:
+            Parsed data, or None if the file is missing or invalid
+        """
+        cache_key = ('json', str(path))
+        if cache_key not in self.analysis_cache:
+            try:
+                # orjson (when installed) and json both raise ValueError subclasses
+                self.analysis_cache[cache_key] = _json_loads(path.read_bytes())
+            except (ValueError, FileNotFoundError):
+                self.analysis_cache[cache_key] = None
+        return self.analysis_cache[cache_key]
+    
+    def _read_source(self, path: Path) -> str:
+        """Read a source file once per analysis and share it across phases.
+        
+        Args:
+            path: Source file to read
+            
+        Returns:
+            File content; read errors propagate to the calling phase
+        """
+        cache_key = ('text', str(path))
+        content = self.analysis_cache.get(cache_key)
+        if content is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            self.analysis_cache[cache_key] = content
+        return content
+    
+    def _load_toml(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Parse a TOML manifest once per analysis.
+        
+        Args:
+            path: Manifest file to parse
+            
+        Returns:
+            Parsed data, or None if the file is missing, invalid or no TOML
+            parser is installed
+        """
+        cache_key = ('toml', str(path))
+        if cache_key not in self.analysis_cache:
+            self.analysis_cache[cache_key] = None
+            # Prefer stdlib tomllib (3.11+), then its tomli backport, then toml
+            toml = _lazy_import('tomllib') or _lazy_import('tomli') or _lazy_import('toml')
+            if toml is not None:
+                try:
+                    # All three expose loads(str); their decode errors subclass ValueError
+                    self.analysis_cache[cache_key] = toml.loads(path.read_text(encoding='utf-8'))
+                except (ValueError, FileNotFoundError, UnicodeDecodeError):
+                    pass
+        return self.analysis_cache[cache_key]
+    
+    def _scan_target(self, target: Path) -> Tuple[Set[str], Set[str]]:
+        """List the top level of a directory with a single ``os.scandir``.
+        
+        Detectors test membership against these sets instead of issuing a
+        ``stat`` per candidate path; nested paths are scanned on demand.
+        
+        Args:
+            target: Directory to scan
+            
+        Returns:
+            Tuple of (file names, directory names) directly under ``target``
+        """
+        cache_key = ('scan', str(target))
+        cached = self.analysis_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        files: Set[str] = set()
+        dirs: Set[str] = set()
+        for name, entry in self._list_entries(target).items():
+            try:
+                # DirEntry.is_dir() answers from the directory listing's d_type;
+                # only symlinks cost an extra stat
+                (dirs if entry.is_dir() else files).add(name)
+            except OSError:
+                files.add(name)
+        
+        self.analysis_cache[cache_key] = (files, dirs)
+        return files, dirs
+    
+    def _list_entries(self, root: Path) -> Dict[str, os.DirEntry]:
+        """List a directory once and share its entries across detectors.
+        
+        The ``os.DirEntry`` objects keep the type and stat results of the
+        listing, so each entry is stat'ed at most once. The listing is cached
+        per directory for the duration of an ``analyze()`` call.
+        
+        Args:
+            root: Directory to list
+            
+        Returns:
+            Mapping of entry name to its ``os.DirEntry``; empty if ``root``
+            cannot be listed
+        """
+        cache_key = ('entries', str(root))
+        cached = self.analysis_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        entries: Dict[str, os.DirEntry] = {}
+        try:
+            with os.scandir(root) as it:
+                for entry in it:
+                    entries[entry.name] = entry
+        except OSError:
+            pass
+        
+        self.analysis_cache[cache_key] = entries
+        return entries
     
     def _timed_analysis(self, phase_name: str, analysis_func, *args, **kwargs) -> Dict[str, Any]:
-        """Run analysis function with timing.
+        """Run analysis function, recording its elapsed time in ``_phase_ns``.
+        
+        Timing uses the monotonic ``perf_counter_ns`` clock and is kept as raw
+        integer nanoseconds; ``_calculate_analysis_metrics`` converts it once.
         
         Args:
             phase_name: Name of the analysis phase
@@ -1030,37 +1339,16 @@ class CodeAnalyzer:
             **kwargs: Keyword arguments for the analysis function
             
         Returns:
-            Analysis results with timing information
+            Analysis results, or an error dictionary if the phase raised
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         try:
-            result = analysis_func(*args, **kwargs)
-            end_time = time.time()
-            elapsed_time = end_time - start_time
-            
-            # Add timing to result if it's a dictionary
-            if isinstance(result, dict):
-                result['_timing'] = {
-                    'phase': phase_name,
-                    'start_time': start_time,
-                    'end_time': end_time,
-                    'elapsed_seconds': elapsed_time
-                }
-            
-            return result
+            return analysis_func(*args, **kwargs)
         except Exception as e:
-            end_time = time.time()
-            elapsed_time = end_time - start_time
-            return {
-                'error': str(e),
-                '_timing': {
-                    'phase': phase_name,
-                    'start_time': start_time,
-                    'end_time': end_time,
-                    'elapsed_seconds': elapsed_time,
-                    'error': True
-                }
-            }
+            self._failed_phases.add(phase_name)
+            return {'error': str(e)}
+        finally:
+            self._phase_ns[phase_name] = time.perf_counter_ns() - start_ns
     
     def _calculate_analysis_metrics(self, analysis_phases: Dict[str, Any], interview_data: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate comprehensive analysis metrics.
@@ -1096,36 +1384,44 @@ class CodeAnalyzer:
             'detection_types': {}
         }
         
-        for phase_name, phase_result in analysis_phases.items():
+        successful = 0
+        failed = 0
+        detection_types = detection_results['detection_types']
+        for phase_result in analysis_phases.values():
             if isinstance(phase_result, dict):
                 if 'error' in phase_result:
-                    detection_results['failed_detections'] += 1
+                    failed += 1
                 else:
-                    detection_results['successful_detections'] += 1
+                    successful += 1
                 
                 # Count specific detection types
-                if 'technologies' in phase_result:
-                    detection_results['detection_types']['technologies'] = len(phase_result['technologies'])
-                if 'frameworks' in phase_result:
-                    detection_results['detection_types']['frameworks'] = len(phase_result['frameworks'])
-                if 'libraries' in phase_result:
-                    detection_results['detection_types']['libraries'] = len(phase_result['libraries'])
-                if 'tools' in phase_result:
-                    detection_results['detection_types']['tools'] = len(phase_result['tools'])
-        
-        detection_results['total_detections'] = detection_results['successful_detections'] + detection_results['failed_detections']
-        
-        # Calculate phase timings
+                for detection_type in DETECTION_TYPES:
+                    values = phase_result.get(detection_type)
+                    if values is not None:
+                        detection_types[detection_type] = len(values)
+        
+        detection_results['successful_detections'] = successful
+        detection_results['failed_detections'] = failed
+        detection_results['total_detections'] = successful + failed
+        
+        # Calculate phase timings, tallying completed/failed phases as we go
         phase_timings = {}
-        for phase_name, phase_result in analysis_phases.items():
-            if isinstance(phase_result, dict) and '_timing' in phase_result:
-                timing = phase_result['_timing']
-                phase_timings[phase_name] = {
-                    'elapsed_seconds': timing['elapsed_seconds'],
-                    'start_time': timing['start_time'],
-                    'end_time': timing['end_time'],
-                    'error': timing.get('error', False)
-                }
+        phases_completed = 0
+        phases_failed = 0
+        total_phase_seconds = 0.0
+        for phase_name, elapsed_ns in self._phase_ns.items():
+            elapsed_seconds = elapsed_ns / 1e9
+            failed = phase_name in self._failed_phases
+            phase_timings[phase_name] = {
+                'elapsed_ns': elapsed_ns,
+                'elapsed_seconds': elapsed_seconds,
+                'error': failed
+            }
+            if failed:
+                phases_failed += 1
+            else:
+                phases_completed += 1
+            total_phase_seconds += elapsed_seconds
         
         # Calculate quality metrics
         quality_metrics = {
@@ -1207,9 +1503,9 @@ class CodeAnalyzer:
             'security_metrics': security_metrics,
             'performance_metrics': {
                 'analysis_speed': total_elapsed,
-                'phases_completed': len([p for p in phase_timings.values() if not p.get('error', False)]),
-                'phases_failed': len([p for p in phase_timings.values() if p.get('error', False)]),
-                'average_phase_time': sum(p['elapsed_seconds'] for p in phase_timings.values()) / len(phase_timings) if phase_timings else 0
+                'phases_completed': phases_completed,
+                'phases_failed': phases_failed,
+                'average_phase_time': total_phase_seconds / len(phase_timings) if phase_timings else 0
             },
             'summary': {
                 'total_phases': len(analysis_phases),
@@ -1224,53 +1520,86 @@ class CodeAnalyzer:
         
         return metrics
     
-    def _store_metrics_history(self, metrics: Dict[str, Any]) -> None:
+    def _store_metrics_history(self, metrics: Dict[str, Any],
+                               analysis_phases: Optional[Dict[str, Any]] = None,
+                               fingerprint: Optional[str] = None) -> None:
         """Store metrics in history for tracking over time.
         
         Args:
             metrics: Metrics dictionary to store
+            analysis_phases: Phase results to cache alongside the metrics
+            fingerprint: Fingerprint the cached phase results are valid for
         """
-        # Add to in-memory history
-        self.metrics_history.append(metrics.copy())
+        # The bounded deque drops its oldest entry on append once full, so
+        # take that entry out of the trend sums first
+        if len(self.metrics_history) == self.metrics_history.maxlen:
+            self._evict_trend_values(self.metrics_history[0])
         
-        # Keep only last 100 entries to prevent memory issues
-        if len(self.metrics_history) > 100:
-            self.metrics_history = self.metrics_history[-100:]
+        # Add to in-memory history; metrics is built fresh for every analysis
+        # and not mutated afterwards, so it is stored without copying
+        self.metrics_history.append(metrics)
+        self._add_trend_values(metrics)
         
         # Write to discovery_report.json
-        self._write_discovery_report(metrics)
+        self._write_discovery_report(metrics, analysis_phases, fingerprint)
     
-    def _write_discovery_report(self, metrics: Dict[str, Any]) -> None:
+    def _get_report_path(self) -> Path:
+        """Get the path of discovery_report.json in the cache directory."""
+        try:
+            from ..overlay.paths import OverlayPaths
+            overlay_paths = OverlayPaths()
+            cache_dir = Path(overlay_paths.get_cache_dir())
+        except ImportError:
+            cache_dir = Path('builder/cache')
+        return cache_dir / 'discovery_report.json'
+    
+    def _write_discovery_report(self, metrics: Dict[str, Any],
+                                analysis_phases: Optional[Dict[str, Any]] = None,
+                                fingerprint: Optional[str] = None) -> None:
         """Write discovery report with metrics to JSON file.
         
         Args:
             metrics: Metrics to write
+            analysis_phases: Phase results to cache for the next identical run
+            fingerprint: Fingerprint the cached phase results are valid for
         """
         report_data = {
             'report_metadata': {
                 'generated_at': metrics['timestamp'],
                 'analysis_id': metrics['analysis_id'],
-                'version': '1.0.0',
-                'generator': 'CodeAnalyzer'
+                'version': REPORT_VERSION,
+                'generator': 'CodeAnalyzer',
+                'fingerprint': fingerprint
             },
             'metrics': metrics,
-            'historical_metrics': self.metrics_history[-10:],  # Last 10 analyses
+            'historical_metrics': list(islice(self.metrics_history, max(0, len(self.metrics_history) - 10), None)),  # Last 10 analyses
             'trends': self._calculate_trends()
         }
+        if analysis_phases is not None and fingerprint is not None:
+            report_data['analysis'] = analysis_phases
         
         # Ensure cache directory exists
-        try:
-            from ..overlay.paths import OverlayPaths
-            overlay_paths = OverlayPaths()
-            cache_dir = Path(overlay_paths.get_cache_dir())
-        except ImportError:
-            cache_dir = Path('builder/cache')
-        cache_dir.mkdir(exist_ok=True)
+        report_path = self._get_report_path()
+        report_path.parent.mkdir(exist_ok=True)
         
-        # Write to discovery_report.json
-        report_path = cache_dir / 'discovery_report.json'
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, default=str)
+        if orjson is not None:
+            payload = orjson.dumps(report_data, default=str,
+                                   option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            payload = json.dumps(report_data, indent=2, default=str).encode('utf-8')
+        
+        # Write to a temporary file and swap it in, so readers (including the
+        # fingerprint cache) never see a partially written report
+        fd, tmp_path = tempfile.mkstemp(dir=report_path.parent, prefix='.discovery_report.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.chmod(tmp_path, NEW_FILE_MODE)
+            os.replace(tmp_path, report_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
     
     def _calculate_trends(self) -> Dict[str, Any]:
         """Calculate trends from historical metrics.
@@ -1282,16 +1611,56 @@ class CodeAnalyzer:
             return {'insufficient_data': True}
         
         trends = {
-            'features_trend': self._calculate_trend('features.count'),
-            'gaps_trend': self._calculate_trend('gaps.count'),
-            'quality_trend': self._calculate_trend('quality_metrics.overall_score'),
-            'complexity_trend': self._calculate_trend('complexity_metrics.cyclomatic_complexity'),
-            'performance_trend': self._calculate_trend('total_elapsed_seconds'),
-            'success_rate_trend': self._calculate_trend('summary.success_rate')
+            trend_name: self._calculate_trend(metric_path)
+            for trend_name, metric_path in TREND_METRICS.items()
         }
         
         return trends
     
+    @staticmethod
+    def _extract_metric(metrics: Dict[str, Any], metric_path: str) -> Optional[float]:
+        """Resolve a dot-separated metric path, or None if it is absent or non-numeric."""
+        try:
+            value = metrics
+            for key in metric_path.split('.'):
+                value = value[key]
+            return float(value)
+        except (KeyError, TypeError, ValueError):
+            return None
+    
+    def _add_trend_values(self, metrics: Dict[str, Any]) -> None:
+        """Append a new analysis to the running regression sums of each trend metric.
+        
+        Args:
+            metrics: Metrics dictionary just added to the history
+        """
+        for metric_path in TREND_METRICS.values():
+            value = self._extract_metric(metrics, metric_path)
+            if value is None:
+                continue
+            series = self._trend_series.setdefault(
+                metric_path, {'values': deque(), 'sum_y': 0.0, 'sum_xy': 0.0}
+            )
+            series['sum_xy'] += len(series['values']) * value
+            series['sum_y'] += value
+            series['values'].append(value)
+    
+    def _evict_trend_values(self, metrics: Dict[str, Any]) -> None:
+        """Remove the oldest analysis from the running regression sums.
+        
+        The evicted value sits at x = 0, so it contributes nothing to sum_xy;
+        every remaining x then shifts down by one, which lowers sum_xy by sum_y.
+        
+        Args:
+            metrics: Metrics dictionary being dropped from the history
+        """
+        for metric_path in TREND_METRICS.values():
+            series = self._trend_series.get(metric_path)
+            if series is None or not series['values'] or self._extract_metric(metrics, metric_path) is None:
+                continue
+            series['sum_y'] -= series['values'].popleft()
+            series['sum_xy'] -= series['sum_y']
+    
     def _calculate_trend(self, metric_path: str) -> Dict[str, Any]:
         """Calculate trend for a specific metric.
         
@@ -1301,29 +1670,19 @@ class CodeAnalyzer:
         Returns:
             Trend information
         """
-        values = []
-        for metrics in self.metrics_history:
-            try:
-                value = metrics
-                for key in metric_path.split('.'):
-                    value = value[key]
-                values.append(float(value))
-            except (KeyError, TypeError, ValueError):
-                continue
+        series = self._trend_series.get(metric_path)
+        values = list(series['values']) if series else []
         
         if len(values) < 2:
             return {'trend': 'insufficient_data', 'values': values}
         
-        # Calculate simple linear trend
+        # Simple linear regression over x = 0..n-1, using the running sums
+        # for y and closed forms for x
         n = len(values)
-        x = list(range(n))
-        y = values
-        
-        # Simple linear regression
-        sum_x = sum(x)
-        sum_y = sum(y)
-        sum_xy = sum(x[i] * y[i] for i in range(n))
-        sum_x2 = sum(x[i] ** 2 for i in range(n))
+        sum_x = n * (n - 1) // 2
+        sum_x2 = (n - 1) * n * (2 * n - 1) // 6
+        sum_y = series['sum_y']
+        sum_xy = series['sum_xy']
         
         slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x ** 2)
         
@@ -1353,15 +1712,20 @@ class CodeAnalyzer:
         if not self.metrics_history:
             return {'message': 'No metrics available'}
         
-        latest_metrics = self.metrics_history[-1]
+        # Copy on read so callers cannot mutate the stored history
+        latest_metrics = copy.deepcopy(self.metrics_history[-1])
+        
+        # Analysis times are already kept as a flat trend series
+        elapsed = self._trend_series.get('total_elapsed_seconds')
+        elapsed_values = elapsed['values'] if elapsed else ()
         
         return {
             'latest_analysis': latest_metrics,
             'total_analyses': len(self.metrics_history),
             'trends': self._calculate_trends(),
             'performance_summary': {
-                'average_analysis_time': sum(m['total_elapsed_seconds'] for m in self.metrics_history) / len(self.metrics_history),
-                'fastest_analysis': min(m['total_elapsed_seconds'] for m in self.metrics_history),
-                'slowest_analysis': max(m['total_elapsed_seconds'] for m in self.metrics_history)
+                'average_analysis_time': elapsed['sum_y'] / len(elapsed_values) if elapsed_values else 0,
+                'fastest_analysis': min(elapsed_values, default=0),
+                'slowest_analysis': max(elapsed_values, default=0)
             }
         }
@@ -5,21 +5,162 @@ The DiscoveryEngine coordinates the discovery workflow, managing the interview,
 analysis, synthesis, and validation phases.
 """
 
+import copy
+import hashlib
+import io
 import os
 import json
-from typing import Dict, List, Optional, Any
+import mmap
+import re
+import shutil
+import struct
+import subprocess
+import tempfile
+import threading
+from stat import S_ISDIR
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import redirect_stdout, redirect_stderr
+from datetime import datetime
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Any, Set, Tuple
 from pathlib import Path
 
+import yaml
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from blake3 import blake3 as content_hasher
+except ImportError:
+    def content_hasher():
+        return hashlib.blake2b(digest_size=16)
+
+try:
+    from yaml import CSafeDumper as YamlSafeDumper
+except ImportError:
+    from yaml import SafeDumper as YamlSafeDumper
+
 from .interview import DiscoveryInterview
-from .analyzer import CodeAnalyzer
+from .analyzer import CodeAnalyzer, NEW_FILE_MODE, WALK_SKIP_DIRS
 from .synthesizer import DiscoverySynthesizer
 from .generators import DiscoveryGenerators
 from .validator import DiscoveryValidator
 
 
+def _json_dumps(value: Any) -> bytes:
+    """Serialize cache data to compact JSON bytes, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+class ContextDumper(YamlSafeDumper):
+    """Safe (libyaml when available) dumper for the discovery context YAML.
+    
+    Output stays loadable with ``yaml.safe_load``; values the safe dumper has
+    no representer for are written as plain YAML instead of raising.
+    """
+
+
+def _represent_context_value(dumper: ContextDumper, data: Any) -> Any:
+    """Represent tuples, container subclasses and other objects as plain YAML."""
+    if isinstance(data, dict):
+        return dumper.represent_dict(data)
+    if isinstance(data, (list, tuple)):
+        return dumper.represent_list(data)
+    if isinstance(data, (set, frozenset)):
+        return dumper.represent_set(data)
+    if isinstance(data, str):
+        return dumper.represent_str(str.__str__(data))
+    return dumper.represent_str(str(data))
+
+
+ContextDumper.add_representer(None, _represent_context_value)
+
+
+# Sidecar in the discovery cache holding size/mtime/content hash per input file
+FILE_META_NAME = 'file_meta.json'
+
+# Cached results are zstd-compressed when zstandard is installed
+CACHE_SUFFIX = '.json.zst' if zstandard is not None else '.json'
+CACHE_READ_ERRORS = (ValueError, IOError) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+# Most file content hashes kept in memory across engines
+CONTENT_HASH_CACHE_SIZE = 4096
+
+# Writes cached discovery results off the caller's thread; work still
+# queued at interpreter exit is completed by concurrent.futures before exiting
+SAVE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix='discovery-save')
+
+# Threads used to hash changed cache-key inputs
+HASH_MAX_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
+# Cached results and hashed input files at least this large are read through an mmap
+MMAP_MIN_SIZE = 64 * 1024
+
+# Directories not worth descending into when walking a source tree
+SOURCE_WALK_SKIP_DIRS = WALK_SKIP_DIRS | {'build', '.next'}
+
+# Root-level files, and CI workflow files, whose changes invalidate the discovery cache
+KEY_ROOT_FILE_RE = re.compile(
+    r'(package\.json|package-lock\.json|pnpm-lock\.yaml'
+    r'|tsconfig(\..*)?\.json'
+    r'|requirements\.txt|pyproject\.toml|setup\.py'
+    r'|go\.mod|go\.sum'
+    r'|Dockerfile|docker-compose\.yml'
+    r'|README\.md|CHANGELOG\.md)\Z'
+)
+KEY_WORKFLOW_DIR = ".github/workflows"
+KEY_WORKFLOW_FILE_RE = re.compile(r'.*\.ya?ml\Z')
+
+# Source directories, and the files within them, that feed the cache key
+KEY_SOURCE_DIRS = ("src", "lib", "app", "components", "pages", "api")
+IMPORTANT_EXTENSIONS = frozenset({'.ts', '.tsx', '.js', '.jsx', '.py', '.go', '.rs', '.java', '.cs'})
+IMPORTANT_CONFIG_FILES = frozenset({'package.json', 'tsconfig.json', 'requirements.txt', 'go.mod'})
+MAX_IMPORTANT_FILES_PER_DIR = 50
+
+# docs/<type> directories whose <TYPE>-*.md files feed the cache key
+LINKED_DOC_TYPES = ('adrs', 'arch', 'exec', 'impl', 'integrations', 'tasks', 'ux')
+DOC_FILE_RES = {
+    doc_type: re.compile(rf'{doc_type.upper()}-.*\.md\Z')
+    for doc_type in ('prd',) + LINKED_DOC_TYPES
+}
+
+# Fewest candidates in one directory worth a scandir() instead of stat() calls
+SCANDIR_MIN_CANDIDATES = 3
+
+# Likely TypeScript entry points for ctx:build, in priority order
+PRIORITY_TS_PATHS = (
+    "src/index.ts",
+    "src/main.ts",
+    "src/app.ts",
+    "src/auth/login.ts",
+    "src/auth/index.ts",
+    "index.ts",
+    "main.ts",
+    "app.ts"
+)
+
+
 class DiscoveryEngine:
     """Main engine for orchestrating code discovery processes."""
     
+    # Content hashes keyed by (path, mtime_ns, size), shared process-wide so
+    # engines and discover_many() workers do not re-read the same inputs
+    _content_hash_cache: 'OrderedDict[Tuple[str, int, int], str]' = OrderedDict()
+    _content_hash_lock = threading.Lock()
+    
     def __init__(self, root_path: str = ".", question_set: str = "comprehensive", test_answers_file: Optional[str] = None):
         """Initialize the discovery engine.
         
@@ -41,16 +182,49 @@ class DiscoveryEngine:
         self.question_set = question_set
         self.test_answers_file = test_answers_file
         
-        # Initialize components
-        self.interview = DiscoveryInterview(question_set=question_set, test_answers_file=test_answers_file)
-        self.analyzer = CodeAnalyzer()
-        self.synthesizer = DiscoverySynthesizer()
-        self.generators = DiscoveryGenerators()
-        self.validator = DiscoveryValidator()
+        # Components are created lazily on first use (see the properties below)
         
         # Discovery state
         self.results: Dict[str, Any] = {}
         self.cache_key: Optional[str] = None
+        
+        # Size/mtime/content-hash records backing _file_fingerprint
+        self._file_meta: Optional[Dict[str, Dict[str, Any]]] = None
+        self._file_meta_dirty = False
+        # (target/options identity, stat fingerprint) behind the current cache key
+        self._stat_fingerprint: Optional[Tuple[str, str]] = None
+        # Background writes started by the last discover(); see flush_saves()
+        self._pending_saves: List[Future] = []
+    
+    @cached_property
+    def interview(self) -> DiscoveryInterview:
+        """Interview component.
+        
+        Built per engine so edits to questions.yml, patterns.yml or the test
+        answers file are picked up; the YAML parses themselves are reused
+        while the files are unchanged.
+        """
+        return DiscoveryInterview(question_set=self.question_set, test_answers_file=self.test_answers_file)
+    
+    @cached_property
+    def analyzer(self) -> CodeAnalyzer:
+        """Code analysis component."""
+        return CodeAnalyzer()
+    
+    @cached_property
+    def synthesizer(self) -> DiscoverySynthesizer:
+        """Synthesis component."""
+        return DiscoverySynthesizer()
+    
+    @cached_property
+    def generators(self) -> DiscoveryGenerators:
+        """Output generation component."""
+        return DiscoveryGenerators()
+    
+    @cached_property
+    def validator(self) -> DiscoveryValidator:
+        """Validation component."""
+        return DiscoveryValidator()
     
     def discover(self, target_path: str, options: Optional[Dict] = None, batch_kwargs: Optional[Dict] = None, force: bool = False) -> Dict[str, Any]:
         """Run the complete discovery process for a target file or directory.
@@ -64,81 +238,206 @@ class DiscoveryEngine:
         Returns:
             Dictionary containing discovery results
         """
+        target, options, cached_result = self._begin_discovery(target_path, options, batch_kwargs, force)
+        if cached_result:
+            return cached_result
+        
+        # Run discovery pipeline
+        try:
+            interview_data, analysis_data = self._run_io_phases(target, options, batch_kwargs)
+            return self._finish_discovery(target, interview_data, analysis_data)
+            
+        except Exception as e:
+            return self._error_result(e, target)
+    
+    def discover_many(self, target_paths: List[str], options: Optional[Dict] = None,
+                      batch_kwargs: Optional[Dict] = None, force: bool = False,
+                      max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Run discovery for several targets, overlapping their I/O-bound phases.
+        
+        Cache lookup, interview and analysis, which are dominated by file
+        reads and directory scans, run concurrently in a thread pool, each
+        target on its own worker engine. Synthesis, generation, validation and
+        result persistence then run in this thread, one target at a time and
+        in the order given, since generation assigns PRD ids and updates
+        shared documents.
+        
+        Args:
+            target_paths: Paths to analyze (files or directories)
+            options: Optional configuration options, applied to every target
+            batch_kwargs: Optional batch input data for interview
+            force: Force regeneration even if cache is valid
+            max_workers: Thread pool size (defaults to 4 per CPU, at most 32)
+            
+        Returns:
+            Discovery results for each target, in the order given
+        """
+        if not target_paths:
+            return []
+        
+        def run_io_phases(target_path):
+            worker = self._worker_engine()
+            # _begin_discovery adds keys to options, so give each target its own copy
+            target_options = dict(options) if options else {}
+            try:
+                target, target_options, cached_result = worker._begin_discovery(
+                    target_path, target_options, batch_kwargs, force)
+            except FileNotFoundError as e:
+                return worker, None, {
+                    'error': str(e),
+                    'target': str(target_path),
+                    'timestamp': self._get_timestamp()
+                }
+            if cached_result:
+                return worker, None, cached_result
+            try:
+                return worker, (target,) + worker._run_io_phases(target, target_options, batch_kwargs), None
+            except Exception as e:
+                return worker, None, worker._error_result(e, target)
+        
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(target_paths))) as executor:
+            prepared = list(executor.map(run_io_phases, target_paths))
+        
+        results = []
+        for worker, phase_data, result in prepared:
+            if phase_data is not None:
+                try:
+                    result = worker._finish_discovery(*phase_data)
+                except Exception as e:
+                    result = worker._error_result(e, phase_data[0])
+            results.append(result)
+        return results
+    
+    def _begin_discovery(self, target_path: str, options: Optional[Dict], batch_kwargs: Optional[Dict],
+                         force: bool) -> Tuple[Path, Dict, Optional[Dict[str, Any]]]:
+        """Resolve the target, compute its cache key and look up cached results.
+        
+        Returns:
+            Tuple of (resolved target, options, cached results or None)
+        """
         target = Path(target_path).resolve()
-        if not target.exists():
-            raise FileNotFoundError(f"Target path does not exist: {target_path}")
+        try:
+            # Captured once and reused by the cache key
+            target_stat = target.stat()
+        except OSError:
+            raise FileNotFoundError(f"Target path does not exist: {target_path}") from None
         
         # Generate cache key
         options = options or {}
         options['question_set'] = self.question_set
         if batch_kwargs:
             options['batch_kwargs'] = batch_kwargs
-        self.cache_key = self._generate_cache_key(target, options)
+        self.cache_key = self._generate_cache_key(target, options, target_stat)
         
-        # Check cache validity first
-        if not force and self._is_cache_valid(target, options, force):
+        # Check cache validity first; a forced run overwrites the entry on save
+        if self._is_cache_valid(self.cache_key, force):
             cached_result = self._load_from_cache()
             if cached_result:
-                return cached_result
+                return target, options, cached_result
         
-        # If force or cache invalid, clear any existing cache
-        if force or not self._is_cache_valid(target, options, force):
-            self._clear_cache()
+        return target, options, None
+    
+    def _run_io_phases(self, target: Path, options: Dict,
+                       batch_kwargs: Optional[Dict]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Run the interview and analysis phases, which are dominated by file I/O.
         
-        # Run discovery pipeline
-        try:
+        The analyzer's walk/read of the target does not depend on the interview
+        answers, so it is prefetched on a background thread meanwhile.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            prefetch = executor.submit(self.analyzer.prefetch, target)
+            
             # Phase 1: Interview - gather initial information
             interview_data = self.interview.conduct(target, options, batch_kwargs)
-            
-            # Phase 2: Analysis - deep code analysis
-            analysis_data = self.analyzer.analyze(target, interview_data)
-            
-            # Phase 3: Synthesis - combine and structure findings
-            synthesis_data = self.synthesizer.synthesize(analysis_data, interview_data)
-            
-            # Phase 4: Generation - create outputs and reports
-            generation_data, generation_warnings, prd_id = self.generators.generate(synthesis_data, target)
-            
-            # Phase 5: Validation - verify results
-            validation_data = self.validator.validate(generation_data, synthesis_data)
-            
-            # Combine all results
-            self.results = {
-                'target': str(target),
-                'cache_key': self.cache_key,
-                'question_set': self.question_set,
-                'interview': interview_data,
-                'analysis': analysis_data,
-                'synthesis': synthesis_data,
-                'generation': generation_data,
-                'validation': validation_data,
-                'prd_id': prd_id,
-                'warnings': generation_warnings,
-                'timestamp': self._get_timestamp()
-            }
-            
-            # Cache results
-            self._save_to_cache()
-            
-            # Save per-PRD context if PRD was generated
-            if prd_id:
-                self._save_prd_context(prd_id, synthesis_data)
-            
-            # Save legacy discovery context
-            self._save_legacy_context()
-            
-            # Try auto ctx:build handoff
-            self._try_auto_ctx_build(target)
-            
-            return self.results
-            
-        except Exception as e:
-            return {
-                'error': str(e),
-                'target': str(target),
-                'cache_key': self.cache_key,
-                'timestamp': self._get_timestamp()
-            }
+            prefetched = prefetch.result()
+        
+        # Phase 2: Analysis - deep code analysis
+        analysis_data = self.analyzer.analyze(target, interview_data, prefetched=prefetched)
+        
+        return interview_data, analysis_data
+    
+    def _finish_discovery(self, target: Path, interview_data: Dict[str, Any],
+                          analysis_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run synthesis, generation and validation, then persist the results."""
+        # Phase 3: Synthesis - combine and structure findings
+        synthesis_data = self.synthesizer.synthesize(analysis_data, interview_data)
+        
+        # Phase 4: Generation - create outputs and reports
+        generation_data, generation_warnings, prd_id = self.generators.generate(synthesis_data, target)
+        
+        # Phase 5: Validation - verify results
+        validation_data = self.validator.validate(generation_data, synthesis_data)
+        
+        # Combine all results
+        self.results = {
+            'target': str(target),
+            'cache_key': self.cache_key,
+            'question_set': self.question_set,
+            'interview': interview_data,
+            'analysis': analysis_data,
+            'synthesis': synthesis_data,
+            'generation': generation_data,
+            'validation': validation_data,
+            'prd_id': prd_id,
+            'warnings': generation_warnings,
+            # Also used as the 'created' time of the saved contexts below
+            'timestamp': self._get_timestamp()
+        }
+        
+        # Save the per-PRD context (if a PRD was generated) and the legacy
+        # discovery context before returning: callers and ctx:build read them,
+        # and some callers overwrite discovery_context.yml right afterwards
+        if prd_id:
+            self._save_prd_context(prd_id, synthesis_data)
+        self._save_legacy_context()
+        
+        # Only this engine reads the results cache back, so it is written in
+        # the background. The writer gets a copy of this engine with a deep
+        # copy of the results, so neither a following discover() nor the
+        # caller modifying the returned results can change what gets written.
+        saver = copy.copy(self)
+        saver.results = copy.deepcopy(self.results)
+        self._pending_saves = [SAVE_POOL.submit(saver._save_to_cache)]
+        
+        # Try auto ctx:build handoff
+        self._try_auto_ctx_build(target)
+        
+        return self.results
+    
+    def flush_saves(self) -> None:
+        """Wait until the results cache of the last discover() is written."""
+        pending, self._pending_saves = self._pending_saves, []
+        for future in pending:
+            future.result()
+    
+    def _error_result(self, error: Exception, target: Path) -> Dict[str, Any]:
+        """Build the result returned when the discovery pipeline fails."""
+        return {
+            'error': str(error),
+            'target': str(target),
+            'cache_key': self.cache_key,
+            'timestamp': self._get_timestamp()
+        }
+    
+    def _worker_engine(self) -> 'DiscoveryEngine':
+        """Create an engine for one discover_many() target.
+        
+        The worker shares configuration, paths and the interview with this
+        engine but gets its own stateful components, results and file
+        fingerprint records, so concurrent targets do not race on them.
+        """
+        worker = copy.copy(self)
+        for name in ('analyzer', 'synthesizer', 'generators', 'validator'):
+            worker.__dict__.pop(name, None)
+        worker.results = {}
+        worker.cache_key = None
+        worker._file_meta = None
+        worker._file_meta_dirty = False
+        worker._stat_fingerprint = None
+        worker._pending_saves = []
+        return worker
     
     def explain(self, target_path: str) -> str:
         """Generate a human-readable explanation of discovery results.
@@ -149,9 +448,10 @@ class DiscoveryEngine:
         Returns:
             Explanation string
         """
-        if not self.results or self.results.get('target') != str(Path(target_path).resolve()):
+        target = str(Path(target_path).resolve())
+        if not self.results or self.results.get('target') != target:
             # Run discovery if not already done
-            self.discover(target_path)
+            self.discover(target)
         
         if 'error' in self.results:
             return f"Discovery failed: {self.results['error']}"
@@ -161,177 +461,414 @@ class DiscoveryEngine:
     def clear_cache(self) -> None:
         """Clear the discovery cache."""
         if self.cache_dir.exists():
-            import shutil
             shutil.rmtree(self.cache_dir)
             self.cache_dir.mkdir(parents=True, exist_ok=True)
     
-    def _generate_cache_key(self, target: Path, options: Dict) -> str:
-        """Generate a comprehensive cache key based on all relevant inputs."""
-        import hashlib
-        import yaml
-        from datetime import datetime
+    def _generate_cache_key(self, target: Path, options: Dict,
+                            target_stat: Optional[os.stat_result] = None) -> str:
+        """Generate a comprehensive cache key based on all relevant inputs.
+        
+        Files contribute their content hash rather than their mtime, so a
+        ``touch`` alone does not invalidate the cache; ``_file_fingerprint``
+        keeps the hashing cheap by reusing the stored hash while a file's size
+        and mtime are unchanged.
+        
+        Before any of that, the size/mtime of every input is compared with the
+        stat fingerprint recorded by the last ``_save_to_cache`` for the same
+        target and options; on a match the recorded key is returned as is.
+        
+        Args:
+            target: Resolved target path
+            options: Discovery options
+            target_stat: The target's stat result, if the caller already has it
+        """
+        if target_stat is None:
+            try:
+                target_stat = target.stat()
+            except OSError:
+                target_stat = None
         
         # Start with basic target and options
         key_data = {
             'target': str(target),
-            'target_mtime': target.stat().st_mtime if target.exists() else 0,
             'options': options,
             'question_set': self.question_set
         }
+        inputs = self._collect_key_inputs(target)
         
-        # Add patterns.yml hash
-        patterns_file = self.root_path / "builder" / "discovery" / "patterns.yml"
-        if patterns_file.exists():
-            key_data['patterns_mtime'] = patterns_file.stat().st_mtime
-            try:
-                with open(patterns_file, 'r', encoding='utf-8') as f:
-                    patterns_content = f.read()
-                key_data['patterns_hash'] = hashlib.md5(patterns_content.encode()).hexdigest()
-            except Exception:
-                key_data['patterns_hash'] = 'error'
+        # Add feature map hash (if exists in results)
+        if hasattr(self, 'results') and 'synthesis' in self.results:
+            feature_map = self.results.get('synthesis', {}).get('feature_map', {})
+            feature_map_hasher = hashlib.blake2b(digest_size=16)
+            self._update_hash(feature_map_hasher, feature_map)
+            feature_map_hash = feature_map_hasher.hexdigest()
         else:
-            key_data['patterns_mtime'] = 0
-            key_data['patterns_hash'] = 'missing'
+            feature_map_hash = 'not_available'
         
-        # Add questions.yml hash
-        questions_file = self.root_path / "builder" / "discovery" / "questions.yml"
-        if questions_file.exists():
-            key_data['questions_mtime'] = questions_file.stat().st_mtime
-            try:
-                with open(questions_file, 'r', encoding='utf-8') as f:
-                    questions_content = f.read()
-                key_data['questions_hash'] = hashlib.md5(questions_content.encode()).hexdigest()
-            except Exception:
-                key_data['questions_hash'] = 'error'
-        else:
-            key_data['questions_mtime'] = 0
-            key_data['questions_hash'] = 'missing'
-        
-        # Add PRD documents hash (if any exist)
-        prd_dir = self.root_path / "docs" / "prd"
-        if prd_dir.exists():
-            prd_files = list(prd_dir.glob("PRD-*.md"))
-            prd_hashes = {}
-            for prd_file in prd_files:
-                try:
-                    with open(prd_file, 'r', encoding='utf-8') as f:
-                        prd_content = f.read()
-                    prd_hashes[str(prd_file.name)] = {
-                        'mtime': prd_file.stat().st_mtime,
-                        'hash': hashlib.md5(prd_content.encode()).hexdigest()
-                    }
-                except Exception:
-                    prd_hashes[str(prd_file.name)] = {'mtime': 0, 'hash': 'error'}
-            key_data['prd_files'] = prd_hashes
+        # Tier one: stat() results only, no file contents
+        identity_hasher = hashlib.blake2b(digest_size=8)
+        self._update_hash(identity_hasher, key_data)
+        fingerprint_hasher = hashlib.blake2b(digest_size=16)
+        self._update_hash(fingerprint_hasher, [
+            self._stat_signature(target, target_stat), feature_map_hash,
+            self._map_key_inputs(inputs, self._stat_signature)
+        ])
+        self._stat_fingerprint = (identity_hasher.hexdigest(), fingerprint_hasher.hexdigest())
+        recorded_key = self._load_stat_fingerprint(*self._stat_fingerprint)
+        if recorded_key:
+            return recorded_key
+        
+        # Tier two: content hashes
+        self._hash_stale_inputs(self._iter_key_inputs(inputs))
+        if target_stat is None:
+            key_data['target_mtime'] = 0
+        elif S_ISDIR(target_stat.st_mode):
+            # Directory mtime changes when entries are added or removed
+            key_data['target_mtime'] = target_stat.st_mtime
         else:
-            key_data['prd_files'] = {}
-        
-        # Add linked documents hash (ADRs, ARCH, EXEC, IMPL, etc.)
-        linked_docs = {}
-        for doc_type in ['adrs', 'arch', 'exec', 'impl', 'integrations', 'tasks', 'ux']:
-            doc_dir = self.root_path / "docs" / doc_type
-            if doc_dir.exists():
-                doc_files = list(doc_dir.glob(f"{doc_type.upper()}-*.md"))
-                type_hashes = {}
-                for doc_file in doc_files:
-                    try:
-                        with open(doc_file, 'r', encoding='utf-8') as f:
-                            doc_content = f.read()
-                        type_hashes[str(doc_file.name)] = {
-                            'mtime': doc_file.stat().st_mtime,
-                            'hash': hashlib.md5(doc_content.encode()).hexdigest()
-                        }
-                    except Exception:
-                        type_hashes[str(doc_file.name)] = {'mtime': 0, 'hash': 'error'}
-                linked_docs[doc_type] = type_hashes
-            else:
-                linked_docs[doc_type] = {}
-        key_data['linked_docs'] = linked_docs
+            key_data['target_hash'] = self._file_fingerprint(target, target_stat)
+        key_data.update(self._map_key_inputs(inputs, self._input_hash))
+        key_data['feature_map_hash'] = feature_map_hash
         
-        # Add key source file mtimes (important source files)
-        key_source_files = self._find_key_source_files(target)
-        source_mtimes = {}
-        for source_file in key_source_files:
-            try:
-                source_mtimes[str(source_file)] = source_file.stat().st_mtime
-            except Exception:
-                source_mtimes[str(source_file)] = 0
-        key_data['key_source_files'] = source_mtimes
+        self._save_file_meta()
         
-        # Add feature map hash (if exists in results)
-        if hasattr(self, 'results') and 'synthesis' in self.results:
-            feature_map = self.results.get('synthesis', {}).get('feature_map', {})
-            key_data['feature_map_hash'] = hashlib.md5(json.dumps(feature_map, sort_keys=True).encode()).hexdigest()
+        # Generate final hash
+        # 8-byte digest -> the 16 hex characters used for cache file names
+        hasher = hashlib.blake2b(digest_size=8)
+        self._update_hash(hasher, key_data)
+        return hasher.hexdigest()[:16]
+    
+    def _collect_key_inputs(self, target: Path) -> Dict[str, Any]:
+        """Stat every file that feeds the cache key.
+        
+        Returns:
+            Dict shaped like the file sections of the key data, with a
+            (path, stat result or None) pair in place of each hash
+        """
+        discovery_dir = self.root_path / "builder" / "discovery"
+        docs = self._scan_docs(self.root_path / "docs")
+        return {
+            'patterns_hash': self._stat_input(discovery_dir / "patterns.yml"),
+            'questions_hash': self._stat_input(discovery_dir / "questions.yml"),
+            # PRD documents (if any exist)
+            'prd_files': docs['prd'],
+            # Linked documents (ADRs, ARCH, EXEC, IMPL, etc.)
+            'linked_docs': {doc_type: docs[doc_type] for doc_type in LINKED_DOC_TYPES},
+            # Key source files (important source files)
+            'key_source_files': {
+                str(source_file): (source_file, stat)
+                for source_file, stat in self._find_key_source_files(target).items()
+            }
+        }
+    
+    @staticmethod
+    def _stat_input(path: Path) -> Tuple[Path, Optional[os.stat_result]]:
+        """Pair a path with its stat result, or None if it cannot be stat'ed."""
+        try:
+            return path, path.stat()
+        except OSError:
+            return path, None
+    
+    def _scan_docs(self, docs_root: Path) -> Dict[str, Dict[str, Tuple[Path, os.stat_result]]]:
+        """Stat the doc files of every ``DOC_FILE_RES`` type under docs/.
+        
+        docs/ is listed once and only the doc type directories that exist
+        are opened, instead of probing each type's directory separately.
+        
+        Returns:
+            Mapping of doc type to {file name: (path, stat result)}
+        """
+        docs: Dict[str, Dict[str, Tuple[Path, os.stat_result]]] = {doc_type: {} for doc_type in DOC_FILE_RES}
+        try:
+            with os.scandir(docs_root) as entries:
+                doc_dirs = [entry for entry in entries if entry.name in DOC_FILE_RES and entry.is_dir()]
+        except OSError:
+            return docs  # No docs directory
+        
+        for doc_dir in doc_dirs:
+            found = self._matching_files(Path(doc_dir.path), DOC_FILE_RES[doc_dir.name])
+            docs[doc_dir.name] = {path.name: (path, stat) for path, stat in found.items() if stat is not None}
+        return docs
+    
+    @classmethod
+    def _iter_key_inputs(cls, inputs: Dict[str, Any]) -> Iterable[Tuple[Path, Optional[os.stat_result]]]:
+        """Yield every (path, stat) pair in collected key inputs."""
+        if isinstance(inputs, tuple):
+            yield inputs
+            return
+        for value in inputs.values():
+            yield from cls._iter_key_inputs(value)
+    
+    @classmethod
+    def _map_key_inputs(cls, inputs: Dict[str, Any], func: Any) -> Dict[str, Any]:
+        """Replace each (path, stat) pair in collected key inputs with func(path, stat)."""
+        if isinstance(inputs, tuple):
+            return func(*inputs)
+        return {name: cls._map_key_inputs(value, func) for name, value in inputs.items()}
+    
+    @staticmethod
+    def _stat_signature(path: Path, stat: Optional[os.stat_result]) -> Optional[List[int]]:
+        """Return the [size, mtime_ns] pair compared by the stat fingerprint."""
+        if stat is None:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+    
+    def _input_hash(self, path: Path, stat: Optional[os.stat_result]) -> str:
+        """Return the content hash of one key input, or 'missing'."""
+        if stat is None:
+            return 'missing'
+        return self._file_fingerprint(path, stat)
+    
+    def _load_stat_fingerprint(self, identity: str, fingerprint: str) -> Optional[str]:
+        """Return the cache key recorded for an unchanged stat fingerprint."""
+        try:
+            data = (self.cache_dir / f"{identity}.fp.json").read_bytes()
+            record = _json_loads(data)
+        except (ValueError, IOError):
+            return None
+        if isinstance(record, dict) and record.get('fingerprint') == fingerprint:
+            return record.get('cache_key')
+        return None
+    
+    def _save_stat_fingerprint(self) -> None:
+        """Record the stat fingerprint the current cache key was computed from."""
+        if not self._stat_fingerprint:
+            return
+        identity, fingerprint = self._stat_fingerprint
+        record = {'fingerprint': fingerprint, 'cache_key': self.cache_key}
+        try:
+            self._write_atomic(self.cache_dir / f"{identity}.fp.json", _json_dumps(record))
+        except IOError:
+            pass  # Cache is optional
+    
+    @classmethod
+    def _update_hash(cls, hasher: Any, value: Any) -> None:
+        """Feed a value into a hashlib object in a canonical encoding.
+        
+        Dict keys are visited in sorted order and every fragment is tagged with
+        its type and length, so equal inputs hash equally without first being
+        serialized to one large JSON string.
+        """
+        if isinstance(value, dict):
+            hasher.update(b'd%d:' % len(value))
+            for key in sorted(value, key=str):
+                cls._update_hash(hasher, str(key))
+                cls._update_hash(hasher, value[key])
+        elif isinstance(value, (list, tuple)):
+            hasher.update(b'l%d:' % len(value))
+            for item in value:
+                cls._update_hash(hasher, item)
+        elif isinstance(value, float):
+            hasher.update(b'f' + struct.pack('<d', value))
         else:
-            key_data['feature_map_hash'] = 'not_available'
+            data = str(value).encode('utf-8')
+            hasher.update(b'%s%d:' % (type(value).__name__.encode(), len(data)))
+            hasher.update(data)
+    
+    def _file_fingerprint(self, path: Path, stat: Optional[os.stat_result] = None) -> str:
+        """Return a content hash for a file, mypy-style.
         
-        # Generate final hash
-        key_string = json.dumps(key_data, sort_keys=True)
-        return hashlib.sha256(key_string.encode()).hexdigest()[:16]
+        The stored hash is reused while the file's size and mtime match the
+        recorded ones. Otherwise the content is re-hashed and the record
+        refreshed, so a file that was only touched keeps its old hash.
+        
+        Args:
+            path: File to fingerprint
+            stat: The file's stat result, if the caller already has it
+            
+        Returns:
+            Hex digest of the content, or 'error' if it cannot be read
+        """
+        file_meta = self._get_file_meta()
+        try:
+            if stat is None:
+                stat = path.stat()
+            entry = file_meta.get(str(path))
+            if self._meta_matches(entry, stat):
+                return entry['hash']
+            
+            content_hash = self._cached_hash_file(path, stat)
+        except OSError:
+            return 'error'
+        
+        self._record_file_hash(path, stat, content_hash)
+        return content_hash
+    
+    @staticmethod
+    def _meta_matches(entry: Optional[Dict[str, Any]], stat: os.stat_result) -> bool:
+        """Check whether a file_meta record still describes a file."""
+        return bool(entry) and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
     
-    def _find_key_source_files(self, target: Path) -> List[Path]:
-        """Find key source files that should invalidate cache when changed."""
-        key_files = []
+    def _record_file_hash(self, path: Path, stat: os.stat_result, content_hash: str) -> None:
+        """Store a freshly computed content hash in the file_meta records."""
+        self._get_file_meta()[str(path)] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'hash': content_hash
+        }
+        self._file_meta_dirty = True
+    
+    def _hash_stale_inputs(self, pairs: Iterable[Tuple[Path, Optional[os.stat_result]]]) -> None:
+        """Hash, on a thread pool, every input whose file_meta record is stale.
         
-        # Always include the target file/directory
-        if target.exists():
-            if target.is_file():
-                key_files.append(target)
-            else:
-                # For directories, include key files
-                key_files.extend(self._find_important_files_in_dir(target))
-        
-        # Add common important files from project root
-        important_patterns = [
-            "package.json", "package-lock.json", "pnpm-lock.yaml",
-            "tsconfig.json", "tsconfig.*.json",
-            "requirements.txt", "pyproject.toml", "setup.py",
-            "go.mod", "go.sum",
-            "Dockerfile", "docker-compose.yml",
-            "README.md", "CHANGELOG.md",
-            ".github/workflows/*.yml", ".github/workflows/*.yaml"
-        ]
-        
-        for pattern in important_patterns:
-            if "*" in pattern:
-                # Handle glob patterns
-                matches = list(self.root_path.glob(pattern))
-                key_files.extend(matches)
+        Reads and hashlib/blake3 updates release the GIL, so threads overlap
+        the disk latency of the files. The hashes are recorded in file_meta,
+        where ``_file_fingerprint`` then finds them.
+        """
+        file_meta = self._get_file_meta()
+        stale = [(path, stat) for path, stat in pairs
+                 if stat is not None and not self._meta_matches(file_meta.get(str(path)), stat)]
+        if len(stale) < 2:
+            return  # Not worth a pool; _file_fingerprint hashes it inline
+        
+        with ThreadPoolExecutor(max_workers=min(HASH_MAX_WORKERS, len(stale))) as executor:
+            hashes = list(executor.map(self._try_hash_file, *zip(*stale)))
+        for (path, stat), content_hash in zip(stale, hashes):
+            if content_hash is not None:
+                self._record_file_hash(path, stat, content_hash)
+    
+    @classmethod
+    def _try_hash_file(cls, path: Path, stat: os.stat_result) -> Optional[str]:
+        """Hash a file's content, or return None if it cannot be read."""
+        try:
+            return cls._cached_hash_file(path, stat)
+        except OSError:
+            return None
+    
+    @classmethod
+    def _cached_hash_file(cls, path: Path, stat: os.stat_result) -> str:
+        """Hash a file's content through the process-wide LRU of content hashes."""
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        with cls._content_hash_lock:
+            content_hash = cls._content_hash_cache.get(key)
+            if content_hash is not None:
+                cls._content_hash_cache.move_to_end(key)
+                return content_hash
+        
+        content_hash = cls._hash_file(path)
+        with cls._content_hash_lock:
+            cls._content_hash_cache[key] = content_hash
+            if len(cls._content_hash_cache) > CONTENT_HASH_CACHE_SIZE:
+                cls._content_hash_cache.popitem(last=False)
+        return content_hash
+    
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        """Hash a file's content.
+        
+        Uses BLAKE3 when the blake3 package is installed and BLAKE2b otherwise;
+        both are faster than MD5. Small files are read in one call, larger
+        ones are fed to the hasher straight from a read-only mmap so their
+        bytes are never copied into Python objects.
+        """
+        hasher = content_hasher()
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+                hasher.update(f.read())
             else:
-                # Handle single files
-                file_path = self.root_path / pattern
-                if file_path.exists():
-                    key_files.append(file_path)
-        
-        # Add source files from common directories
-        source_dirs = ["src", "lib", "app", "components", "pages", "api"]
-        for src_dir in source_dirs:
-            src_path = self.root_path / src_dir
-            if src_path.exists() and src_path.is_dir():
-                key_files.extend(self._find_important_files_in_dir(src_path))
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    hasher.update(mapped)
+        return hasher.hexdigest()
+    
+    def _get_file_meta(self) -> Dict[str, Dict[str, Any]]:
+        """Load the per-file size/mtime/hash records on first use."""
+        if self._file_meta is None:
+            meta_file = self.cache_dir / FILE_META_NAME
+            try:
+                data = meta_file.read_bytes()
+                self._file_meta = _json_loads(data)
+            except (ValueError, IOError):
+                self._file_meta = {}
+        return self._file_meta
+    
+    def _save_file_meta(self) -> None:
+        """Persist the per-file records if any were added or refreshed."""
+        if not self._file_meta_dirty:
+            return
         
-        # Remove duplicates and return
-        return list(set(key_files))
+        meta_file = self.cache_dir / FILE_META_NAME
+        try:
+            self._write_atomic(meta_file, _json_dumps(self._file_meta))
+            self._file_meta_dirty = False
+        except IOError:
+            pass  # Cache is optional
     
-    def _find_important_files_in_dir(self, directory: Path) -> List[Path]:
-        """Find important files in a directory (limit to avoid too many files)."""
-        important_files = []
-        important_extensions = {'.ts', '.tsx', '.js', '.jsx', '.py', '.go', '.rs', '.java', '.cs'}
+    def _find_key_source_files(self, target: Path) -> Dict[Path, Optional[os.stat_result]]:
+        """Find key source files that should invalidate cache when changed.
+        
+        Files are collected into a dict as they are found, and a source
+        directory that is the target itself is not walked a second time.
+        
+        Returns:
+            Mapping of each file to the stat result its directory entry
+            provided, or None if it could not be stat'ed
+        """
+        key_files: Dict[Path, Optional[os.stat_result]] = {}
         
+        # Always include the target file/directory
+        if target.is_file():
+            key_files[target] = self._stat_input(target)[1]
+        elif target.is_dir():
+            # For directories, include key files
+            key_files.update(self._find_important_files_in_dir(target))
+        
+        # Add common important files from project root, and CI workflows
+        key_files.update(self._matching_files(self.root_path, KEY_ROOT_FILE_RE))
+        key_files.update(self._matching_files(self.root_path / KEY_WORKFLOW_DIR, KEY_WORKFLOW_FILE_RE))
+        
+        # Add source files from common directories (missing ones yield nothing)
+        for src_dir in KEY_SOURCE_DIRS:
+            src_path = self.root_path / src_dir
+            if src_path != target:
+                key_files.update(self._find_important_files_in_dir(src_path))
+        
+        return key_files
+    
+    @classmethod
+    def _matching_files(cls, directory: Path, pattern: 're.Pattern[str]') -> Dict[Path, Optional[os.stat_result]]:
+        """Stat the files directly in a directory whose names match a regex."""
         try:
-            for file_path in directory.rglob("*"):
-                if file_path.is_file():
-                    # Include files with important extensions
-                    if file_path.suffix in important_extensions:
-                        important_files.append(file_path)
-                    # Include configuration files
-                    elif file_path.name in ['package.json', 'tsconfig.json', 'requirements.txt', 'go.mod']:
-                        important_files.append(file_path)
-                    # Limit to prevent too many files
-                    if len(important_files) > 50:  # Reasonable limit
-                        break
-        except Exception:
-            pass  # Silently handle permission errors
+            with os.scandir(directory) as entries:
+                return {Path(entry.path): cls._entry_stat(entry) for entry in entries
+                        if pattern.match(entry.name) and entry.is_file()}
+        except OSError:
+            return {}  # Missing or unreadable directory
+    
+    @staticmethod
+    def _entry_stat(entry: os.DirEntry) -> Optional[os.stat_result]:
+        """Return a directory entry's (cached) stat result, or None on error."""
+        try:
+            return entry.stat()
+        except OSError:
+            return None
+    
+    def _find_important_files_in_dir(self, directory: Path) -> Dict[Path, Optional[os.stat_result]]:
+        """Find important files in a directory (limit to avoid too many files).
+        
+        Walks with os.scandir, pruning vendored and build output directories
+        before descending, and classifies entries by their cached dirent type.
+        
+        Returns:
+            Mapping of each file to its directory entry's stat result
+        """
+        important_files: Dict[Path, Optional[os.stat_result]] = {}
+        pending = [str(directory)]
+        while pending and len(important_files) < MAX_IMPORTANT_FILES_PER_DIR:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SOURCE_WALK_SKIP_DIRS:
+                                pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            # Files with important extensions, or configuration files
+                            if (os.path.splitext(entry.name)[1] in IMPORTANT_EXTENSIONS
+                                    or entry.name in IMPORTANT_CONFIG_FILES):
+                                important_files[Path(entry.path)] = self._entry_stat(entry)
+                                if len(important_files) >= MAX_IMPORTANT_FILES_PER_DIR:
+                                    break
+            except OSError:
+                continue  # Silently handle permission errors
         
         return important_files
     
@@ -340,35 +877,44 @@ class DiscoveryEngine:
         if not self.cache_key:
             return None
         
-        cache_file = self.cache_dir / f"{self.cache_key}.json"
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return None
-        return None
+        cache_file = self._get_cache_file()
+        try:
+            with open(cache_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+                    return self._decode_cache_payload(f.read())
+                # Large results are parsed straight from the mapped pages
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                    return self._decode_cache_payload(view)
+        except CACHE_READ_ERRORS:
+            # Missing, unreadable or corrupt cache entries are a miss
+            return None
     
-    def _is_cache_valid(self, target: Path, options: Dict, force: bool = False) -> bool:
-        """Check if the current cache is still valid based on comprehensive hash comparison."""
-        if force:
-            return False
+    @staticmethod
+    def _decode_cache_payload(data: Any) -> Dict[str, Any]:
+        """Decompress (if zstd is in use) and parse a cached results payload."""
+        if zstandard is not None:
+            data = zstandard.ZstdDecompressor().decompress(data)
+        # orjson and json both raise ValueError subclasses on bad input;
+        # only orjson parses a memoryview directly
+        return _json_loads(data if orjson is not None else bytes(data))
+    
+    def _is_cache_valid(self, cache_key: Optional[str], force: bool = False) -> bool:
+        """Check if cached results may be used for an already computed cache key.
         
-        if not self.cache_key:
+        The key is derived from the content of every input, so any cache entry
+        stored under it is current; the key is not recomputed here.
+        """
+        if force:
             return False
         
-        # Generate current cache key
-        current_cache_key = self._generate_cache_key(target, options)
-        
-        # Compare with stored cache key
-        return current_cache_key == self.cache_key
+        return bool(cache_key) and cache_key == self.cache_key
     
     def _get_cache_info(self) -> Dict[str, Any]:
         """Get information about the current cache state."""
         if not self.cache_key:
             return {'status': 'no_cache', 'cache_key': None}
         
-        cache_file = self.cache_dir / f"{self.cache_key}.json"
+        cache_file = self._get_cache_file()
         if not cache_file.exists():
             return {'status': 'missing', 'cache_key': self.cache_key}
         
@@ -389,23 +935,102 @@ class DiscoveryEngine:
         if not self.cache_key or not self.results:
             return
         
-        cache_file = self.cache_dir / f"{self.cache_key}.json"
+        # The cache is only read back by _load_from_cache, so it is written
+        # compact unless CB_DISCOVERY_CACHE_PRETTY is set for debugging
+        if not os.getenv('CB_DISCOVERY_CACHE_PRETTY'):
+            payload = _json_dumps(self.results)
+        elif orjson is not None:
+            payload = orjson.dumps(self.results, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(self.results, indent=2).encode('utf-8')
+        if zstandard is not None:
+            payload = zstandard.ZstdCompressor(level=3).compress(payload)
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(self.results, f, indent=2)
+            self._write_atomic(self._get_cache_file(), payload)
         except IOError:
-            pass  # Cache is optional
+            return  # Cache is optional
+        self._save_stat_fingerprint()
+    
+    def _get_cache_file(self) -> Path:
+        """Get the results cache file for the current cache key."""
+        return self.cache_dir / f"{self.cache_key}{CACHE_SUFFIX}"
+    
+    @staticmethod
+    def _write_atomic(path: Path, payload: bytes) -> None:
+        """Write payload to a temporary file and swap it into place.
+        
+        An interrupted write leaves the previous file (or none) rather than a
+        truncated one that would be read back as a corrupt cache entry. On
+        Linux the payload goes to an anonymous O_TMPFILE inode that is only
+        linked into the directory once fully written; elsewhere, or when the
+        filesystem lacks O_TMPFILE, a named temporary file is renamed over the
+        destination.
+        """
+        if hasattr(os, 'O_TMPFILE') and DiscoveryEngine._write_via_tmpfile(path, payload):
+            return
+        
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.chmod(tmp_path, NEW_FILE_MODE)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    
+    @staticmethod
+    def _write_via_tmpfile(path: Path, payload: bytes) -> bool:
+        """Write payload to an O_TMPFILE inode and link it in as path.
+        
+        Returns:
+            False if O_TMPFILE or /proc linking is unavailable, so the caller
+            should fall back to a named temporary file
+        """
+        try:
+            dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return False
+        try:
+            try:
+                # The kernel applies the umask, as for a plain open(path, 'w')
+                fd = os.open(path.parent, os.O_TMPFILE | os.O_WRONLY, 0o666)
+            except OSError:
+                return False  # Filesystem without O_TMPFILE support
+            try:
+                with os.fdopen(fd, 'wb', closefd=False) as f:
+                    f.write(payload)
+                # Passing dir_fd makes os.link use linkat() with AT_SYMLINK_FOLLOW,
+                # which links the inode behind the /proc fd symlink
+                fd_path = f"/proc/self/fd/{fd}"
+                try:
+                    os.link(fd_path, path.name, dst_dir_fd=dir_fd)
+                except FileExistsError:
+                    # linkat() cannot replace, so name the inode privately and
+                    # rename it over the existing file
+                    tmp_name = f".{path.name}.{os.urandom(8).hex()}.tmp"
+                    os.link(fd_path, tmp_name, dst_dir_fd=dir_fd)
+                    try:
+                        os.replace(tmp_name, path.name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+                    except OSError:
+                        os.unlink(tmp_name, dir_fd=dir_fd)
+                        raise
+                return True
+            except OSError:
+                return False  # e.g. /proc not mounted
+            finally:
+                os.close(fd)
+        finally:
+            os.close(dir_fd)
     
     def _get_timestamp(self) -> str:
-        """Get current timestamp as ISO string."""
-        from datetime import datetime
-        return datetime.now().isoformat()
+        """Get current timestamp as ISO string, to the second."""
+        return datetime.now().isoformat(timespec='seconds')
     
     def _save_prd_context(self, prd_id: str, synthesis_data: Dict[str, Any]) -> None:
         """Save discovery context to per-PRD YAML file."""
         try:
-            import yaml
-            
             # Create PRD-specific context
             # Try to get product info from multiple sources
             product_name = 'Unknown Product'
@@ -448,7 +1073,7 @@ class DiscoveryEngine:
                 'success_metrics': success_metrics,
                 'tech_stack_preferences': tech_stack_preferences,
                 'detected_tech': synthesis_data.get('detected', {}),
-                'created': self._get_timestamp(),
+                'created': self.results.get('timestamp') or self._get_timestamp(),
                 'status': 'draft',
                 'discovery_results': {
                     'interview': self.results.get('interview', {}),
@@ -461,8 +1086,7 @@ class DiscoveryEngine:
             
             # Save to PRD-specific file
             prd_file = self.cache_dir / f"{prd_id}.yml"
-            with open(prd_file, 'w', encoding='utf-8') as f:
-                yaml.dump(prd_context, f, default_flow_style=False, sort_keys=False)
+            self._write_yaml_if_changed(prd_file, prd_context)
                 
         except Exception as e:
             # Silently fail for context saving
@@ -471,8 +1095,6 @@ class DiscoveryEngine:
     def _save_legacy_context(self) -> None:
         """Save discovery context to legacy discovery_context.yml file."""
         try:
-            import yaml
-            
             # Get product info from interview data (same as per-PRD context)
             interview_questions = self.results.get('interview', {}).get('questions', {})
             product_name = interview_questions.get('product_name', 'Unknown Product')
@@ -482,7 +1104,7 @@ class DiscoveryEngine:
             legacy_context = {
                 'product': product_name,
                 'idea': main_idea,
-                'created': self._get_timestamp(),
+                'created': self.results.get('timestamp') or self._get_timestamp(),
                 'status': 'draft',
                 'question_set': self.question_set,
                 'auto_generated': True,
@@ -520,13 +1142,41 @@ class DiscoveryEngine:
             # Save to legacy file
             legacy_file = self.root_path / "builder" / "cache" / "discovery_context.yml"
             legacy_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(legacy_file, 'w', encoding='utf-8') as f:
-                yaml.dump(legacy_context, f, default_flow_style=False, sort_keys=False)
+            self._write_yaml_if_changed(legacy_file, legacy_context)
                 
         except Exception as e:
             # Silently fail for legacy context saving
             pass
     
+    def _write_yaml_if_changed(self, path: Path, data: Dict[str, Any]) -> bool:
+        """Dump data to a YAML file unless its content is unchanged.
+        
+        A digest of the data (ignoring the 'created' timestamp) is kept in a
+        ``<name>.sig`` sidecar together with the size and mtime of the file it
+        was written to; when both still match, the YAML encoding and write are
+        skipped. A file edited or removed since is rewritten.
+        
+        Returns:
+            True if the file was written
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        self._update_hash(hasher, {k: v for k, v in data.items() if k != 'created'})
+        signature = hasher.hexdigest()
+        
+        sig_file = path.with_name(path.name + '.sig')
+        try:
+            stat = path.stat()
+            if sig_file.read_text(encoding='utf-8') == f"{signature} {stat.st_size} {stat.st_mtime_ns}":
+                return False
+        except OSError:
+            pass  # No file or signature yet
+        
+        payload = yaml.dump(data, default_flow_style=False, sort_keys=False, Dumper=ContextDumper)
+        self._write_atomic(path, payload.encode('utf-8'))
+        stat = path.stat()
+        sig_file.write_text(f"{signature} {stat.st_size} {stat.st_mtime_ns}", encoding='utf-8')
+        return True
+    
     def _try_auto_ctx_build(self, target: Path) -> None:
         """Try to run ctx:build on sensible paths after discovery generation."""
         try:
@@ -554,60 +1204,91 @@ class DiscoveryEngine:
         """Find sensible paths to try ctx:build on."""
         sensible_paths = []
         
-        # Priority order for sensible paths
-        priority_paths = [
-            "src/index.ts",
-            "src/main.ts", 
-            "src/app.ts",
-            "src/auth/login.ts",
-            "src/auth/index.ts",
-            "index.ts",
-            "main.ts",
-            "app.ts"
-        ]
-        
         # Check priority paths first
-        for path in priority_paths:
-            full_path = self.root_path / path
-            if full_path.exists() and full_path.suffix in ['.ts', '.tsx']:
-                sensible_paths.append(str(full_path))
+        existing = self._existing_paths(self.root_path, PRIORITY_TS_PATHS)
+        for path in PRIORITY_TS_PATHS:
+            if path in existing:
+                sensible_paths.append(str(self.root_path / path))
         
         # If no priority paths found, find first TypeScript file
         if not sensible_paths:
-            for ext in ['*.ts', '*.tsx']:
-                for ts_file in self.root_path.rglob(ext):
-                    # Skip node_modules but allow test files
-                    ts_file_str = str(ts_file)
-                    if 'node_modules' not in ts_file_str:
-                        sensible_paths.append(ts_file_str)
-                        break
-                if sensible_paths:
-                    break
+            ts_file = self._find_first_ts_file(self.root_path)
+            if ts_file:
+                sensible_paths.append(ts_file)
         
         return sensible_paths
     
+    def _existing_paths(self, root: Path, rel_paths: Iterable[str]) -> Set[str]:
+        """Return which of the relative paths exist under root.
+        
+        Candidates are grouped by parent directory and each parent is listed
+        once, instead of stat()ing every candidate; candidates under a missing
+        parent are ruled out without touching them. Parents with fewer than
+        ``SCANDIR_MIN_CANDIDATES`` candidates are stat()ed directly, since
+        listing a directory costs more than one or two lookups.
+        """
+        by_parent: Dict[str, List[str]] = {}
+        for rel_path in rel_paths:
+            by_parent.setdefault(os.path.dirname(rel_path), []).append(rel_path)
+        
+        existing = set()
+        for parent, candidates in by_parent.items():
+            if len(candidates) < SCANDIR_MIN_CANDIDATES:
+                existing.update(c for c in candidates if os.path.exists(root / c))
+                continue
+            try:
+                with os.scandir(root / parent) as entries:
+                    names = {entry.name for entry in entries}
+            except OSError:
+                continue  # Missing or unreadable parent
+            existing.update(c for c in candidates if os.path.basename(c) in names)
+        return existing
+    
+    def _find_first_ts_file(self, root: Path) -> Optional[str]:
+        """Find a TypeScript file under root with a single pruned walk.
+        
+        Vendored and build output directories are skipped before descending,
+        and directory checks use the cached dirent type. The walk stops at the
+        first ``.ts`` file; a ``.tsx`` file is returned only if there is none.
+        """
+        first_tsx = None
+        pending = [str(root)]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SOURCE_WALK_SKIP_DIRS:
+                                pending.append(entry.path)
+                        elif entry.name.endswith('.ts'):
+                            return entry.path
+                        elif first_tsx is None and entry.name.endswith('.tsx'):
+                            first_tsx = entry.path
+            except OSError:
+                continue  # Unreadable directory
+        return first_tsx
+    
     def _run_ctx_build(self, target_path: str) -> bool:
-        """Run ctx:build on the target path and return success status."""
+        """Run ctx:build on the target path and return success status.
+        
+        The command runs in a separate interpreter with cwd=root_path and a
+        30 second timeout. Set CB_CTX_BUILD_IN_PROCESS=1 to call the CLI group
+        in this process instead, which skips re-importing the builder package.
+        That path is only taken when root_path is the current directory, since
+        ctx:build resolves its cache from the cwd. It has no timeout, and it
+        redirects sys.stdout/sys.stderr for the whole process while it runs.
+        """
+        args = ['ctx:build', target_path, '--purpose', 'implement']
         try:
-            import subprocess
-            import os
-            
-            # Run ctx:build command
-            cmd = [
-                'python3', '-m', 'builder', 'ctx:build', target_path,
-                '--purpose', 'implement'
-            ]
-            
-            result = subprocess.run(
-                cmd, 
-                cwd=self.root_path,
-                capture_output=True, 
-                text=True,
-                timeout=30
-            )
+            in_process = (os.getenv('CB_CTX_BUILD_IN_PROCESS') == '1'
+                          and self.root_path.resolve() == Path.cwd().resolve())
+            if in_process:
+                succeeded = self._run_ctx_build_in_process(args)
+            else:
+                succeeded = self._run_ctx_build_subprocess(args)
             
             # Check if ctx:build succeeded
-            if result.returncode == 0:
+            if succeeded:
                 # Check if context files were created
                 context_md = self.root_path / "builder" / "cache" / "context.md"
                 pack_context = self.root_path / "builder" / "cache" / "pack_context.json"
@@ -619,3 +1300,28 @@ class DiscoveryEngine:
             
         except Exception:
             return False
+    
+    def _run_ctx_build_in_process(self, args: List[str]) -> bool:
+        """Invoke a CLI command in this process, with its output captured."""
+        import click
+        from ..core.cli import cli
+        
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            try:
+                cli.main(args=args, prog_name='builder', standalone_mode=False)
+            except (click.ClickException, click.Abort):
+                return False
+            except SystemExit as e:
+                return not e.code
+        return True
+    
+    def _run_ctx_build_subprocess(self, args: List[str]) -> bool:
+        """Invoke a CLI command in a separate interpreter."""
+        result = subprocess.run(
+            ['python3', '-m', 'builder'] + args,
+            cwd=self.root_path,
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+        return result.returncode == 0
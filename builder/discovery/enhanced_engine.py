@@ -7,11 +7,27 @@ depth control, ignore patterns, and structured outputs for report.json and summa
 """
 
 import os
+import re
 import json
 import time
+import hashlib
+from collections import Counter, OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Any, Set, Tuple
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+from .analyzer import WALK_SKIP_DIRS
+from .engine import DiscoveryEngine
 
 # Import overlay paths for consistent path resolution
 try:
@@ -20,6 +36,200 @@ try:
 except ImportError:
     overlay_paths = None
 
+# Vendored, generated and virtualenv directories the scan never descends into
+# (hidden directories are skipped too); they still count as subdirectories
+SCAN_SKIP_DIRS = WALK_SKIP_DIRS | {'build', 'target'}
+
+# Directory reads block on I/O, so threads overlap scandir/stat syscalls
+SCAN_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Parsed JSON files kept per engine; least recently used entries are dropped
+JSON_CACHE_SIZE = 64
+
+# File extension (lower-cased, with dot) to programming language
+LANGUAGE_MAP: Dict[str, str] = {
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.ts': 'TypeScript',
+    '.jsx': 'JavaScript',
+    '.tsx': 'TypeScript',
+    '.java': 'Java',
+    '.c': 'C',
+    '.cpp': 'C++',
+    '.cc': 'C++',
+    '.cxx': 'C++',
+    '.h': 'C/C++',
+    '.hpp': 'C++',
+    '.cs': 'C#',
+    '.go': 'Go',
+    '.rs': 'Rust',
+    '.rb': 'Ruby',
+    '.php': 'PHP',
+    '.swift': 'Swift',
+    '.kt': 'Kotlin',
+    '.scala': 'Scala',
+    '.clj': 'Clojure',
+    '.hs': 'Haskell',
+    '.ml': 'OCaml',
+    '.fs': 'F#',
+    '.erl': 'Erlang',
+    '.ex': 'Elixir',
+    '.dart': 'Dart',
+    '.r': 'R',
+    '.m': 'Objective-C',
+    '.mm': 'Objective-C++',
+    '.pl': 'Perl',
+    '.sh': 'Shell',
+    '.bash': 'Bash',
+    '.zsh': 'Zsh',
+    '.fish': 'Fish',
+    '.ps1': 'PowerShell',
+    '.bat': 'Batch',
+    '.cmd': 'Batch',
+    '.lua': 'Lua',
+    '.vim': 'Vim Script',
+    '.sql': 'SQL',
+    '.html': 'HTML',
+    '.css': 'CSS',
+    '.scss': 'SCSS',
+    '.sass': 'Sass',
+    '.less': 'Less',
+    '.xml': 'XML',
+    '.yaml': 'YAML',
+    '.yml': 'YAML',
+    '.json': 'JSON',
+    '.toml': 'TOML',
+    '.ini': 'INI',
+    '.cfg': 'Config',
+    '.conf': 'Config',
+    '.md': 'Markdown',
+    '.rst': 'reStructuredText',
+    '.tex': 'LaTeX',
+    '.dockerfile': 'Dockerfile'
+}
+
+# Tool -> indicator files (relative to the root, trailing "/" for directories),
+# in order of preference; a tool is reported with its first present indicator
+PACKAGE_MANAGER_INDICATORS: Dict[str, List[str]] = {
+    "npm": ["package.json", "package-lock.json"],
+    "yarn": ["package.json", "yarn.lock"],
+    "pnpm": ["package.json", "pnpm-lock.yaml"],
+    "pip": ["requirements.txt", "setup.py", "pyproject.toml"],
+    "poetry": ["pyproject.toml", "poetry.lock"],
+    "pipenv": ["Pipfile", "Pipfile.lock"],
+    "cargo": ["Cargo.toml", "Cargo.lock"],
+    "composer": ["composer.json", "composer.lock"],
+    "maven": ["pom.xml"],
+    "gradle": ["build.gradle", "build.gradle.kts"],
+    "gem": ["Gemfile", "Gemfile.lock"],
+    "go": ["go.mod", "go.sum"],
+    "nuget": ["packages.config", "*.csproj"],
+    "conan": ["conanfile.txt", "conanfile.py"]
+}
+
+TEST_RUNNER_CONFIGS: Dict[str, List[str]] = {
+    "jest": ["jest.config.js", "jest.config.ts", "jest.config.json"],
+    "vitest": ["vitest.config.js", "vitest.config.ts"],
+    "mocha": ["mocha.opts", ".mocharc.js", ".mocharc.json"],
+    "jasmine": ["jasmine.json", "spec/support/jasmine.json"],
+    "karma": ["karma.conf.js", "karma.conf.ts"],
+    "cypress": ["cypress.json", "cypress.config.js"],
+    "playwright": ["playwright.config.js", "playwright.config.ts"],
+    "pytest": ["pytest.ini", "pyproject.toml", "tox.ini"],
+    "unittest": ["test_*.py", "*_test.py"],
+    "nose": ["nosetests.cfg", "setup.cfg"],
+    "rspec": ["spec/", "Rakefile"],
+    "minitest": ["test/", "test_helper.rb"],
+    "junit": ["pom.xml", "build.gradle"],
+    "testng": ["testng.xml", "pom.xml"],
+    "cargo-test": ["Cargo.toml"],
+    "go-test": ["*_test.go", "go.mod"]
+}
+
+LINT_TOOL_CONFIGS: Dict[str, List[str]] = {
+    "eslint": [".eslintrc.js", ".eslintrc.json", ".eslintrc.yml", "eslint.config.js"],
+    "prettier": [".prettierrc", ".prettierrc.js", ".prettierrc.json"],
+    "stylelint": [".stylelintrc", ".stylelintrc.js", ".stylelintrc.json"],
+    "tslint": ["tslint.json"],
+    "jshint": [".jshintrc", ".jshintrc.json"],
+    "pylint": [".pylintrc", "pylint.ini", "setup.cfg"],
+    "flake8": [".flake8", "setup.cfg", "tox.ini"],
+    "black": ["pyproject.toml", "setup.cfg"],
+    "isort": [".isort.cfg", "pyproject.toml", "setup.cfg"],
+    "mypy": ["mypy.ini", "pyproject.toml"],
+    "rubocop": [".rubocop.yml", ".rubocop.yaml"],
+    "rustfmt": ["rustfmt.toml"],
+    "gofmt": ["go.mod"],
+    "clang-format": [".clang-format"]
+}
+
+MONOREPO_TOOL_CONFIGS: Dict[str, List[str]] = {
+    "lerna": ["lerna.json", "package.json"],
+    "nx": ["nx.json", "workspace.json"],
+    "rush": ["rush.json"],
+    "yarn-workspaces": ["package.json"],
+    "pnpm-workspaces": ["pnpm-workspace.yaml"],
+    "bazel": ["WORKSPACE", "BUILD"],
+    "buck": [".buckconfig", "BUCK"],
+    "gradle-multiproject": ["settings.gradle", "settings.gradle.kts"]
+}
+
+
+def invert_indicators(table: Dict[str, List[str]]) -> Dict[str, Tuple[Tuple[str, int], ...]]:
+    """Invert a tool -> indicators table into indicator -> (tool, preference) pairs.
+    
+    Args:
+        table: Indicator lists per tool, most preferred first
+        
+    Returns:
+        Each distinct indicator with the tools it signals and its index in
+        their lists
+    """
+    index: Dict[str, List[Tuple[str, int]]] = {}
+    for tool, indicators in table.items():
+        for rank, indicator in enumerate(indicators):
+            index.setdefault(indicator, []).append((tool, rank))
+    return {indicator: tuple(owners) for indicator, owners in index.items()}
+
+
+PACKAGE_MANAGER_INDEX = invert_indicators(PACKAGE_MANAGER_INDICATORS)
+TEST_RUNNER_INDEX = invert_indicators(TEST_RUNNER_CONFIGS)
+LINT_TOOL_INDEX = invert_indicators(LINT_TOOL_CONFIGS)
+MONOREPO_TOOL_INDEX = invert_indicators(MONOREPO_TOOL_CONFIGS)
+
+# Frameworks recognized from package.json dependency names, in precedence
+# order; the lookahead finds overlapping names so precedence can be applied
+FRAMEWORK_DEPS = ("react", "vue", "angular", "express", "next")
+FRAMEWORK_DEP_RE = re.compile(f"(?=({'|'.join(FRAMEWORK_DEPS)}))", re.IGNORECASE | re.ASCII)
+
+# Lower-cased file names containing any of these count as test files
+TEST_FILE_RE = re.compile(r"test|spec")
+
+
+@lru_cache(maxsize=32)
+def compile_ignore_patterns(patterns: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """Compile ignore patterns into one regex matching any of them as a substring.
+    
+    Args:
+        patterns: Ignore patterns, matched literally
+        
+    Returns:
+        Compiled alternation, or None when there are no patterns
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(map(re.escape, patterns)))
+
+
+@dataclass
+class DirListing:
+    """One directory of the project tree, as listed by a single scandir."""
+    path: str
+    rel_path: str
+    level: int
+    dir_names: List[str]
+    files: List[os.DirEntry]
+
 
 class EnhancedDiscoveryEngine:
     """Enhanced discovery engine with comprehensive project analysis."""
@@ -55,6 +265,16 @@ class EnhancedDiscoveryEngine:
         self.analysis_results = {}
         self.start_time = None
         self.end_time = None
+        
+        # Tree listing shared by all detectors, built on first use per analysis
+        self._file_index: Optional[List[DirListing]] = None
+        self._walk_cache: Dict[Tuple[int, Tuple[str, ...]], List[os.DirEntry]] = {}
+        self._name_stats_cache: Dict[Tuple[int, Tuple[str, ...]], Tuple[Dict[str, int], int]] = {}
+        self._exists_cache: Dict[str, bool] = {}
+        self._root_entries: Optional[Dict[str, bool]] = None
+        
+        # Parsed JSON keyed by a hash of the file content
+        self._json_cache: 'OrderedDict[bytes, Any]' = OrderedDict()
     
     def analyze_project(self, 
                        depth: int = 3, 
@@ -72,12 +292,42 @@ class EnhancedDiscoveryEngine:
         """
         self.start_time = time.time()
         ignore_patterns = ignore_patterns or []
+        self._file_index = None
+        self._walk_cache.clear()
+        self._name_stats_cache.clear()
+        self._exists_cache.clear()
+        self._root_entries = None
         
         print(f"🔍 Analyzing project structure (depth: {depth})...")
         
-        # Initialize analysis results
-        self.analysis_results = {
-            "project_info": self._analyze_project_info(),
+        # Reuse the stored results when no file in the tree has changed
+        cache_path = self.cache_dir / f"{self._tree_fingerprint(depth, ignore_patterns)}.json"
+        # Read uncached: the results are large, returned to the caller and updated below
+        cached = self._read_json(cache_path)
+        if cached is not None:
+            self.analysis_results = cached
+            self.analysis_results["metadata"].update(ci_mode=ci_mode, timestamp=datetime.now().isoformat())
+        else:
+            self.analysis_results = self._run_analysis(depth, ignore_patterns, ci_mode)
+            self._write_cached_results(cache_path)
+        
+        # Calculate analysis duration
+        self.end_time = time.time()
+        self.analysis_results["metadata"]["analysis_duration"] = self.end_time - self.start_time
+        
+        # Generate outputs
+        self._generate_report_json()
+        self._generate_summary_md()
+        
+        # Update project state
+        self._update_project_state()
+        
+        return self.analysis_results
+    
+    def _run_analysis(self, depth: int, ignore_patterns: List[str], ci_mode: bool) -> Dict[str, Any]:
+        """Run every detector over the scanned tree."""
+        return {
+            "project_info": self._analyze_project_info(depth, ignore_patterns),
             "languages": self._detect_languages(depth, ignore_patterns),
             "frameworks": self._detect_frameworks(depth, ignore_patterns),
             "package_managers": self._detect_package_managers(depth, ignore_patterns),
@@ -95,51 +345,89 @@ class EnhancedDiscoveryEngine:
                 "analysis_duration": 0
             }
         }
+    
+    def _tree_fingerprint(self, depth: int, ignore_patterns: List[str]) -> str:
+        """Fingerprint the scanned tree and analysis options.
         
-        # Calculate analysis duration
-        self.end_time = time.time()
-        self.analysis_results["metadata"]["analysis_duration"] = self.end_time - self.start_time
+        Covers every listed directory's entries and each file's size and
+        mtime, so nested edits invalidate the stored results (a directory's
+        own mtime only changes when entries are added or removed). Skipped
+        directories contribute their own mtime, which covers nested
+        indicators such as ``.github/workflows/``. The engine's own cache
+        and output directories are left out, since every run rewrites them.
         
-        # Generate outputs
-        self._generate_report_json()
-        self._generate_summary_md()
+        Returns:
+            Hex digest used as the results cache file name
+        """
+        owned = []
+        for directory in (self.cache_dir, self.output_dir):
+            try:
+                owned.append(str(directory.resolve().relative_to(self.root_path)) + os.sep)
+            except ValueError:
+                pass
+        owned = tuple(owned)
         
-        # Update project state
-        self._update_project_state()
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(json.dumps([str(self.root_path), depth, ignore_patterns]).encode("utf-8"))
+        for listing in self._scan_once():
+            if owned and (listing.rel_path + os.sep).startswith(owned):
+                continue
+            digest.update(f"\0{listing.rel_path}\0{sorted(listing.dir_names)}".encode("utf-8", "surrogateescape"))
+            for name in sorted(filter(self._skips_dir, listing.dir_names)):
+                try:
+                    signature = str(os.stat(os.path.join(listing.path, name)).st_mtime_ns)
+                except OSError:
+                    signature = "missing"
+                digest.update(f"\0{name}/\0{signature}".encode("utf-8", "surrogateescape"))
+            for entry in sorted(listing.files, key=lambda e: e.name):
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                    signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+                except OSError:
+                    signature = "missing"
+                digest.update(f"\0{entry.name}\0{signature}".encode("utf-8", "surrogateescape"))
+        return digest.hexdigest()
+    
+    def _write_cached_results(self, cache_path: Path) -> None:
+        """Store analysis results under their tree fingerprint, atomically."""
+        if orjson is not None:
+            payload = orjson.dumps(self.analysis_results, default=str, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            payload = json.dumps(self.analysis_results, default=str).encode('utf-8')
         
-        return self.analysis_results
+        try:
+            DiscoveryEngine._write_atomic(cache_path, payload)
+        except OSError:
+            pass  # The cache is optional
     
-    def _analyze_project_info(self) -> Dict[str, Any]:
+    def _analyze_project_info(self, depth: int, ignore_patterns: List[str]) -> Dict[str, Any]:
         """Analyze basic project information."""
         return {
             "name": self.root_path.name,
             "path": str(self.root_path),
             "type": self._determine_project_type(),
-            "size_bytes": self._calculate_project_size(),
-            "file_count": self._count_files(),
-            "directory_count": self._count_directories()
+            "size_bytes": self._calculate_project_size(depth, ignore_patterns),
+            "file_count": self._count_files(depth, ignore_patterns),
+            "directory_count": self._count_directories(depth, ignore_patterns)
         }
     
     def _detect_languages(self, depth: int, ignore_patterns: List[str]) -> Dict[str, Any]:
         """Detect programming languages used in the project."""
-        languages = {}
-        file_extensions = {}
+        file_extensions, _ = self._file_name_stats(depth, ignore_patterns)
         
-        for file_path in self._walk_files(depth, ignore_patterns):
-            ext = file_path.suffix.lower()
-            if ext:
-                file_extensions[ext] = file_extensions.get(ext, 0) + 1
-                
-                # Map extensions to languages
-                lang = self._extension_to_language(ext)
-                if lang:
-                    languages[lang] = languages.get(lang, 0) + 1
+        # Map extensions to languages; first-seen order matches a per-file pass
+        languages = Counter()
+        for ext, count in file_extensions.items():
+            lang = LANGUAGE_MAP.get(ext)
+            if lang:
+                languages[lang] += count
         
         return {
             "detected": list(languages.keys()),
-            "file_counts": languages,
+            "file_counts": dict(languages),
             "extensions": file_extensions,
-            "primary": max(languages.items(), key=lambda x: x[1])[0] if languages else None
+            # Ties go to the language seen first, as with max()
+            "primary": languages.most_common(1)[0][0] if languages else None
         }
     
     def _detect_frameworks(self, depth: int, ignore_patterns: List[str]) -> Dict[str, Any]:
@@ -167,32 +455,21 @@ class EnhancedDiscoveryEngine:
         
         for framework, indicators in framework_indicators.items():
             for indicator in indicators:
-                if (self.root_path / indicator).exists():
+                if self._exists(indicator):
                     frameworks.add(framework)
                     framework_files[framework] = indicator
                     break
         
         # Check package.json for framework dependencies
-        package_json = self.root_path / "package.json"
-        if package_json.exists():
-            try:
-                with open(package_json, 'r') as f:
-                    data = json.load(f)
-                    deps = {**data.get("dependencies", {}), **data.get("devDependencies", {})}
-                    
-                    for dep in deps.keys():
-                        if "react" in dep.lower():
-                            frameworks.add("react")
-                        elif "vue" in dep.lower():
-                            frameworks.add("vue")
-                        elif "angular" in dep.lower():
-                            frameworks.add("angular")
-                        elif "express" in dep.lower():
-                            frameworks.add("express")
-                        elif "next" in dep.lower():
-                            frameworks.add("next")
-            except (json.JSONDecodeError, FileNotFoundError):
-                pass
+        data = self._load_json(self.root_path / "package.json")
+        if data is not None:
+            deps = {**data.get("dependencies", {}), **data.get("devDependencies", {})}
+            
+            for dep in deps.keys():
+                matched = FRAMEWORK_DEP_RE.findall(dep)
+                if matched:
+                    matched = {name.lower() for name in matched}
+                    frameworks.add(next(name for name in FRAMEWORK_DEPS if name in matched))
         
         return {
             "detected": list(frameworks),
@@ -202,33 +479,8 @@ class EnhancedDiscoveryEngine:
     
     def _detect_package_managers(self, depth: int, ignore_patterns: List[str]) -> Dict[str, Any]:
         """Detect package managers used."""
-        package_managers = set()
-        manager_files = {}
-        
-        # Check for package manager files
-        manager_indicators = {
-            "npm": ["package.json", "package-lock.json"],
-            "yarn": ["package.json", "yarn.lock"],
-            "pnpm": ["package.json", "pnpm-lock.yaml"],
-            "pip": ["requirements.txt", "setup.py", "pyproject.toml"],
-            "poetry": ["pyproject.toml", "poetry.lock"],
-            "pipenv": ["Pipfile", "Pipfile.lock"],
-            "cargo": ["Cargo.toml", "Cargo.lock"],
-            "composer": ["composer.json", "composer.lock"],
-            "maven": ["pom.xml"],
-            "gradle": ["build.gradle", "build.gradle.kts"],
-            "gem": ["Gemfile", "Gemfile.lock"],
-            "go": ["go.mod", "go.sum"],
-            "nuget": ["packages.config", "*.csproj"],
-            "conan": ["conanfile.txt", "conanfile.py"]
-        }
-        
-        for manager, indicators in manager_indicators.items():
-            for indicator in indicators:
-                if (self.root_path / indicator).exists():
-                    package_managers.add(manager)
-                    manager_files[manager] = indicator
-                    break
+        manager_files = self._first_indicators(PACKAGE_MANAGER_INDICATORS, PACKAGE_MANAGER_INDEX)
+        package_managers = set(manager_files)
         
         return {
             "detected": list(package_managers),
@@ -238,41 +490,10 @@ class EnhancedDiscoveryEngine:
     
     def _detect_test_runners(self, depth: int, ignore_patterns: List[str]) -> Dict[str, Any]:
         """Detect test runners and testing frameworks."""
-        test_runners = set()
-        test_files = {}
-        
-        # Check for test configuration files
-        test_configs = {
-            "jest": ["jest.config.js", "jest.config.ts", "jest.config.json"],
-            "vitest": ["vitest.config.js", "vitest.config.ts"],
-            "mocha": ["mocha.opts", ".mocharc.js", ".mocharc.json"],
-            "jasmine": ["jasmine.json", "spec/support/jasmine.json"],
-            "karma": ["karma.conf.js", "karma.conf.ts"],
-            "cypress": ["cypress.json", "cypress.config.js"],
-            "playwright": ["playwright.config.js", "playwright.config.ts"],
-            "pytest": ["pytest.ini", "pyproject.toml", "tox.ini"],
-            "unittest": ["test_*.py", "*_test.py"],
-            "nose": ["nosetests.cfg", "setup.cfg"],
-            "rspec": ["spec/", "Rakefile"],
-            "minitest": ["test/", "test_helper.rb"],
-            "junit": ["pom.xml", "build.gradle"],
-            "testng": ["testng.xml", "pom.xml"],
-            "cargo-test": ["Cargo.toml"],
-            "go-test": ["*_test.go", "go.mod"]
-        }
-        
-        for runner, configs in test_configs.items():
-            for config in configs:
-                if (self.root_path / config).exists():
-                    test_runners.add(runner)
-                    test_files[runner] = config
-                    break
+        test_files = self._first_indicators(TEST_RUNNER_CONFIGS, TEST_RUNNER_INDEX)
+        test_runners = set(test_files)
         
-        # Count test files
-        test_file_count = 0
-        for file_path in self._walk_files(depth, ignore_patterns):
-            if any(pattern in file_path.name.lower() for pattern in ["test", "spec", "_test", "_spec"]):
-                test_file_count += 1
+        _, test_file_count = self._file_name_stats(depth, ignore_patterns)
         
         return {
             "detected": list(test_runners),
@@ -283,34 +504,8 @@ class EnhancedDiscoveryEngine:
     
     def _detect_lint_formatters(self, depth: int, ignore_patterns: List[str]) -> Dict[str, Any]:
         """Detect linting and formatting tools."""
-        tools = set()
-        config_files = {}
-        
-        # Check for linting/formatting config files
-        tool_configs = {
-            "eslint": [".eslintrc.js", ".eslintrc.json", ".eslintrc.yml", "eslint.config.js"],
-            "prettier": [".prettierrc", ".prettierrc.js", ".prettierrc.json", "prettier.config.js"],
-            "stylelint": [".stylelintrc", ".stylelintrc.js", ".stylelintrc.json"],
-            "tslint": ["tslint.json"],
-            "jshint": [".jshintrc", ".jshintrc.json"],
-            "pylint": [".pylintrc", "pylint.ini", "setup.cfg"],
-            "flake8": [".flake8", "setup.cfg", "tox.ini"],
-            "black": ["pyproject.toml", "setup.cfg"],
-            "isort": [".isort.cfg", "pyproject.toml", "setup.cfg"],
-            "mypy": ["mypy.ini", "pyproject.toml"],
-            "rubocop": [".rubocop.yml", ".rubocop.yaml"],
-            "rustfmt": ["rustfmt.toml"],
-            "gofmt": ["go.mod"],
-            "clang-format": [".clang-format"],
-            "prettier": [".prettierrc", ".prettierrc.js", ".prettierrc.json"]
-        }
-        
-        for tool, configs in tool_configs.items():
-            for config in configs:
-                if (self.root_path / config).exists():
-                    tools.add(tool)
-                    config_files[tool] = config
-                    break
+        config_files = self._first_indicators(LINT_TOOL_CONFIGS, LINT_TOOL_INDEX)
+        tools = set(config_files)
         
         return {
             "detected": list(tools),
@@ -320,30 +515,20 @@ class EnhancedDiscoveryEngine:
     
     def _detect_monorepo_hints(self, depth: int, ignore_patterns: List[str]) -> Dict[str, Any]:
         """Detect monorepo patterns and tools."""
-        hints = set()
-        indicators = {}
-        
-        # Check for monorepo tools
-        monorepo_tools = {
-            "lerna": ["lerna.json", "package.json"],
-            "nx": ["nx.json", "workspace.json"],
-            "rush": ["rush.json"],
-            "yarn-workspaces": ["package.json"],
-            "pnpm-workspaces": ["pnpm-workspace.yaml"],
-            "bazel": ["WORKSPACE", "BUILD"],
-            "buck": [".buckconfig", "BUCK"],
-            "gradle-multiproject": ["settings.gradle", "settings.gradle.kts"]
-        }
+        indicators = self._first_indicators(MONOREPO_TOOL_CONFIGS, MONOREPO_TOOL_INDEX)
+        hints = set(indicators)
         
-        for tool, configs in monorepo_tools.items():
-            for config in configs:
-                if (self.root_path / config).exists():
-                    hints.add(tool)
-                    indicators[tool] = config
-                    break
-        
-        # Check for multiple package.json files (workspace indicator)
-        package_json_count = len(list(self.root_path.rglob("package.json")))
+        # Check for multiple package.json files (workspace indicator), within
+        # the depth limit and outside ignored paths
+        ignore_re = compile_ignore_patterns(tuple(ignore_patterns))
+        package_json_count = 0
+        for listing in self._listings(depth, ignore_re):
+            count = listing.dir_names.count("package.json") + sum(entry.name == "package.json" for entry in listing.files)
+            if count and ignore_re:
+                prefix = "" if listing.rel_path == "." else listing.rel_path + os.sep
+                if ignore_re.search(prefix + "package.json"):
+                    continue
+            package_json_count += count
         if package_json_count > 1:
             hints.add("multiple-package-json")
             indicators["multiple-package-json"] = package_json_count
@@ -365,22 +550,26 @@ class EnhancedDiscoveryEngine:
         }
         
         # Analyze directory structure
-        for root, dirs, files in os.walk(self.root_path):
-            if depth > 0 and root.count(os.sep) - self.root_path.as_posix().count(os.sep) >= depth:
+        ignore_re = compile_ignore_patterns(tuple(ignore_patterns))
+        pruned = None
+        for listing in self._scan_once():
+            # Descendants of a too-deep or ignored directory are skipped too
+            if pruned and listing.path.startswith(pruned):
                 continue
+            pruned = None
             
-            rel_path = Path(root).relative_to(self.root_path)
-            if rel_path == Path("."):
+            if listing.rel_path == ".":
                 continue
             
-            # Skip ignored directories
-            if any(pattern in str(rel_path) for pattern in ignore_patterns):
+            # Respect depth limit and skip ignored directories
+            if (depth > 0 and listing.level >= depth) or (ignore_re and ignore_re.search(listing.rel_path)):
+                pruned = listing.path + os.sep
                 continue
             
-            structure["directories"][str(rel_path)] = {
-                "file_count": len(files),
-                "subdir_count": len(dirs),
-                "size_bytes": sum((Path(root) / f).stat().st_size for f in files if (Path(root) / f).exists())
+            structure["directories"][listing.rel_path] = {
+                "file_count": len(listing.files),
+                "subdir_count": len(listing.dir_names),
+                "size_bytes": sum(self._file_size(entry) or 0 for entry in listing.files)
             }
         
         return structure
@@ -395,23 +584,19 @@ class EnhancedDiscoveryEngine:
         }
         
         # Analyze package.json if it exists
-        package_json = self.root_path / "package.json"
-        if package_json.exists():
-            try:
-                with open(package_json, 'r') as f:
-                    data = json.load(f)
-                    deps = data.get("dependencies", {})
-                    dev_deps = data.get("devDependencies", {})
-                    
-                    dependencies["external"] = deps
-                    dependencies["dev_dependencies"] = dev_deps
-                    dependencies["total_count"] = len(deps) + len(dev_deps)
-            except (json.JSONDecodeError, FileNotFoundError):
-                pass
+        data = self._load_json(self.root_path / "package.json")
+        if data is not None:
+            # Copied, since the parse is cached and "python" is added below
+            deps = dict(data.get("dependencies", {}))
+            dev_deps = dict(data.get("devDependencies", {}))
+            
+            dependencies["external"] = deps
+            dependencies["dev_dependencies"] = dev_deps
+            dependencies["total_count"] = len(deps) + len(dev_deps)
         
         # Analyze requirements.txt if it exists
         requirements_txt = self.root_path / "requirements.txt"
-        if requirements_txt.exists():
+        if self._exists("requirements.txt"):
             try:
                 with open(requirements_txt, 'r') as f:
                     lines = f.readlines()
@@ -443,12 +628,11 @@ class EnhancedDiscoveryEngine:
             for pattern in patterns:
                 if pattern.endswith("/"):
                     # Directory pattern
-                    dir_path = self.root_path / pattern.rstrip("/")
-                    if dir_path.exists():
+                    if self._exists(pattern):
                         found_files.append(pattern)
                 else:
                     # File pattern
-                    if (self.root_path / pattern).exists():
+                    if self._exists(pattern):
                         found_files.append(pattern)
             
             if found_files:
@@ -460,139 +644,305 @@ class EnhancedDiscoveryEngine:
             "categories": list(config_files.keys())
         }
     
-    def _walk_files(self, depth: int, ignore_patterns: List[str]) -> List[Path]:
-        """Walk through files respecting depth and ignore patterns."""
-        files = []
+    def _scan_once(self) -> List[DirListing]:
+        """List the whole project tree once and share it across detectors.
+        
+        Directories are listed in parallel, one task per directory, and
+        reassembled in ``os.walk`` top-down order so results do not depend
+        on thread scheduling. Symlinked, hidden and ``SCAN_SKIP_DIRS``
+        directories are listed but not descended into.
+        
+        Returns:
+            One listing per directory, in ``os.walk`` order
+        """
+        if self._file_index is not None:
+            return self._file_index
         
-        for root, dirs, filenames in os.walk(self.root_path):
-            # Skip ignored directories
-            if any(pattern in root for pattern in ignore_patterns):
+        root = str(self.root_path)
+        listings: Dict[str, Optional[DirListing]] = {}
+        children: Dict[str, List[str]] = {}
+        with ThreadPoolExecutor(max_workers=SCAN_MAX_WORKERS, thread_name_prefix="discovery-scan") as pool:
+            pending = {pool.submit(self._list_directory, root, ".", 0)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, listing, subdirs = future.result()
+                    listings[path] = listing
+                    children[path] = [subdir[0] for subdir in subdirs]
+                    pending.update(pool.submit(self._list_directory, *subdir) for subdir in subdirs)
+        
+        index = []
+        stack = [root]
+        while stack:
+            listing = listings[stack.pop()]
+            if listing is None:
                 continue
+            index.append(listing)
+            stack.extend(reversed(children[listing.path]))
+        
+        self._file_index = index
+        return index
+    
+    @staticmethod
+    def _list_directory(path: str, rel_path: str, level: int
+                        ) -> Tuple[str, Optional[DirListing], List[Tuple[str, str, int]]]:
+        """List one directory and warm the stat cache of its files.
+        
+        Returns:
+            The directory path, its listing (None if unreadable) and the
+            subdirectories to descend into
+        """
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            return path, None, []
+        
+        dir_names, files, subdirs = [], [], []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                # DirEntry caches the result, so later size lookups are free
+                try:
+                    entry.stat(follow_symlinks=False)
+                except OSError:
+                    pass
+                files.append(entry)
+                continue
+            dir_names.append(entry.name)
+            if not (EnhancedDiscoveryEngine._skips_dir(entry.name) or entry.is_symlink()):
+                child_rel = entry.name if rel_path == "." else os.path.join(rel_path, entry.name)
+                subdirs.append((entry.path, child_rel, level + 1))
+        
+        return path, DirListing(path, rel_path, level, dir_names, files), subdirs
+    
+    @staticmethod
+    def _skips_dir(name: str) -> bool:
+        """Check whether the scan leaves a directory's contents out."""
+        return name.startswith('.') or name in SCAN_SKIP_DIRS
+    
+    def _first_indicators(self, table: Dict[str, List[str]],
+                          index: Dict[str, Tuple[Tuple[str, int], ...]]) -> Dict[str, str]:
+        """Find each tool's most preferred indicator that exists.
+        
+        Every distinct indicator is checked once, however many tools share
+        it (e.g. pyproject.toml, setup.cfg).
+        
+        Args:
+            table: Indicator lists per tool, most preferred first
+            index: The same table inverted by ``invert_indicators``
             
-            # Respect depth limit
-            if depth > 0 and root.count(os.sep) - self.root_path.as_posix().count(os.sep) >= depth:
+        Returns:
+            Tool to its first present indicator, in table order
+        """
+        best: Dict[str, Tuple[int, str]] = {}
+        for indicator, owners in index.items():
+            if not self._exists(indicator):
+                continue
+            for tool, rank in owners:
+                if tool not in best or rank < best[tool][0]:
+                    best[tool] = (rank, indicator)
+        return {tool: best[tool][1] for tool in table if tool in best}
+    
+    def _exists(self, rel_path: str) -> bool:
+        """Check whether a path relative to the project root exists.
+        
+        Top-level names are answered from the root listing of the shared
+        scan; nested paths are stat'ed once per analysis.
+        """
+        exists = self._exists_cache.get(rel_path)
+        if exists is not None:
+            return exists
+        
+        name = rel_path.rstrip("/")
+        if "/" not in name:
+            if self._root_entries is None:
+                self._root_entries = {}
+                root = self._scan_once()[:1]
+                if root and root[0].rel_path == ".":
+                    # Directories resolved via is_dir(); a file symlink exists only if its target does
+                    self._root_entries.update((dir_name, True) for dir_name in root[0].dir_names)
+                    self._root_entries.update((entry.name, not entry.is_symlink() or os.path.exists(entry.path))
+                                              for entry in root[0].files)
+            exists = self._root_entries.get(name, False)
+        else:
+            exists = (self.root_path / name).exists()
+        self._exists_cache[rel_path] = exists
+        return exists
+    
+    def _listings(self, depth: int, ignore_re: Optional[re.Pattern]) -> Iterator[DirListing]:
+        """Yield directory listings within the depth limit whose path is not ignored.
+        
+        A directory that is ignored or past the depth limit drops its whole
+        subtree, since every descendant path contains it and is deeper.
+        """
+        pruned = None
+        for listing in self._scan_once():
+            # Listings are in top-down order, so a subtree is contiguous
+            if pruned and listing.path.startswith(pruned):
+                continue
+            pruned = None
+            
+            # Skip ignored directories and respect depth limit
+            if (ignore_re and ignore_re.search(listing.path)) or (depth > 0 and listing.level >= depth):
+                pruned = listing.path + os.sep
                 continue
             
-            for filename in filenames:
-                file_path = Path(root) / filename
-                rel_path = file_path.relative_to(self.root_path)
+            yield listing
+    
+    def _iter_files(self, depth: int, ignore_patterns: List[str]) -> Iterator[os.DirEntry]:
+        """Yield non-hidden files respecting depth and ignore patterns."""
+        ignore_re = compile_ignore_patterns(tuple(ignore_patterns))
+        for listing in self._listings(depth, ignore_re):
+            prefix = "" if listing.rel_path == "." else listing.rel_path + os.sep
+            for entry in listing.files:
+                name = entry.name
                 
-                # Skip ignored files
-                if any(pattern in str(rel_path) for pattern in ignore_patterns):
+                # Skip hidden files (scandir never yields empty names)
+                if name[0] == '.':
                     continue
                 
-                # Skip hidden files
-                if filename.startswith('.'):
+                # Skip ignored files
+                if ignore_re and ignore_re.search(prefix + name):
                     continue
                 
-                files.append(file_path)
-        
+                yield entry
+    
+    def _walk_files(self, depth: int, ignore_patterns: List[str]) -> List[Path]:
+        """Walk through files respecting depth and ignore patterns."""
+        return [Path(entry.path) for entry in self._files(depth, ignore_patterns)]
+    
+    def _files(self, depth: int, ignore_patterns: List[str]) -> List[os.DirEntry]:
+        """Return the filtered files for a depth and pattern set, computed once per analysis."""
+        key = (depth, tuple(ignore_patterns))
+        files = self._walk_cache.get(key)
+        if files is None:
+            files = self._walk_cache[key] = list(self._iter_files(depth, ignore_patterns))
         return files
     
+    def _file_name_stats(self, depth: int, ignore_patterns: List[str]) -> Tuple[Dict[str, int], int]:
+        """Count file extensions and test files in one pass over the file names.
+        
+        Returns:
+            Extension counts (lower-cased, in first-seen order) and the
+            number of test files
+        """
+        key = (depth, tuple(ignore_patterns))
+        stats = self._name_stats_cache.get(key)
+        if stats is None:
+            suffixes = []
+            test_file_count = 0
+            for entry in self._files(depth, ignore_patterns):
+                name = entry.name
+                suffixes.append(self._suffix(name).lower())
+                if TEST_FILE_RE.search(name.lower()):
+                    test_file_count += 1
+            extensions = Counter(suffixes)
+            extensions.pop('', None)
+            stats = self._name_stats_cache[key] = (dict(extensions), test_file_count)
+        return stats
+    
+    def _load_json(self, path: Path) -> Optional[Any]:
+        """Parse a JSON file, reusing the parse of identical content.
+        
+        Keyed by a hash of the bytes rather than mtime/size, so rewrites
+        within the mtime granularity are still noticed and identical files
+        (e.g. workspace package.json copies) share one parse. Callers must
+        not mutate the returned data.
+        
+        Returns:
+            Parsed data, or None if the file is missing or not valid JSON
+        """
+        try:
+            content = path.read_bytes()
+        except OSError:
+            return None
+        
+        key = hashlib.blake2b(content, digest_size=16).digest()
+        if key in self._json_cache:
+            self._json_cache.move_to_end(key)
+            return self._json_cache[key]
+        
+        try:
+            data = _json_loads(content)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            data = None
+        self._json_cache[key] = data
+        if len(self._json_cache) > JSON_CACHE_SIZE:
+            self._json_cache.popitem(last=False)
+        return data
+    
+    @staticmethod
+    def _read_json(path: Path) -> Optional[Any]:
+        """Parse a JSON file, or return None if it is missing or not valid JSON."""
+        try:
+            return _json_loads(path.read_bytes())
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+            return None
+    
+    @staticmethod
+    def _file_size(entry: os.DirEntry) -> Optional[int]:
+        """Return a file's size from its cached lstat, or None if it cannot be stat'ed.
+        
+        Symlinks count as the link itself, so a link into a large tree (or
+        a broken link) does not add its target's size.
+        """
+        try:
+            return entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            return None
+    
+    @staticmethod
+    def _suffix(name: str) -> str:
+        """Return a file name's suffix, with the same rules as ``Path.suffix``."""
+        i = name.rfind('.')
+        return name[i:] if 0 < i < len(name) - 1 else ''
+    
     def _extension_to_language(self, ext: str) -> Optional[str]:
         """Map file extension to programming language."""
-        language_map = {
-            '.py': 'Python',
-            '.js': 'JavaScript',
-            '.ts': 'TypeScript',
-            '.jsx': 'JavaScript',
-            '.tsx': 'TypeScript',
-            '.java': 'Java',
-            '.c': 'C',
-            '.cpp': 'C++',
-            '.cc': 'C++',
-            '.cxx': 'C++',
-            '.h': 'C/C++',
-            '.hpp': 'C++',
-            '.cs': 'C#',
-            '.go': 'Go',
-            '.rs': 'Rust',
-            '.rb': 'Ruby',
-            '.php': 'PHP',
-            '.swift': 'Swift',
-            '.kt': 'Kotlin',
-            '.scala': 'Scala',
-            '.clj': 'Clojure',
-            '.hs': 'Haskell',
-            '.ml': 'OCaml',
-            '.fs': 'F#',
-            '.erl': 'Erlang',
-            '.ex': 'Elixir',
-            '.dart': 'Dart',
-            '.r': 'R',
-            '.m': 'Objective-C',
-            '.mm': 'Objective-C++',
-            '.pl': 'Perl',
-            '.sh': 'Shell',
-            '.bash': 'Bash',
-            '.zsh': 'Zsh',
-            '.fish': 'Fish',
-            '.ps1': 'PowerShell',
-            '.bat': 'Batch',
-            '.cmd': 'Batch',
-            '.lua': 'Lua',
-            '.vim': 'Vim Script',
-            '.sql': 'SQL',
-            '.html': 'HTML',
-            '.css': 'CSS',
-            '.scss': 'SCSS',
-            '.sass': 'Sass',
-            '.less': 'Less',
-            '.xml': 'XML',
-            '.yaml': 'YAML',
-            '.yml': 'YAML',
-            '.json': 'JSON',
-            '.toml': 'TOML',
-            '.ini': 'INI',
-            '.cfg': 'Config',
-            '.conf': 'Config',
-            '.md': 'Markdown',
-            '.rst': 'reStructuredText',
-            '.tex': 'LaTeX',
-            '.dockerfile': 'Dockerfile'
-        }
-        
-        return language_map.get(ext)
+        return LANGUAGE_MAP.get(ext)
     
     def _determine_project_type(self) -> str:
         """Determine the primary project type."""
-        if (self.root_path / "package.json").exists():
+        if self._exists("package.json"):
             return "Node.js"
-        elif (self.root_path / "requirements.txt").exists() or (self.root_path / "setup.py").exists():
+        elif self._exists("requirements.txt") or self._exists("setup.py"):
             return "Python"
-        elif (self.root_path / "Cargo.toml").exists():
+        elif self._exists("Cargo.toml"):
             return "Rust"
-        elif (self.root_path / "go.mod").exists():
+        elif self._exists("go.mod"):
             return "Go"
-        elif (self.root_path / "pom.xml").exists():
+        elif self._exists("pom.xml"):
             return "Java"
-        elif (self.root_path / "Gemfile").exists():
+        elif self._exists("Gemfile"):
             return "Ruby"
-        elif (self.root_path / "composer.json").exists():
+        elif self._exists("composer.json"):
             return "PHP"
         else:
             return "Mixed/Unknown"
     
-    def _calculate_project_size(self) -> int:
+    def _calculate_project_size(self, depth: int, ignore_patterns: List[str]) -> int:
         """Calculate total project size in bytes."""
-        total_size = 0
-        for file_path in self._walk_files(5, []):
-            try:
-                total_size += file_path.stat().st_size
-            except (OSError, FileNotFoundError):
-                pass
-        return total_size
+        return sum(self._file_size(entry) or 0 for entry in self._files(depth, ignore_patterns))
     
-    def _count_files(self) -> int:
+    def _count_files(self, depth: int, ignore_patterns: List[str]) -> int:
         """Count total number of files."""
-        return len(self._walk_files(5, []))
+        return len(self._files(depth, ignore_patterns))
     
-    def _count_directories(self) -> int:
-        """Count total number of directories."""
-        dir_count = 0
-        for root, dirs, files in os.walk(self.root_path):
-            dir_count += len(dirs)
-        return dir_count
+    def _count_directories(self, depth: int, ignore_patterns: List[str]) -> int:
+        """Count the subdirectories of every directory within depth, minus ignored ones."""
+        ignore_re = compile_ignore_patterns(tuple(ignore_patterns))
+        if ignore_re is None:
+            return sum(len(listing.dir_names) for listing in self._listings(depth, None))
+        return sum(
+            1
+            for listing in self._listings(depth, ignore_re)
+            for name in listing.dir_names
+            if not ignore_re.search(listing.path + os.sep + name)
+        )
     
     def _calculate_framework_confidence(self, frameworks: Set[str]) -> Dict[str, float]:
         """Calculate confidence scores for detected frameworks."""
@@ -626,7 +976,7 @@ class EnhancedDiscoveryEngine:
         ]
         
         for file_path in coverage_files:
-            if (self.root_path / file_path).exists():
+            if self._exists(file_path):
                 coverage_tools.append(file_path)
         
         return coverage_tools
@@ -658,11 +1008,11 @@ class EnhancedDiscoveryEngine:
     
     def _detect_organization_pattern(self) -> str:
         """Detect project organization pattern."""
-        if (self.root_path / "src").exists():
+        if self._exists("src"):
             return "src-based"
-        elif (self.root_path / "lib").exists():
+        elif self._exists("lib"):
             return "lib-based"
-        elif (self.root_path / "app").exists():
+        elif self._exists("app"):
             return "app-based"
         else:
             return "flat"
@@ -671,8 +1021,16 @@ class EnhancedDiscoveryEngine:
         """Generate detailed report.json file."""
         report_file = self.output_dir / "report.json"
         
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(self.analysis_results, f, indent=2, default=str, sort_keys=True)
+        if orjson is not None:
+            report_file.write_bytes(orjson.dumps(
+                self.analysis_results, default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+            ))
+        else:
+            # json.dump writes encoder chunks as they are produced, so the
+            # pretty-printed report is never held in memory as one string
+            with open(report_file, 'w', encoding='utf-8') as f:
+                json.dump(self.analysis_results, f, indent=2, default=str, sort_keys=True)
         
         print(f"📄 Detailed report saved to: {report_file}")
     
@@ -680,91 +1038,92 @@ class EnhancedDiscoveryEngine:
         """Generate human-readable summary.md file."""
         summary_file = self.output_dir / "summary.md"
         
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            f.write("# Project Discovery Summary\n\n")
-            
-            # Project info
-            project_info = self.analysis_results["project_info"]
-            f.write(f"**Project:** {project_info['name']}\n")
-            f.write(f"**Type:** {project_info['type']}\n")
-            f.write(f"**Files:** {project_info['file_count']:,}\n")
-            f.write(f"**Size:** {project_info['size_bytes']:,} bytes\n\n")
-            
-            # Languages
-            languages = self.analysis_results["languages"]
-            f.write("## Languages\n")
-            if languages["detected"]:
-                f.write(f"**Primary:** {languages['primary']}\n")
-                f.write(f"**Detected:** {', '.join(languages['detected'])}\n")
-            else:
-                f.write("No programming languages detected.\n")
-            f.write("\n")
-            
-            # Frameworks
-            frameworks = self.analysis_results["frameworks"]
-            f.write("## Frameworks\n")
-            if frameworks["detected"]:
-                f.write(f"**Detected:** {', '.join(frameworks['detected'])}\n")
-            else:
-                f.write("No frameworks detected.\n")
-            f.write("\n")
-            
-            # Package Managers
-            package_managers = self.analysis_results["package_managers"]
-            f.write("## Package Managers\n")
-            if package_managers["detected"]:
-                f.write(f"**Primary:** {package_managers['primary']}\n")
-                f.write(f"**Detected:** {', '.join(package_managers['detected'])}\n")
-            else:
-                f.write("No package managers detected.\n")
-            f.write("\n")
-            
-            # Test Runners
-            test_runners = self.analysis_results["test_runners"]
-            f.write("## Testing\n")
-            if test_runners["detected"]:
-                f.write(f"**Runners:** {', '.join(test_runners['detected'])}\n")
-                f.write(f"**Test Files:** {test_runners['test_file_count']}\n")
-            else:
-                f.write("No test runners detected.\n")
-            f.write("\n")
-            
-            # Linting/Formatting
-            lint_tools = self.analysis_results["lint_formatters"]
-            f.write("## Code Quality\n")
-            if lint_tools["detected"]:
-                f.write(f"**Tools:** {', '.join(lint_tools['detected'])}\n")
-            else:
-                f.write("No linting/formatting tools detected.\n")
-            f.write("\n")
-            
-            # Monorepo
-            monorepo = self.analysis_results["monorepo_hints"]
-            f.write("## Monorepo\n")
-            f.write(f"**Is Monorepo:** {monorepo['is_monorepo']}\n")
-            if monorepo["detected"]:
-                f.write(f"**Tools:** {', '.join(monorepo['detected'])}\n")
-            f.write("\n")
-            
-            # Dependencies
-            deps = self.analysis_results["dependencies"]
-            f.write("## Dependencies\n")
-            f.write(f"**Total:** {deps['total_count']}\n")
-            f.write(f"**External:** {len(deps['external'])}\n")
-            f.write(f"**Dev Dependencies:** {len(deps['dev_dependencies'])}\n\n")
-            
-            # Configuration
-            config = self.analysis_results["configuration"]
-            f.write("## Configuration\n")
-            f.write(f"**Config Files:** {config['total_config_files']}\n")
-            f.write(f"**Categories:** {', '.join(config['categories'])}\n\n")
-            
-            # Analysis metadata
-            metadata = self.analysis_results["metadata"]
-            f.write("## Analysis Metadata\n")
-            f.write(f"**Depth:** {metadata['analysis_depth']}\n")
-            f.write(f"**Duration:** {metadata['analysis_duration']:.2f}s\n")
-            f.write(f"**Timestamp:** {metadata['timestamp']}\n")
+        parts = ["# Project Discovery Summary\n\n"]
+        
+        # Project info
+        project_info = self.analysis_results["project_info"]
+        parts.append(f"**Project:** {project_info['name']}\n")
+        parts.append(f"**Type:** {project_info['type']}\n")
+        parts.append(f"**Files:** {project_info['file_count']:,}\n")
+        parts.append(f"**Size:** {project_info['size_bytes']:,} bytes\n\n")
+        
+        # Languages
+        languages = self.analysis_results["languages"]
+        parts.append("## Languages\n")
+        if languages["detected"]:
+            parts.append(f"**Primary:** {languages['primary']}\n")
+            parts.append(f"**Detected:** {', '.join(languages['detected'])}\n")
+        else:
+            parts.append("No programming languages detected.\n")
+        parts.append("\n")
+        
+        # Frameworks
+        frameworks = self.analysis_results["frameworks"]
+        parts.append("## Frameworks\n")
+        if frameworks["detected"]:
+            parts.append(f"**Detected:** {', '.join(frameworks['detected'])}\n")
+        else:
+            parts.append("No frameworks detected.\n")
+        parts.append("\n")
+        
+        # Package Managers
+        package_managers = self.analysis_results["package_managers"]
+        parts.append("## Package Managers\n")
+        if package_managers["detected"]:
+            parts.append(f"**Primary:** {package_managers['primary']}\n")
+            parts.append(f"**Detected:** {', '.join(package_managers['detected'])}\n")
+        else:
+            parts.append("No package managers detected.\n")
+        parts.append("\n")
+        
+        # Test Runners
+        test_runners = self.analysis_results["test_runners"]
+        parts.append("## Testing\n")
+        if test_runners["detected"]:
+            parts.append(f"**Runners:** {', '.join(test_runners['detected'])}\n")
+            parts.append(f"**Test Files:** {test_runners['test_file_count']}\n")
+        else:
+            parts.append("No test runners detected.\n")
+        parts.append("\n")
+        
+        # Linting/Formatting
+        lint_tools = self.analysis_results["lint_formatters"]
+        parts.append("## Code Quality\n")
+        if lint_tools["detected"]:
+            parts.append(f"**Tools:** {', '.join(lint_tools['detected'])}\n")
+        else:
+            parts.append("No linting/formatting tools detected.\n")
+        parts.append("\n")
+        
+        # Monorepo
+        monorepo = self.analysis_results["monorepo_hints"]
+        parts.append("## Monorepo\n")
+        parts.append(f"**Is Monorepo:** {monorepo['is_monorepo']}\n")
+        if monorepo["detected"]:
+            parts.append(f"**Tools:** {', '.join(monorepo['detected'])}\n")
+        parts.append("\n")
+        
+        # Dependencies
+        deps = self.analysis_results["dependencies"]
+        parts.append("## Dependencies\n")
+        parts.append(f"**Total:** {deps['total_count']}\n")
+        parts.append(f"**External:** {len(deps['external'])}\n")
+        parts.append(f"**Dev Dependencies:** {len(deps['dev_dependencies'])}\n\n")
+        
+        # Configuration
+        config = self.analysis_results["configuration"]
+        parts.append("## Configuration\n")
+        parts.append(f"**Config Files:** {config['total_config_files']}\n")
+        parts.append(f"**Categories:** {', '.join(config['categories'])}\n\n")
+        
+        # Analysis metadata
+        metadata = self.analysis_results["metadata"]
+        parts.append("## Analysis Metadata\n")
+        parts.append(f"**Depth:** {metadata['analysis_depth']}\n")
+        parts.append(f"**Duration:** {metadata['analysis_duration']:.2f}s\n")
+        parts.append(f"**Timestamp:** {metadata['timestamp']}\n")
+        
+        summary_file.write_text("".join(parts), encoding='utf-8')
         
         print(f"📊 Summary saved to: {summary_file}")
     
@@ -774,16 +1133,18 @@ class EnhancedDiscoveryEngine:
             # Try to update state.json
             state_file = self.cache_dir / "state.json"
             if state_file.exists():
-                with open(state_file, 'r') as f:
-                    state = json.load(f)
+                state = _json_loads(state_file.read_bytes())
             else:
                 state = {"project_state": {}}
             
             state["project_state"]["discovered"] = True
             state["project_state"]["discovery_timestamp"] = datetime.now().isoformat()
             
-            with open(state_file, 'w') as f:
-                json.dump(state, f, indent=2, sort_keys=True)
+            if orjson is not None:
+                state_file.write_bytes(orjson.dumps(state, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+            else:
+                with open(state_file, 'w') as f:
+                    json.dump(state, f, indent=2, sort_keys=True)
                 
         except (json.JSONDecodeError, FileNotFoundError, OSError):
             # If we can't update state, that's okay
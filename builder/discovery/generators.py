@@ -15,6 +15,141 @@ from ..config.settings import get_config
 config = get_config()
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Recommendation priority keywords, matched case-insensitively anywhere in the text
+HIGH_PRIORITY_RE = re.compile(r'security|critical|urgent|fix', re.IGNORECASE)
+MEDIUM_PRIORITY_RE = re.compile(r'improve|optimize|consider', re.IGNORECASE)
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to indented JSON, with orjson when it is installed.
+    
+    As with ``json.dumps``, values JSON cannot represent raise TypeError.
+    Non-ASCII text is written as UTF-8 rather than ``\\u`` escapes, since
+    orjson cannot escape it; the stdlib fallback matches.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def _render_summary(lines: List[str], summary: Dict[str, Any]) -> None:
+    """Append the Markdown report's summary section."""
+    lines.append("## Summary")
+    lines.append("")
+    lines.append(f"- **Lines of Code:** {summary.get('lines_of_code', 0)}")
+    lines.append(f"- **Complexity Level:** {summary.get('complexity_level', 'unknown')}")
+    lines.append(f"- **Quality Level:** {summary.get('quality_level', 'unknown')}")
+    lines.append(f"- **Maintainability Score:** {summary.get('maintainability_score', 0)}/100")
+    lines.append(f"- **Has Tests:** {'Yes' if summary.get('has_tests') else 'No'}")
+    lines.append(f"- **Has Error Handling:** {'Yes' if summary.get('has_error_handling') else 'No'}")
+    lines.append("")
+
+
+def _render_insights(lines: List[str], insights: List[str]) -> None:
+    """Append the Markdown report's key insights section."""
+    lines.append("## Key Insights")
+    lines.append("")
+    for i, insight in enumerate(insights, 1):
+        lines.append(f"{i}. {insight}")
+    lines.append("")
+
+
+def _render_architecture(lines: List[str], arch: Dict[str, Any]) -> None:
+    """Append the Markdown report's architecture analysis section."""
+    lines.append("## Architecture Analysis")
+    lines.append("")
+    lines.append(f"- **Style:** {arch.get('style', 'unknown')}")
+    lines.append(f"- **Maturity:** {arch.get('maturity', 'unknown')}")
+    
+    patterns = arch.get('patterns', [])
+    if patterns:
+        lines.append(f"- **Patterns:** {', '.join(patterns)}")
+    
+    layers = arch.get('layers', [])
+    if layers:
+        lines.append(f"- **Layers:** {', '.join(layers)}")
+    lines.append("")
+
+
+def _render_quality(lines: List[str], quality: Dict[str, Any]) -> None:
+    """Append the Markdown report's quality assessment section."""
+    lines.append("## Quality Assessment")
+    lines.append("")
+    score = quality.get('overall_score', 0)
+    level = quality.get('quality_level', 'unknown')
+    lines.append(f"- **Overall Score:** {score}/100 ({level})")
+    
+    issues = quality.get('issues', [])
+    if issues:
+        lines.append("- **Issues:**")
+        for issue in issues:
+            lines.append(f"  - {issue}")
+    lines.append("")
+
+
+def _render_patterns(lines: List[str], patterns: Dict[str, Any]) -> None:
+    """Append the Markdown report's design and anti-pattern sections."""
+    lines.append("## Patterns")
+    lines.append("")
+    
+    for heading, key in (("Design Patterns", 'design_patterns'), ("Anti-Patterns", 'anti_patterns')):
+        found = patterns.get(key, [])
+        if found:
+            lines.append(f"### {heading}")
+            for pattern in found:
+                name = pattern.get('name', '')
+                confidence = pattern.get('confidence', 0)
+                lines.append(f"- {name} (confidence: {confidence:.1f})")
+            lines.append("")
+
+
+def _render_recommendations(lines: List[str], recommendations: List[str]) -> None:
+    """Append the Markdown report's recommendations section."""
+    lines.append("## Recommendations")
+    lines.append("")
+    for i, rec in enumerate(recommendations, 1):
+        lines.append(f"{i}. {rec}")
+    lines.append("")
+
+
+def _render_risks(lines: List[str], risks: List[Dict[str, Any]]) -> None:
+    """Append the Markdown report's risk factors section."""
+    lines.append("## Risk Factors")
+    lines.append("")
+    for risk in risks:
+        risk_type = risk.get('type', 'unknown')
+        severity = risk.get('severity', 'unknown')
+        description = risk.get('description', '')
+        lines.append(f"- **{risk_type.title()}** ({severity}): {description}")
+    lines.append("")
+
+
+def _render_opportunities(lines: List[str], opportunities: List[str]) -> None:
+    """Append the Markdown report's opportunities section."""
+    lines.append("## Opportunities")
+    lines.append("")
+    for i, opp in enumerate(opportunities, 1):
+        lines.append(f"{i}. {opp}")
+    lines.append("")
+
+
+# Markdown report sections in output order, keyed by their synthesis_data entry
+MARKDOWN_SECTIONS = (
+    ('summary', _render_summary),
+    ('insights', _render_insights),
+    ('architecture_analysis', _render_architecture),
+    ('quality_assessment', _render_quality),
+    ('patterns', _render_patterns),
+    ('recommendations', _render_recommendations),
+    ('risk_factors', _render_risks),
+    ('opportunities', _render_opportunities),
+)
+
 
 class DiscoveryGenerators:
     """Generates various outputs from discovery synthesis."""
@@ -35,19 +170,21 @@ class DiscoveryGenerators:
         """
         warnings = []
         prd_id = None
+        # One clock reading per run so every artifact carries the same timestamp
+        now = datetime.now()
         
         try:
             # Generate PRD with proper ID
-            prd_id = self._generate_prd_id(synthesis_data)
-            prd_artifacts = self._generate_prd_documentation(synthesis_data, target, prd_id)
+            prd_id = self._generate_prd_id(synthesis_data, now=now)
+            prd_artifacts = self._generate_prd_documentation(synthesis_data, target, prd_id, now=now)
             
             # Generate other outputs
             generation_data = {
-                'reports': self._generate_reports(synthesis_data, target),
+                'reports': self._generate_reports(synthesis_data, target, now=now),
                 'documentation': self._generate_documentation(synthesis_data, target),
                 'diagrams': self._generate_diagrams(synthesis_data, target),
                 'recommendations': self._generate_recommendation_files(synthesis_data, target),
-                'metadata': self._generate_metadata(synthesis_data, target),
+                'metadata': self._generate_metadata(synthesis_data, target, now=now),
                 'prd': prd_artifacts
             }
             
@@ -65,160 +202,62 @@ class DiscoveryGenerators:
                 'prd': {}
             }, warnings, prd_id or "PRD-ERROR"
     
-    def _generate_reports(self, synthesis_data: Dict[str, Any], target: Path) -> Dict[str, str]:
+    def _generate_reports(self, synthesis_data: Dict[str, Any], target: Path,
+                          now: Optional[datetime] = None) -> Dict[str, str]:
         """Generate various report formats."""
         reports = {}
+        now = now or datetime.now()
         
         # JSON report
-        reports['json'] = self._generate_json_report(synthesis_data, target)
+        reports['json'] = self._generate_json_report(synthesis_data, target, now=now)
         
         # Markdown report
-        reports['markdown'] = self._generate_markdown_report(synthesis_data, target)
+        reports['markdown'] = self._generate_markdown_report(synthesis_data, target, now=now)
         
         # Text report
-        reports['text'] = self._generate_text_report(synthesis_data, target)
+        reports['text'] = self._generate_text_report(synthesis_data, target, now=now)
         
         return reports
     
-    def _generate_json_report(self, synthesis_data: Dict[str, Any], target: Path) -> str:
+    def _generate_json_report(self, synthesis_data: Dict[str, Any], target: Path,
+                              now: Optional[datetime] = None) -> str:
         """Generate JSON report."""
         report_data = {
             'target': str(target),
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': (now or datetime.now()).isoformat(),
             'synthesis': synthesis_data,
             'generated_by': 'code-builder-discovery'
         }
         
-        return json.dumps(report_data, indent=2)
+        return _dumps(report_data)
     
-    def _generate_markdown_report(self, synthesis_data: Dict[str, Any], target: Path) -> str:
+    def _generate_markdown_report(self, synthesis_data: Dict[str, Any], target: Path,
+                                  now: Optional[datetime] = None) -> str:
         """Generate Markdown report."""
         lines = []
         
         # Header
         lines.append(f"# Discovery Report: {target.name}")
-        lines.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        lines.append(f"**Generated:** {(now or datetime.now()):%Y-%m-%d %H:%M:%S}")
         lines.append(f"**Target:** `{target}`")
         lines.append("")
         
-        # Summary
-        summary = synthesis_data.get('summary', {})
-        if summary:
-            lines.append("## Summary")
-            lines.append("")
-            lines.append(f"- **Lines of Code:** {summary.get('lines_of_code', 0)}")
-            lines.append(f"- **Complexity Level:** {summary.get('complexity_level', 'unknown')}")
-            lines.append(f"- **Quality Level:** {summary.get('quality_level', 'unknown')}")
-            lines.append(f"- **Maintainability Score:** {summary.get('maintainability_score', 0)}/100")
-            lines.append(f"- **Has Tests:** {'Yes' if summary.get('has_tests') else 'No'}")
-            lines.append(f"- **Has Error Handling:** {'Yes' if summary.get('has_error_handling') else 'No'}")
-            lines.append("")
-        
-        # Insights
-        insights = synthesis_data.get('insights', [])
-        if insights:
-            lines.append("## Key Insights")
-            lines.append("")
-            for i, insight in enumerate(insights, 1):
-                lines.append(f"{i}. {insight}")
-            lines.append("")
-        
-        # Architecture Analysis
-        arch = synthesis_data.get('architecture_analysis', {})
-        if arch:
-            lines.append("## Architecture Analysis")
-            lines.append("")
-            lines.append(f"- **Style:** {arch.get('style', 'unknown')}")
-            lines.append(f"- **Maturity:** {arch.get('maturity', 'unknown')}")
-            
-            patterns = arch.get('patterns', [])
-            if patterns:
-                lines.append(f"- **Patterns:** {', '.join(patterns)}")
-            
-            layers = arch.get('layers', [])
-            if layers:
-                lines.append(f"- **Layers:** {', '.join(layers)}")
-            lines.append("")
-        
-        # Quality Assessment
-        quality = synthesis_data.get('quality_assessment', {})
-        if quality:
-            lines.append("## Quality Assessment")
-            lines.append("")
-            score = quality.get('overall_score', 0)
-            level = quality.get('quality_level', 'unknown')
-            lines.append(f"- **Overall Score:** {score}/100 ({level})")
-            
-            issues = quality.get('issues', [])
-            if issues:
-                lines.append("- **Issues:**")
-                for issue in issues:
-                    lines.append(f"  - {issue}")
-            lines.append("")
-        
-        # Patterns
-        patterns = synthesis_data.get('patterns', {})
-        if patterns:
-            lines.append("## Patterns")
-            lines.append("")
-            
-            design_patterns = patterns.get('design_patterns', [])
-            if design_patterns:
-                lines.append("### Design Patterns")
-                for pattern in design_patterns:
-                    name = pattern.get('name', '')
-                    confidence = pattern.get('confidence', 0)
-                    lines.append(f"- {name} (confidence: {confidence:.1f})")
-                lines.append("")
-            
-            anti_patterns = patterns.get('anti_patterns', [])
-            if anti_patterns:
-                lines.append("### Anti-Patterns")
-                for pattern in anti_patterns:
-                    name = pattern.get('name', '')
-                    confidence = pattern.get('confidence', 0)
-                    lines.append(f"- {name} (confidence: {confidence:.1f})")
-                lines.append("")
-        
-        # Recommendations
-        recommendations = synthesis_data.get('recommendations', [])
-        if recommendations:
-            lines.append("## Recommendations")
-            lines.append("")
-            for i, rec in enumerate(recommendations, 1):
-                lines.append(f"{i}. {rec}")
-            lines.append("")
-        
-        # Risk Factors
-        risks = synthesis_data.get('risk_factors', [])
-        if risks:
-            lines.append("## Risk Factors")
-            lines.append("")
-            for risk in risks:
-                risk_type = risk.get('type', 'unknown')
-                severity = risk.get('severity', 'unknown')
-                description = risk.get('description', '')
-                lines.append(f"- **{risk_type.title()}** ({severity}): {description}")
-            lines.append("")
-        
-        # Opportunities
-        opportunities = synthesis_data.get('opportunities', [])
-        if opportunities:
-            lines.append("## Opportunities")
-            lines.append("")
-            for i, opp in enumerate(opportunities, 1):
-                lines.append(f"{i}. {opp}")
-            lines.append("")
+        # Sections, skipping any that are missing or empty
+        for key, render in MARKDOWN_SECTIONS:
+            section = synthesis_data.get(key)
+            if section:
+                render(lines, section)
         
         return "\n".join(lines)
     
-    def _generate_text_report(self, synthesis_data: Dict[str, Any], target: Path) -> str:
+    def _generate_text_report(self, synthesis_data: Dict[str, Any], target: Path,
+                              now: Optional[datetime] = None) -> str:
         """Generate plain text report."""
         lines = []
         
         lines.append(f"DISCOVERY REPORT: {target.name}")
         lines.append("=" * 50)
-        lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        lines.append(f"Generated: {(now or datetime.now()):%Y-%m-%d %H:%M:%S}")
         lines.append(f"Target: {target}")
         lines.append("")
         
@@ -411,9 +450,9 @@ class DiscoveryGenerators:
         recs = synthesis_data.get('recommendations', [])
         for rec in recs:
             # Simple priority assignment based on keywords
-            if any(word in rec.lower() for word in ['security', 'critical', 'urgent', 'fix']):
+            if HIGH_PRIORITY_RE.search(rec):
                 high_priority.append(rec)
-            elif any(word in rec.lower() for word in ['improve', 'optimize', 'consider']):
+            elif MEDIUM_PRIORITY_RE.search(rec):
                 medium_priority.append(rec)
             else:
                 low_priority.append(rec)
@@ -440,22 +479,24 @@ class DiscoveryGenerators:
         
         return "\n".join(lines)
     
-    def _generate_metadata(self, synthesis_data: Dict[str, Any], target: Path) -> Dict[str, Any]:
+    def _generate_metadata(self, synthesis_data: Dict[str, Any], target: Path,
+                           now: Optional[datetime] = None) -> Dict[str, Any]:
         """Generate metadata about the discovery process."""
         return {
             'target': str(target),
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': (now or datetime.now()).isoformat(),
             'version': '1.0.0',
             'generator': 'code-builder-discovery',
             'formats_generated': list(self.output_formats),
             'synthesis_keys': list(synthesis_data.keys())
         }
     
-    def _generate_prd_id(self, synthesis_data: Dict[str, Any]) -> str:
+    def _generate_prd_id(self, synthesis_data: Dict[str, Any], now: Optional[datetime] = None) -> str:
         """Generate PRD ID in format PRD-YYYY-MM-DD-slug.
         
         Args:
             synthesis_data: Data from synthesis phase
+            now: Generation time, defaults to the current time
             
         Returns:
             PRD ID string
@@ -467,9 +508,8 @@ class DiscoveryGenerators:
         # Create slug from product name
         slug = self._create_slug(product_name)
         
-        # Get current date
-        today = datetime.now()
-        date_str = today.strftime('%Y-%m-%d')
+        # Get generation date
+        date_str = f"{(now or datetime.now()):%Y-%m-%d}"
         
         return f"PRD-{date_str}-{slug}"
     
@@ -749,13 +789,15 @@ class DiscoveryGenerators:
         
         return slug or 'product'
     
-    def _generate_prd_documentation(self, synthesis_data: Dict[str, Any], target: Path, prd_id: str) -> Dict[str, str]:
+    def _generate_prd_documentation(self, synthesis_data: Dict[str, Any], target: Path, prd_id: str,
+                                    now: Optional[datetime] = None) -> Dict[str, str]:
         """Generate PRD documentation with proper ID and ADR linking.
         
         Args:
             synthesis_data: Data from synthesis phase
             target: Target path that was analyzed
             prd_id: Generated PRD ID
+            now: Generation time, defaults to the current time
             
         Returns:
             Dictionary of PRD artifacts
@@ -772,7 +814,7 @@ class DiscoveryGenerators:
             related_adrs = self._find_related_adrs(synthesis_data, existing_adrs)
             
             # Generate main PRD file with related ADRs
-            prd_content = self._generate_prd_content(synthesis_data, prd_id, related_adrs)
+            prd_content = self._generate_prd_content(synthesis_data, prd_id, related_adrs, now=now)
             prd_file = prd_dir / f"{prd_id}.md"
             
             with open(prd_file, 'w', encoding='utf-8') as f:
@@ -821,19 +863,22 @@ class DiscoveryGenerators:
             # Silently fail for master file updates
             pass
     
-    def _generate_prd_content(self, synthesis_data: Dict[str, Any], prd_id: str, related_adrs: List[str] = None) -> str:
+    def _generate_prd_content(self, synthesis_data: Dict[str, Any], prd_id: str, related_adrs: List[str] = None,
+                              now: Optional[datetime] = None) -> str:
         """Generate PRD content.
         
         Args:
             synthesis_data: Data from synthesis phase
             prd_id: Generated PRD ID
             related_adrs: List of related ADR IDs
+            now: Generation time, defaults to the current time
             
         Returns:
             PRD content as string
         """
         if related_adrs is None:
             related_adrs = []
+        now = now or datetime.now()
         questions = synthesis_data.get('questions', {})
         detected = synthesis_data.get('detected', {})
         
@@ -857,7 +902,7 @@ id: {prd_id}
 title: {product_name}
 status: draft
 owner: product_team
-created: {datetime.now().strftime('%Y-%m-%d')}
+created: {now:%Y-%m-%d}
 links:
   prd: {prd_id}
   adr: {related_adrs}
@@ -872,7 +917,7 @@ links:
 # Product Requirements Document: {product_name}
 
 **PRD ID:** {prd_id}  
-**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
+**Generated:** {now:%Y-%m-%d %H:%M:%S}  
 **Status:** Draft
 
 ## Problem
@@ -9,10 +9,30 @@ import os
 import ast
 import json
 import sys
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
 
+def _load_yaml_file(path: Path) -> Any:
+    """Parse a YAML config file, reusing the result while the file is unchanged.
+    
+    Interviews for different question sets all read questions.yml, so parses
+    are shared process-wide, keyed by the file's size and mtime.
+    """
+    stat = path.stat()
+    return _parse_yaml_file(str(path), stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _parse_yaml_file(path: str, size: int, mtime_ns: int) -> Any:
+    """Parse a YAML file with libyaml's safe loader when available."""
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=loader)
+
+
 class DiscoveryInterview:
     """Conducts initial interview phase of code discovery."""
     
@@ -670,11 +690,9 @@ class DiscoveryInterview:
     def _load_questions(self, question_set: str = "comprehensive") -> List[Dict[str, str]]:
         """Load discovery questions from configuration."""
         try:
-            import yaml
             questions_file = Path(__file__).parent / "questions.yml"
             if questions_file.exists():
-                with open(questions_file, 'r') as f:
-                    config = yaml.safe_load(f)
+                config = _load_yaml_file(questions_file)
                 
                 # Check if specific question set is requested
                 if question_set != "comprehensive" and "question_sets" in config:
@@ -685,8 +703,7 @@ class DiscoveryInterview:
                             # Load from external file
                             set_file = Path(__file__).parent.parent.parent / set_config["file"]
                             if set_file.exists():
-                                with open(set_file, 'r') as f:
-                                    set_data = yaml.safe_load(f)
+                                set_data = _load_yaml_file(set_file)
                                 return set_data.get('questions', [])
                 
                 # Return comprehensive questions as default
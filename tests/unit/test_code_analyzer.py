@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the discovery code analyzer.
+"""
+
+import json
+import os
+import stat
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest import mock
+
+from builder.discovery import analyzer as analyzer_module
+from builder.discovery.analyzer import CodeAnalyzer
+
+
+class TestCodeAnalyzer(unittest.TestCase):
+    """Test cases for CodeAnalyzer."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.cache_dir = Path(tempfile.mkdtemp())
+        self.analyzer = CodeAnalyzer()
+        # Keep discovery_report.json out of the repo's cache directory
+        patcher = mock.patch.object(CodeAnalyzer, '_get_report_path',
+                                    return_value=self.cache_dir / 'discovery_report.json')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_phase_timings_recorded(self):
+        """Test that every phase gets an integer nanosecond timing."""
+        source = self.temp_dir / 'sample.py'
+        source.write_text("def main():\n    return 1\n")
+
+        result = self.analyzer.analyze(source, {})
+        timings = result['metrics']['phase_timings']
+
+        self.assertIn('detected', timings)
+        self.assertIn('code_patterns', timings)
+        for timing in timings.values():
+            self.assertIsInstance(timing['elapsed_ns'], int)
+            self.assertGreaterEqual(timing['elapsed_ns'], 0)
+            self.assertFalse(timing['error'])
+        self.assertNotIn('_timing', result['detected'])
+
+    def test_prefetched_source_read_once(self):
+        """Test that a prefetched target is not read again by the analysis phases."""
+        source = self.temp_dir / 'sample.py'
+        source.write_text("class A:\n    def __init__(self):\n        return None\n")
+
+        prefetched = self.analyzer.prefetch(source)
+        with mock.patch('builtins.open', side_effect=AssertionError('re-read')) as opened:
+            with mock.patch.object(CodeAnalyzer, '_load_cached_analysis', return_value=None), \
+                    mock.patch.object(CodeAnalyzer, '_store_metrics_history'):
+                result = CodeAnalyzer().analyze(source, {}, prefetched=prefetched)
+
+        opened.assert_not_called()
+        self.assertEqual(result['complexity_metrics']['class_count'], 1)
+        self.assertIn('class_based', [p['name'] for p in result['code_patterns']])
+
+    def test_prefetched_directory_lists_top_level_once(self):
+        """Test that prefetching a directory only lists its top level."""
+        (self.temp_dir / 'src').mkdir()
+        (self.temp_dir / 'package.json').write_text('{}')
+
+        with mock.patch('builder.discovery.analyzer.os.scandir', wraps=os.scandir) as scandir:
+            prefetched = self.analyzer.prefetch(self.temp_dir)
+
+        self.assertEqual([c.args[0] for c in scandir.call_args_list], [self.temp_dir])
+        self.assertTrue(prefetched)
+
+    def test_unchanged_target_reuses_cached_analysis(self):
+        """Test that a repeat analysis is served from discovery_report.json."""
+        source = self.temp_dir / 'sample.py'
+        source.write_text("def main():\n    return 1\n")
+        first = self.analyzer.analyze(source, {})
+
+        with mock.patch.object(CodeAnalyzer, '_detect_stack_and_structure') as detect:
+            second = CodeAnalyzer().analyze(source, {})
+
+        detect.assert_not_called()
+        self.assertEqual(second['metrics']['analysis_id'], first['metrics']['analysis_id'])
+        self.assertEqual(second['complexity_metrics'], first['complexity_metrics'])
+
+    def test_changed_target_invalidates_cached_analysis(self):
+        """Test that modifying the target forces a fresh analysis."""
+        source = self.temp_dir / 'sample.py'
+        source.write_text("def main():\n    return 1\n")
+        self.analyzer.analyze(source, {})
+
+        source.write_text("def main():\n    return 1\n\ndef other():\n    return 2\n")
+        result = CodeAnalyzer().analyze(source, {})
+
+        self.assertEqual(result['complexity_metrics']['function_count'], 2)
+
+    def test_report_written_with_default_permissions(self):
+        """Test that the atomically written report is not left owner-only."""
+        plain = self.cache_dir / 'plain.json'
+        plain.write_text('{}')
+
+        self.analyzer._write_discovery_report({'timestamp': '2024-01-01T00:00:00', 'analysis_id': 'a1'})
+        report = self.cache_dir / 'discovery_report.json'
+
+        self.assertEqual(stat.S_IMODE(report.stat().st_mode), stat.S_IMODE(plain.stat().st_mode))
+
+    def test_trend_slope_survives_history_eviction(self):
+        """Test that running trend sums stay exact once old entries are evicted."""
+        with mock.patch.object(CodeAnalyzer, '_write_discovery_report'):
+            for i in range(120):
+                self.analyzer._store_metrics_history({'features': {'count': i * 2}, 'total_elapsed_seconds': 1.0})
+
+        trend = self.analyzer._calculate_trend('features.count')
+
+        self.assertEqual(len(trend['values']), 100)
+        self.assertEqual(trend['first_value'], 40.0)
+        self.assertAlmostEqual(trend['slope'], 2.0)
+        self.assertEqual(trend['trend'], 'increasing')
+
+    def test_metrics_summary_performance(self):
+        """Test that the performance summary is computed from the stored history."""
+        with mock.patch.object(CodeAnalyzer, '_write_discovery_report'):
+            for elapsed in (3.0, 1.0, 2.0):
+                self.analyzer._store_metrics_history({'total_elapsed_seconds': elapsed})
+
+        summary = self.analyzer.get_metrics_summary()['performance_summary']
+
+        self.assertAlmostEqual(summary['average_analysis_time'], 2.0)
+        self.assertEqual(summary['fastest_analysis'], 1.0)
+        self.assertEqual(summary['slowest_analysis'], 3.0)
+
+    def test_failed_phase_is_flagged(self):
+        """Test that a phase raising an exception is reported as failed."""
+        def boom(target):
+            raise RuntimeError('boom')
+
+        result = self.analyzer._timed_analysis('broken', boom, self.temp_dir)
+
+        self.assertEqual(result, {'error': 'boom'})
+        self.assertIn('broken', self.analyzer._phase_ns)
+        self.assertIn('broken', self.analyzer._failed_phases)
+
+        self.analyzer._timed_analysis('working', lambda target: {}, self.temp_dir)
+        performance = self.analyzer._calculate_analysis_metrics({}, {})['performance_metrics']
+
+        self.assertEqual(performance['phases_completed'], 1)
+        self.assertEqual(performance['phases_failed'], 1)
+        self.assertGreaterEqual(performance['average_phase_time'], 0)
+
+    def test_cyclomatic_complexity_ignores_non_branches(self):
+        """Test that else/finally/default do not inflate complexity."""
+        content = "def f(a, b):\n    if a and b:\n        pass\n    else:\n        pass\n"
+
+        self.assertEqual(self.analyzer._calculate_cyclomatic_complexity(content), 3)
+
+    def test_exported_definitions_counted_once(self):
+        """Test that exported functions and classes are not double counted."""
+        content = "export function a() {}\nfunction b() {}\nexport class C {}\n"
+
+        self.assertEqual(self.analyzer._count_functions(content), 2)
+        self.assertEqual(self.analyzer._count_classes(content), 1)
+
+    def test_function_count_uses_language_pattern(self):
+        """Test that function counting only applies the file's language pattern."""
+        content = "def py_func():\n    pass\nfunction jsFunc() {}\n"
+
+        self.assertEqual(self.analyzer._count_functions(content, '.py'), 1)
+        self.assertEqual(self.analyzer._count_functions(content, '.ts'), 1)
+        self.assertEqual(self.analyzer._count_functions(content), 2)
+
+    def test_js_class_pattern_uses_constructor(self):
+        """Test that JavaScript classes are detected via constructor()."""
+        source = self.temp_dir / 'widget.js'
+        source.write_text("class Widget {\n  constructor() {}\n}\n")
+
+        names = [p['name'] for p in self.analyzer._identify_code_patterns(source)]
+
+        self.assertIn('class_based', names)
+
+    def test_invalid_package_json_is_skipped(self):
+        """Test that a malformed package.json does not break detection."""
+        (self.temp_dir / 'package.json').write_text('{not json')
+
+        self.assertIsNone(self.analyzer._load_json(self.temp_dir / 'package.json'))
+        self.assertEqual(self.analyzer._detect_test_runners(self.temp_dir), [])
+
+    def test_toml_manifests_parsed(self):
+        """Test that pyproject.toml and Cargo.toml dependencies are extracted."""
+        (self.temp_dir / 'pyproject.toml').write_text(
+            '[project]\nname = "demo"\ndependencies = ["click>=8"]\n'
+        )
+        (self.temp_dir / 'Cargo.toml').write_text('[dependencies]\nserde = "1.0"\n')
+
+        detected = self.analyzer._detect_from_config_files(self.temp_dir)
+        names = {(d['name'], d['type']) for d in detected['dependencies']}
+
+        self.assertIn(('click>=8', 'pip'), names)
+        self.assertIn(('serde', 'cargo'), names)
+        self.assertIn('Rust', detected['languages'])
+
+    def test_pom_dependencies_parsed(self):
+        """Test that Maven dependencies are read from a namespaced pom.xml."""
+        (self.temp_dir / 'pom.xml').write_text(
+            '<project xmlns="http://maven.apache.org/POM/4.0.0"><dependencies>'
+            '<dependency><groupId>junit</groupId><artifactId>junit</artifactId>'
+            '<version>4.13</version></dependency>'
+            '<dependency><groupId>org.example</groupId><artifactId>lib</artifactId></dependency>'
+            '</dependencies></project>'
+        )
+
+        dependencies = self.analyzer._parse_pom_dependencies(self.temp_dir / 'pom.xml')
+
+        self.assertEqual(dependencies, [
+            {'name': 'junit:junit', 'version': '4.13', 'type': 'maven'},
+            {'name': 'org.example:lib', 'version': 'latest', 'type': 'maven'}
+        ])
+
+    def test_requirements_test_runners_match_exact_names(self):
+        """Test that plugin packages do not count as their host runner."""
+        (self.temp_dir / 'requirements.txt').write_text(
+            "pytest-cov==4.0.0\nnosexcover\ntox>=4\n  PyTest [testing] ; python_version>'3'\n"
+        )
+
+        self.assertEqual(self.analyzer._detect_test_runners(self.temp_dir), ['pytest', 'tox'])
+
+    def test_list_entries_is_single_level_and_cached(self):
+        """Test that the shared listing covers only the top level and is cached."""
+        (self.temp_dir / '.github' / 'workflows').mkdir(parents=True)
+        (self.temp_dir / 'package.json').write_text('{}')
+
+        entries = self.analyzer._list_entries(self.temp_dir)
+
+        self.assertEqual(set(entries), {'.github', 'package.json'})
+        self.assertIs(self.analyzer._list_entries(self.temp_dir), entries)
+        self.assertEqual(self.analyzer._list_entries(self.temp_dir / 'missing'), {})
+        self.assertEqual(self.analyzer._detect_ci_systems(self.temp_dir), ['GitHub Actions'])
+
+    def test_scan_target_splits_files_and_dirs(self):
+        """Test that the top-level scan separates files from directories."""
+        (self.temp_dir / 'src').mkdir()
+        (self.temp_dir / 'lib').write_text('not a directory')
+        (self.temp_dir / 'go.mod').write_text('module example\n')
+
+        files, dirs = self.analyzer._scan_target(self.temp_dir)
+
+        self.assertEqual(dirs, {'src'})
+        self.assertEqual(files, {'lib', 'go.mod'})
+        self.assertEqual(self.analyzer._detect_project_structure(self.temp_dir), ['src', 'src_based'])
+
+    def test_lockfiles_gate_package_managers(self):
+        """Test that pnpm/yarn are only reported when their lockfile exists."""
+        (self.temp_dir / 'package.json').write_text('{}')
+
+        detected = self.analyzer._detect_from_config_files(self.temp_dir)
+
+        self.assertEqual(detected['package_managers'], ['npm'])
+
+    def test_package_json_parsed_once(self):
+        """Test that package.json is parsed once and shared by all detectors."""
+        (self.temp_dir / 'package.json').write_text(json.dumps({
+            'dependencies': {'react': '^18.0.0'},
+            'devDependencies': {'jest': '^29.0.0', 'vite': '^5.0.0'}
+        }))
+
+        with mock.patch('builder.discovery.analyzer._json_loads', wraps=analyzer_module._json_loads) as load:
+            detected = self.analyzer._detect_stack_and_structure(self.temp_dir)
+
+        self.assertEqual(load.call_count, 1)
+        self.assertIn('React', detected['frameworks'])
+        self.assertIn('Jest', detected['test_runners'])
+        self.assertIn('Vite', detected['build_tools'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the discovery engine.
+"""
+
+import copy
+import hashlib
+import os
+import stat
+import threading
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+from builder.discovery import engine as engine_module
+from builder.discovery.engine import DiscoveryEngine
+
+
+class TestDiscoveryEngine(unittest.TestCase):
+    """Test cases for DiscoveryEngine."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.cache_dir = Path(tempfile.mkdtemp())
+        self.engine = self._make_engine()
+
+    def _make_engine(self, question_set='comprehensive'):
+        """Create an engine whose discovery cache lives in cache_dir."""
+        with mock.patch('builder.overlay.paths.OverlayPaths.get_cache_dir',
+                        return_value=str(self.cache_dir)):
+            return DiscoveryEngine(root_path=str(self.temp_dir), question_set=question_set)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_cache_round_trip(self):
+        """Test that saved results load back unchanged."""
+        self.engine.cache_key = 'abc123'
+        self.engine.results = {'target': 'x', 'analysis': {'counts': [1, 2, 3]}, 'prd_id': None}
+
+        self.engine._save_to_cache()
+
+        self.assertEqual(self.engine._load_from_cache(), self.engine.results)
+        # Written via a temporary file that is renamed into place
+        self.assertEqual([p.name for p in self.engine.cache_dir.iterdir()],
+                         [self.engine._get_cache_file().name])
+
+    def test_atomic_write_replaces_existing_file(self):
+        """Test that atomic writes overwrite in place without leaving temp files."""
+        target = self.engine.cache_dir / 'entry.json'
+
+        DiscoveryEngine._write_atomic(target, b'first')
+        DiscoveryEngine._write_atomic(target, b'second')
+
+        self.assertEqual(target.read_bytes(), b'second')
+        self.assertEqual(os.listdir(self.engine.cache_dir), ['entry.json'])
+
+    def test_atomic_write_uses_default_permissions(self):
+        """Test that both atomic write paths create files like a plain open()."""
+        plain = self.engine.cache_dir / 'plain.json'
+        plain.write_bytes(b'plain')
+        expected = stat.S_IMODE(plain.stat().st_mode)
+
+        DiscoveryEngine._write_atomic(self.engine.cache_dir / 'tmpfile.json', b'data')
+        with mock.patch.object(DiscoveryEngine, '_write_via_tmpfile', return_value=False):
+            DiscoveryEngine._write_atomic(self.engine.cache_dir / 'named.json', b'data')
+
+        for name in ('tmpfile.json', 'named.json'):
+            self.assertEqual(stat.S_IMODE((self.engine.cache_dir / name).stat().st_mode), expected)
+
+    def test_large_cache_round_trip(self):
+        """Test that results above the mmap threshold load back unchanged."""
+        self.engine.cache_key = 'large'
+        self.engine.results = {'target': 'x', 'files': ['f' * 100 + str(i) for i in range(2000)]}
+
+        self.engine._save_to_cache()
+
+        self.assertEqual(self.engine._load_from_cache(), self.engine.results)
+
+    def test_corrupt_cache_is_ignored(self):
+        """Test that an unreadable cache file is treated as a miss."""
+        self.engine.cache_key = 'abc123'
+        self.engine._get_cache_file().write_text('{not json')
+
+        self.assertIsNone(self.engine._load_from_cache())
+
+    def test_cache_key_is_stable(self):
+        """Test that identical inputs produce the same cache key."""
+        source = self.temp_dir / 'app.py'
+        source.write_text('print(1)\n')
+        options = {'question_set': 'comprehensive', 'batch_kwargs': {'b': 1, 'a': 2}}
+
+        first = self.engine._generate_cache_key(source, options)
+        second = self.engine._generate_cache_key(source, dict(reversed(list(options.items()))))
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(first), 16)
+        self.assertNotEqual(first, self.engine._generate_cache_key(source, {'question_set': 'new_product'}))
+
+    def test_touch_does_not_invalidate_cache_key(self):
+        """Test that only content changes, not mtime changes, alter the key."""
+        source = self.temp_dir / 'app.py'
+        source.write_text('print(1)\n')
+        key = self.engine._generate_cache_key(source, {})
+
+        os.utime(source, (1, 1))
+        # Reload the records from file_meta.json as a fresh run would
+        self.engine._file_meta = None
+
+        self.assertEqual(self.engine._generate_cache_key(source, {}), key)
+        self.assertEqual(self.engine._file_meta[str(source)]['mtime_ns'], 1_000_000_000)
+
+        source.write_text('print(2)\n')
+        self.assertNotEqual(self.engine._generate_cache_key(source, {}), key)
+
+    def test_unchanged_stats_reuse_recorded_key(self):
+        """Test that a saved key is reused without hashing while stats are unchanged."""
+        source = self.temp_dir / 'app.py'
+        source.write_text('print(1)\n')
+        self.engine.cache_key = self.engine._generate_cache_key(source, {})
+        self.engine.results = {'target': str(source)}
+        self.engine._save_to_cache()
+
+        with mock.patch.object(DiscoveryEngine, '_file_fingerprint') as fingerprint:
+            self.assertEqual(self.engine._generate_cache_key(source, {}), self.engine.cache_key)
+        fingerprint.assert_not_called()
+
+        source.write_text('print(22)\n')
+        self.assertNotEqual(self.engine._generate_cache_key(source, {}), self.engine.cache_key)
+
+    def test_changed_inputs_hashed_in_parallel(self):
+        """Test that stale inputs are hashed up front and recorded in file_meta."""
+        docs = self.temp_dir / 'docs' / 'arch'
+        docs.mkdir(parents=True)
+        for i in range(3):
+            (docs / f'ARCH-{i}.md').write_text(f'decision {i}\n')
+        (docs / 'ARCH-3.md').mkdir()
+
+        inputs = self.engine._collect_key_inputs(self.temp_dir)
+        self.engine._hash_stale_inputs(self.engine._iter_key_inputs(inputs))
+
+        meta = self.engine._file_meta
+        self.assertEqual(meta[str(docs / 'ARCH-1.md')]['hash'], DiscoveryEngine._hash_file(docs / 'ARCH-1.md'))
+        self.assertNotIn(str(docs / 'ARCH-3.md'), meta)
+        with mock.patch.object(DiscoveryEngine, '_hash_file') as hash_file:
+            self.engine._generate_cache_key(self.temp_dir, {})
+        hash_file.assert_not_called()
+
+    def test_cache_key_computed_once_per_discover(self):
+        """Test that discovery hashes its inputs once and honours force."""
+        source = self.temp_dir / 'app.py'
+        source.write_text('print(1)\n')
+        self.engine.cache_key = self.engine._generate_cache_key(source.resolve(), {'question_set': 'comprehensive'})
+        self.engine.results = {'target': 'cached'}
+        self.engine._save_to_cache()
+
+        with mock.patch.object(DiscoveryEngine, '_generate_cache_key',
+                               wraps=self.engine._generate_cache_key) as generate:
+            _, _, cached = self.engine._begin_discovery(str(source), None, None, False)
+            _, _, forced = self.engine._begin_discovery(str(source), None, None, True)
+
+        self.assertEqual(cached, {'target': 'cached'})
+        self.assertIsNone(forced)
+        self.assertEqual(generate.call_count, 2)
+
+    def test_content_hashes_shared_across_engines(self):
+        """Test that another engine reuses in-memory hashes of unchanged files."""
+        source = self.temp_dir / 'app.py'
+        source.write_text('print(1)\n')
+        first = self.engine._file_fingerprint(source)
+        other = self._make_engine()
+        # Without the file_meta records a fresh engine would have to re-read
+        other._file_meta = {}
+
+        with mock.patch.object(DiscoveryEngine, '_hash_file') as hash_file:
+            self.assertEqual(other._file_fingerprint(source), first)
+        hash_file.assert_not_called()
+
+        source.write_text('print(22)\n')
+        self.assertNotEqual(other._file_fingerprint(source), first)
+
+    def test_docs_scanned_by_type(self):
+        """Test that doc files are bucketed per type from one listing of docs/."""
+        (self.temp_dir / 'docs' / 'prd').mkdir(parents=True)
+        (self.temp_dir / 'docs' / 'ux').mkdir()
+        (self.temp_dir / 'docs' / 'prd' / 'PRD-1.md').write_text('')
+        (self.temp_dir / 'docs' / 'prd' / 'UX-1.md').write_text('')
+        (self.temp_dir / 'docs' / 'ux' / 'UX-2.md').write_text('')
+
+        docs = self.engine._scan_docs(self.temp_dir / 'docs')
+
+        self.assertEqual(set(docs), {'prd', 'adrs', 'arch', 'exec', 'impl', 'integrations', 'tasks', 'ux'})
+        self.assertEqual(list(docs['prd']), ['PRD-1.md'])
+        self.assertEqual(list(docs['ux']), ['UX-2.md'])
+        self.assertEqual(docs['arch'], {})
+
+    def test_results_saved_in_background(self):
+        """Test that finishing discovery hands the writes to the save pool."""
+        for name in ('synthesizer', 'generators', 'validator'):
+            self.engine.__dict__[name] = mock.Mock()
+        self.engine.synthesizer.synthesize.return_value = {'insights': ['first']}
+        self.engine.generators.generate.return_value = ({}, [], None)
+        self.engine.validator.validate.return_value = {}
+        self.engine.cache_key = 'background'
+
+        save_started = threading.Event()
+        resume_save = threading.Event()
+        save_to_cache = DiscoveryEngine._save_to_cache
+
+        def delayed_save(engine):
+            save_started.set()
+            resume_save.wait(5)
+            save_to_cache(engine)
+
+        with mock.patch.object(DiscoveryEngine, '_try_auto_ctx_build'), \
+                mock.patch.object(DiscoveryEngine, '_save_legacy_context'), \
+                mock.patch.object(DiscoveryEngine, '_save_to_cache', autospec=True, side_effect=delayed_save):
+            results = self.engine._finish_discovery(self.temp_dir, {}, {})
+            expected = copy.deepcopy(results)
+            save_started.wait(5)
+            # Neither a following run nor the caller editing the returned
+            # results may change what the first one writes
+            self.engine.results = {'target': 'next run'}
+            results['synthesis']['insights'].append('edited by caller')
+            resume_save.set()
+            self.engine.flush_saves()
+
+        self.assertEqual(self.engine._load_from_cache(), expected)
+        self.assertEqual(self.engine._pending_saves, [])
+
+    def test_caller_context_written_after_discovery_survives(self):
+        """Test that contexts are on disk before discovery returns to the caller."""
+        for name in ('synthesizer', 'generators', 'validator'):
+            self.engine.__dict__[name] = mock.Mock()
+        self.engine.synthesizer.synthesize.return_value = {}
+        self.engine.generators.generate.return_value = ({}, [], None)
+        self.engine.validator.validate.return_value = {}
+        self.engine.cache_key = 'caller-context'
+        legacy_file = self.temp_dir / 'builder' / 'cache' / 'discovery_context.yml'
+
+        # Hold every save worker so anything left in the background runs late
+        release = threading.Event()
+        blockers = [engine_module.SAVE_POOL.submit(release.wait, 5) for _ in range(2)]
+        try:
+            with mock.patch.object(DiscoveryEngine, '_try_auto_ctx_build'):
+                self.engine._finish_discovery(self.temp_dir, {}, {})
+            self.assertTrue(legacy_file.exists())
+            legacy_file.write_text('product: written by caller\n')
+        finally:
+            release.set()
+            for blocker in blockers:
+                blocker.result()
+        self.engine.flush_saves()
+
+        self.assertEqual(legacy_file.read_text(), 'product: written by caller\n')
+        self.assertIsNotNone(self.engine._load_from_cache())
+
+    def test_discover_many_keeps_order_and_reports_missing(self):
+        """Test that batch discovery returns one result per target, in order."""
+        (self.temp_dir / 'a.py').write_text('a = 1\n')
+        (self.temp_dir / 'c.py').write_text('c = 1\n')
+        targets = [str(self.temp_dir / name) for name in ('a.py', 'b.py', 'c.py')]
+        options = {'verbose': True}
+
+        def finish(engine, target, interview_data, analysis_data):
+            return {'target': str(target), 'engine': engine}
+
+        with mock.patch.object(DiscoveryEngine, '_run_io_phases', return_value=({}, {})) as run_io, \
+                mock.patch.object(DiscoveryEngine, '_finish_discovery', autospec=True, side_effect=finish):
+            results = self.engine.discover_many(targets, options, max_workers=2)
+
+        self.assertEqual([r['target'] for r in results], targets)
+        self.assertIn('does not exist', results[1]['error'])
+        self.assertEqual(run_io.call_count, 2)
+        self.assertEqual(options, {'verbose': True})
+        # Each target runs on its own worker engine
+        self.assertIsNot(results[0]['engine'], self.engine)
+        self.assertIsNot(results[0]['engine'], results[2]['engine'])
+        self.assertIs(results[0]['engine'].cache_dir, self.engine.cache_dir)
+
+    def test_sensible_paths_skip_vendored_dirs(self):
+        """Test that the TypeScript fallback prunes node_modules and prefers .ts."""
+        (self.temp_dir / 'node_modules' / 'pkg').mkdir(parents=True)
+        (self.temp_dir / 'node_modules' / 'pkg' / 'index.ts').write_text('')
+        (self.temp_dir / 'web' / 'ui').mkdir(parents=True)
+        (self.temp_dir / 'web' / 'ui' / 'App.tsx').write_text('')
+
+        self.assertEqual(self.engine._find_sensible_paths(self.temp_dir),
+                         [str(self.temp_dir / 'web' / 'ui' / 'App.tsx')])
+
+        (self.temp_dir / 'web' / 'server.ts').write_text('')
+        self.assertEqual(self.engine._find_sensible_paths(self.temp_dir),
+                         [str(self.temp_dir / 'web' / 'server.ts')])
+
+    def test_important_files_skip_vendored_dirs(self):
+        """Test that the key-file walk prunes vendored trees and caps its results."""
+        (self.temp_dir / 'node_modules' / 'pkg').mkdir(parents=True)
+        (self.temp_dir / 'node_modules' / 'pkg' / 'index.js').write_text('')
+        (self.temp_dir / 'lib').mkdir()
+        (self.temp_dir / 'lib' / 'util.py').write_text('')
+        (self.temp_dir / 'lib' / 'notes.txt').write_text('')
+        (self.temp_dir / 'package.json').write_text('{}')
+
+        found = self.engine._find_important_files_in_dir(self.temp_dir)
+
+        self.assertEqual(sorted(found), [self.temp_dir / 'lib' / 'util.py', self.temp_dir / 'package.json'])
+
+        for i in range(60):
+            (self.temp_dir / f'mod{i}.ts').write_text('')
+        self.assertEqual(len(self.engine._find_important_files_in_dir(self.temp_dir)), 50)
+
+    def test_key_root_files_matched_by_name(self):
+        """Test that root config files and CI workflows feed the cache key."""
+        (self.temp_dir / '.github' / 'workflows').mkdir(parents=True)
+        (self.temp_dir / 'docker-compose.yml').mkdir()
+        for rel_path in ('tsconfig.json', 'tsconfig.build.json', 'go.sum', 'notes.md',
+                         '.github/workflows/ci.yaml', '.github/workflows/README'):
+            (self.temp_dir / rel_path).write_text('')
+        self.engine.root_path = self.temp_dir
+
+        key_files = self.engine._find_key_source_files(self.temp_dir / 'missing')
+
+        self.assertEqual(sorted(p.relative_to(self.temp_dir).as_posix() for p in key_files),
+                         ['.github/workflows/ci.yaml', 'go.sum', 'tsconfig.build.json', 'tsconfig.json'])
+
+    def test_target_source_dir_walked_once(self):
+        """Test that a target that is itself a source directory is not re-walked."""
+        (self.temp_dir / 'src').mkdir()
+        (self.temp_dir / 'src' / 'main.py').write_text('')
+        self.engine.root_path = self.temp_dir
+
+        with mock.patch.object(DiscoveryEngine, '_find_important_files_in_dir',
+                               wraps=self.engine._find_important_files_in_dir) as walk:
+            key_files = self.engine._find_key_source_files(self.temp_dir / 'src')
+
+        self.assertEqual(list(key_files), [self.temp_dir / 'src' / 'main.py'])
+        self.assertEqual(key_files[self.temp_dir / 'src' / 'main.py'].st_size, 0)
+        walked = [call.args[0] for call in walk.call_args_list]
+        self.assertEqual(walked.count(self.temp_dir / 'src'), 1)
+
+    def test_priority_paths_checked_in_order(self):
+        """Test that existing priority entry points are returned in priority order."""
+        (self.temp_dir / 'src' / 'auth').mkdir(parents=True)
+        for rel_path in ('app.ts', 'src/auth/index.ts', 'src/main.ts'):
+            (self.temp_dir / rel_path).write_text('')
+
+        self.assertEqual(self.engine._find_sensible_paths(self.temp_dir), [
+            str(self.temp_dir / 'src/main.ts'),
+            str(self.temp_dir / 'src/auth/index.ts'),
+            str(self.temp_dir / 'app.ts')
+        ])
+
+    def test_interview_built_per_engine(self):
+        """Test that each engine builds its own interview and picks up YAML edits."""
+        from builder.discovery import interview as interview_module
+        other = self._make_engine()
+        different = self._make_engine('new_product')
+
+        self.assertIs(self.engine.interview, self.engine.interview)
+        self.assertIsNot(other.interview, self.engine.interview)
+        self.assertEqual(different.interview.question_set, 'new_product')
+        self.assertIs(self.engine.analyzer, self.engine.analyzer)
+
+        questions = self.temp_dir / 'questions.yml'
+        questions.write_text('product_name: first\n')
+        self.assertEqual(interview_module._load_yaml_file(questions), {'product_name': 'first'})
+        questions.write_text('product_name: second edit\n')
+        self.assertEqual(interview_module._load_yaml_file(questions), {'product_name': 'second edit'})
+
+    def test_questions_yaml_parsed_once(self):
+        """Test that interviews for different question sets share the questions.yml parse."""
+        from builder.discovery.interview import DiscoveryInterview, _parse_yaml_file
+        _parse_yaml_file.cache_clear()
+
+        DiscoveryInterview('comprehensive')
+        DiscoveryInterview('new_product')
+
+        info = _parse_yaml_file.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertGreaterEqual(info.misses, 1)
+
+    def test_ctx_build_runs_in_subprocess_by_default(self):
+        """Test that ctx:build runs out of process in the root with a timeout."""
+        with mock.patch('subprocess.run') as run, \
+                mock.patch.object(DiscoveryEngine, '_run_ctx_build_in_process') as in_process:
+            run.return_value.returncode = 1
+            self.assertFalse(self.engine._run_ctx_build('src/index.ts'))
+
+        in_process.assert_not_called()
+        self.assertEqual(run.call_args.kwargs['cwd'], self.engine.root_path)
+        self.assertEqual(run.call_args.kwargs['timeout'], 30)
+
+    def test_ctx_build_in_process_requires_root_cwd(self):
+        """Test that the in-process opt-in only applies when root_path is the cwd."""
+        with mock.patch.dict(os.environ, {'CB_CTX_BUILD_IN_PROCESS': '1'}), \
+                mock.patch('builder.core.cli.cli.main') as main, \
+                mock.patch('subprocess.run') as run:
+            run.return_value.returncode = 1
+            with mock.patch.object(Path, 'cwd', return_value=Path(tempfile.gettempdir()) / 'elsewhere'):
+                self.engine._run_ctx_build('src/index.ts')
+            main.assert_not_called()
+            run.assert_called_once()
+
+            with mock.patch.object(Path, 'cwd', return_value=self.engine.root_path):
+                self.engine._run_ctx_build('src/index.ts')
+
+        self.assertEqual(main.call_args.kwargs['args'],
+                         ['ctx:build', 'src/index.ts', '--purpose', 'implement'])
+        run.assert_called_once()
+
+    def test_yaml_rewritten_only_when_changed(self):
+        """Test that context YAML is skipped when only the timestamp changed."""
+        context_file = self.temp_dir / 'context.yml'
+
+        self.assertTrue(self.engine._write_yaml_if_changed(context_file, {'product': 'A', 'created': '1'}))
+        self.assertFalse(self.engine._write_yaml_if_changed(context_file, {'product': 'A', 'created': '2'}))
+        self.assertTrue(self.engine._write_yaml_if_changed(context_file, {'product': 'B', 'created': '3'}))
+        self.assertIn('product: B', context_file.read_text())
+
+        context_file.unlink()
+        self.assertTrue(self.engine._write_yaml_if_changed(context_file, {'product': 'B', 'created': '4'}))
+
+        context_file.write_text('product: edited by hand\n')
+        self.assertTrue(self.engine._write_yaml_if_changed(context_file, {'product': 'B', 'created': '5'}))
+        self.assertIn('product: B', context_file.read_text())
+
+    def test_file_hash_matches_for_small_and_mapped_files(self):
+        """Test that read() and mmap hashing agree with hashing the bytes directly."""
+        for size in (0, 10, 200 * 1024):
+            source = self.temp_dir / f'data{size}.bin'
+            source.write_bytes(b'x' * size)
+            expected = engine_module.content_hasher()
+            expected.update(b'x' * size)
+
+            self.assertEqual(DiscoveryEngine._hash_file(source), expected.hexdigest())
+
+    def test_context_yaml_is_safe_loadable(self):
+        """Test that context YAML avoids Python tags for tuples, paths and sets."""
+        context_file = self.temp_dir / 'context.yml'
+        data = {'pair': (1, 2), 'path': self.temp_dir, 'tags': {'a'}, 'nested': {'b': [1]}}
+
+        self.engine._write_yaml_if_changed(context_file, data)
+
+        self.assertEqual(yaml.safe_load(context_file.read_text()), {
+            'pair': [1, 2], 'path': str(self.temp_dir), 'tags': {'a'}, 'nested': {'b': [1]}
+        })
+
+    def test_hash_encoding_is_unambiguous(self):
+        """Test that values which stringify alike still hash differently."""
+        def digest(value):
+            hasher = hashlib.sha256()
+            DiscoveryEngine._update_hash(hasher, value)
+            return hasher.hexdigest()
+
+        self.assertNotEqual(digest({'a': 1}), digest({'a': '1'}))
+        self.assertNotEqual(digest(['ab', 'c']), digest(['a', 'bc']))
+        self.assertNotEqual(digest([1.0]), digest([1]))
+        self.assertEqual(digest({'x': [1, {'y': None}]}), digest({'x': (1, {'y': None})}))
+
+
+if __name__ == '__main__':
+    unittest.main()
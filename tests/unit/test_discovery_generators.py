@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the discovery generators.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+from builder.discovery import generators as generators_module
+from builder.discovery.generators import DiscoveryGenerators
+
+
+class TestDiscoveryGenerators(unittest.TestCase):
+    """Test cases for DiscoveryGenerators."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.generators = DiscoveryGenerators()
+        self.target = Path('/tmp/project')
+
+    def test_json_report_round_trips(self):
+        """Test that the JSON report is indented and writes non-ASCII text as UTF-8."""
+        synthesis = {'summary': {'lines_of_code': 10}, 'notes': 'naïve'}
+
+        text = self.generators._generate_json_report(synthesis, self.target)
+        report = json.loads(text)
+
+        self.assertEqual(report['target'], str(self.target))
+        self.assertEqual(report['synthesis']['notes'], 'naïve')
+        self.assertIn('"notes": "naïve"', text)
+        self.assertIn('\n  "synthesis": ', text)
+
+    def test_json_report_rejects_non_json_values(self):
+        """Test that values JSON cannot represent raise instead of being stringified."""
+        synthesis = {'source': Path('/tmp/project/app.py')}
+
+        with self.assertRaises(TypeError):
+            self.generators._generate_json_report(synthesis, self.target)
+        with mock.patch.object(generators_module, 'orjson', None), self.assertRaises(TypeError):
+            self.generators._generate_json_report(synthesis, self.target)
+
+    def test_json_report_without_orjson(self):
+        """Test that the stdlib fallback produces the same text."""
+        synthesis = {'summary': {'lines_of_code': 10, 'ratio': 0.5}, 'tags': ['a', 'é'], 'empty': {}}
+        now = datetime(2024, 1, 1)
+        fast = self.generators._generate_json_report(synthesis, self.target, now=now)
+        with mock.patch.object(generators_module, 'orjson', None):
+            slow = self.generators._generate_json_report(synthesis, self.target, now=now)
+
+        self.assertEqual(fast, slow)
+
+    def test_generate_reads_clock_once(self):
+        """Test that every artifact of one run carries the same timestamp."""
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir, ignore_errors=True)
+        cwd = os.getcwd()
+        os.chdir(work_dir)
+        self.addCleanup(os.chdir, cwd)
+        synthesis = {'questions': {'product_name': 'Demo App'}, 'summary': {'lines_of_code': 10}}
+
+        with mock.patch.object(generators_module, 'datetime') as fake_datetime:
+            fake_datetime.now.return_value = datetime(2024, 1, 2, 3, 4, 5)
+            artifacts, warnings, prd_id = self.generators.generate(synthesis, self.target)
+
+        self.assertEqual(fake_datetime.now.call_count, 1)
+        self.assertEqual(warnings, [])
+        self.assertTrue(prd_id.startswith('PRD-2024-01-02-'))
+        self.assertEqual(artifacts['metadata']['timestamp'], '2024-01-02T03:04:05')
+        self.assertEqual(json.loads(artifacts['reports']['json'])['timestamp'], '2024-01-02T03:04:05')
+        self.assertIn('**Generated:** 2024-01-02 03:04:05', artifacts['reports']['markdown'])
+        self.assertIn('Generated: 2024-01-02 03:04:05', artifacts['reports']['text'])
+        self.assertIn('created: 2024-01-02', artifacts['prd'][f'{prd_id}.md'])
+
+    def test_recommendations_split_by_priority_keywords(self):
+        """Test that keywords match case-insensitively and high priority wins."""
+        synthesis = {'recommendations': [
+            'SECURITY: rotate keys', 'Consider a prefix cache', 'Improve docs', 'Add a changelog'
+        ]}
+
+        files = self.generators._generate_recommendation_files(synthesis, self.target)
+
+        self.assertEqual(files['HIGH_PRIORITY.md'].splitlines()[2:],
+                         ['1. SECURITY: rotate keys', '2. Consider a prefix cache'])
+        self.assertEqual(files['MEDIUM_PRIORITY.md'].splitlines()[2:], ['1. Improve docs'])
+        self.assertEqual(files['LOW_PRIORITY.md'].splitlines()[2:], ['1. Add a changelog'])
+
+    def test_markdown_report_renders_sections_in_order(self):
+        """Test that present sections render in table order and empty ones are skipped."""
+        synthesis = {
+            'opportunities': ['Cache results'],
+            'insights': [],
+            'summary': {'lines_of_code': 10, 'has_tests': True},
+            'patterns': {'anti_patterns': [{'name': 'god_object', 'confidence': 0.25}]},
+        }
+
+        report = self.generators._generate_markdown_report(synthesis, self.target, now=datetime(2024, 1, 1))
+        headings = [line for line in report.splitlines() if line.startswith('#')]
+
+        self.assertEqual(headings, ['# Discovery Report: project', '## Summary', '## Patterns',
+                                    '### Anti-Patterns', '## Opportunities'])
+        self.assertIn('- **Has Tests:** Yes', report)
+        self.assertIn('- god_object (confidence: 0.2)', report)
+
+
+if __name__ == '__main__':
+    unittest.main()
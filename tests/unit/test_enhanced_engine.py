@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the enhanced discovery engine.
+"""
+
+import os
+import json
+import stat
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest import mock
+
+from builder.discovery import enhanced_engine as enhanced_engine_module
+from builder.discovery.engine import DiscoveryEngine
+from builder.discovery.enhanced_engine import EnhancedDiscoveryEngine
+
+
+class TestEnhancedDiscoveryEngine(unittest.TestCase):
+    """Test cases for EnhancedDiscoveryEngine."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.out_dir = Path(tempfile.mkdtemp())
+        with mock.patch('builder.discovery.enhanced_engine.overlay_paths', None):
+            self.engine = EnhancedDiscoveryEngine(self.temp_dir, cache_dir=self.out_dir / 'cache')
+        shutil.rmtree(self.temp_dir / 'cb_docs', ignore_errors=True)
+        self.engine.output_dir = self.out_dir / 'docs'
+        self.engine.output_dir.mkdir()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        shutil.rmtree(self.out_dir, ignore_errors=True)
+
+    def test_tree_listed_once_per_analysis(self):
+        """Test that every detector shares a single scandir pass."""
+        (self.temp_dir / 'src' / 'pkg').mkdir(parents=True)
+        (self.temp_dir / 'src' / 'pkg' / 'main.py').write_text('print(1)\n')
+        (self.temp_dir / 'src' / 'test_main.py').write_text('')
+        (self.temp_dir / 'package.json').write_text('{}')
+        (self.temp_dir / '.hidden').write_text('')
+
+        with mock.patch('os.walk', side_effect=AssertionError('walked')), \
+                mock.patch('builder.discovery.enhanced_engine.os.scandir', wraps=os.scandir) as scandir:
+            with mock.patch.object(self.engine, '_update_project_state'):
+                results = self.engine.analyze_project(depth=0)
+
+        self.assertEqual(scandir.call_count, 3)
+        info = results['project_info']
+        self.assertEqual(info['file_count'], 3)
+        self.assertEqual(info['directory_count'], 2)
+        self.assertEqual(info['size_bytes'], 11)
+        self.assertEqual(results['languages']['file_counts'], {'Python': 2, 'JSON': 1})
+        self.assertEqual(results['structure']['directories']['src']['file_count'], 1)
+        self.assertEqual(results['structure']['directories'][os.path.join('src', 'pkg')]['size_bytes'], 9)
+
+    def test_walk_files_respects_depth_and_ignore(self):
+        """Test that depth limits and ignore patterns filter the shared listing."""
+        (self.temp_dir / 'a' / 'b').mkdir(parents=True)
+        (self.temp_dir / 'top.py').write_text('')
+        (self.temp_dir / 'a' / 'mid.py').write_text('')
+        (self.temp_dir / 'a' / 'b' / 'deep.py').write_text('')
+
+        self.assertEqual({p.name for p in self.engine._walk_files(2, [])}, {'top.py', 'mid.py'})
+        self.assertEqual({p.name for p in self.engine._walk_files(0, ['mid'])}, {'top.py', 'deep.py'})
+        self.assertEqual({p.name for p in self.engine._walk_files(0, ['a/b', 'x+'])}, {'top.py', 'mid.py'})
+        self.assertEqual({p.name for p in self.engine._walk_files(0, ['.'])}, set())
+
+        self.assertEqual(self.engine._count_files(2, []), 2)
+        self.assertEqual(self.engine._count_directories(1, []), 1)
+        self.assertEqual(self.engine._count_directories(0, []), 2)
+        self.assertEqual(self.engine._count_directories(0, ['a/b']), 1)
+
+    def test_package_json_count_respects_depth_and_ignore(self):
+        """Test that workspace package.json files are counted within the analysis limits."""
+        for rel in ('package.json', 'packages/web/package.json', 'packages/api/deep/package.json',
+                    'legacy/package.json', 'node_modules/dep/package.json'):
+            (self.temp_dir / rel).parent.mkdir(parents=True, exist_ok=True)
+            (self.temp_dir / rel).write_text('{}')
+
+        def count(depth, ignore_patterns):
+            return self.engine._detect_monorepo_hints(depth, ignore_patterns)['workspace_count']
+
+        self.assertEqual(count(0, []), 4)
+        self.assertEqual(count(3, []), 3)
+        self.assertEqual(count(0, ['legacy']), 3)
+        self.assertEqual(count(0, ['packages/web/package.json']), 3)
+
+    def test_vendored_and_hidden_dirs_not_descended(self):
+        """Test that skipped directories count as subdirectories but are not listed."""
+        for name in ('node_modules/pkg', '.git/objects', 'src'):
+            (self.temp_dir / name).mkdir(parents=True)
+        (self.temp_dir / 'node_modules' / 'pkg' / 'package.json').write_text('{}')
+        (self.temp_dir / '.git' / 'config').write_text('')
+        (self.temp_dir / 'src' / 'app.js').write_text('')
+
+        listed = {listing.rel_path for listing in self.engine._scan_once()}
+
+        self.assertEqual(listed, {'.', 'src'})
+        self.assertEqual(self.engine._count_directories(0, []), 3)
+        self.assertEqual([p.name for p in self.engine._walk_files(0, [])], ['app.js'])
+        self.assertTrue(self.engine._exists('.git/'))
+
+    def test_symlinks_sized_as_links(self):
+        """Test that symlinked files count their own size and broken links are not missing."""
+        (self.temp_dir / 'big.bin').write_bytes(b'x' * 1000)
+        (self.temp_dir / 'link.bin').symlink_to(self.temp_dir / 'big.bin')
+        (self.temp_dir / 'broken.bin').symlink_to(self.temp_dir / 'missing')
+
+        link_size = os.lstat(self.temp_dir / 'link.bin').st_size
+        broken_size = os.lstat(self.temp_dir / 'broken.bin').st_size
+
+        self.assertEqual(self.engine._calculate_project_size(0, []), 1000 + link_size + broken_size)
+        self.assertTrue(self.engine._exists('link.bin'))
+        self.assertFalse(self.engine._exists('broken.bin'))
+
+    def test_parallel_scan_matches_os_walk_order(self):
+        """Test that the threaded listing comes back in os.walk order."""
+        for name in ('b/x/y', 'a/z', 'c', 'a/q/r'):
+            (self.temp_dir / name).mkdir(parents=True, exist_ok=True)
+            (self.temp_dir / name / 'f.txt').write_text(name)
+
+        scanned = [(listing.path, sorted(listing.dir_names)) for listing in self.engine._scan_once()]
+        walked = [(root, sorted(dirs)) for root, dirs, _ in os.walk(self.temp_dir)]
+
+        self.assertEqual(sorted(scanned), sorted(walked))
+        self.assertEqual([path for path, _ in scanned][0], str(self.temp_dir))
+        for path, _ in scanned[1:]:
+            parent = os.path.dirname(path)
+            self.assertLess([p for p, _ in scanned].index(parent), [p for p, _ in scanned].index(path))
+
+    def test_package_json_parsed_once(self):
+        """Test that package.json is parsed once and reused while unchanged."""
+        (self.temp_dir / 'package.json').write_text(json.dumps({
+            'dependencies': {'react': '^18.0.0'},
+            'devDependencies': {'jest': '^29.0.0'}
+        }))
+        (self.temp_dir / 'requirements.txt').write_text('flask==3.0\n')
+
+        with mock.patch('builder.discovery.enhanced_engine._json_loads', wraps=enhanced_engine_module._json_loads) as load, \
+                mock.patch.object(self.engine, '_update_project_state'):
+            results = self.engine.analyze_project(depth=1)
+            self.engine._analyze_dependencies(1, [])
+
+        self.assertEqual(load.call_count, 1)
+        self.assertIn('react', results['frameworks']['detected'])
+        self.assertEqual(self.engine._analyze_dependencies(1, []), results['dependencies'])
+        self.assertEqual(results['dependencies']['external'], {'react': '^18.0.0', 'python': ['flask']})
+
+    def test_json_cache_is_bounded(self):
+        """Test that the parsed JSON cache evicts least recently used files."""
+        paths = []
+        for i in range(3):
+            paths.append(self.temp_dir / f'{i}.json')
+            paths[-1].write_text(json.dumps({'n': i}))
+
+        with mock.patch.object(enhanced_engine_module, 'JSON_CACHE_SIZE', 2):
+            self.engine._load_json(paths[0])
+            self.engine._load_json(paths[1])
+            self.engine._load_json(paths[0])
+            self.engine._load_json(paths[2])
+
+        self.assertEqual(list(self.engine._json_cache.values()), [{'n': 0}, {'n': 2}])
+
+    def test_identical_json_files_parsed_once(self):
+        """Test that JSON files with the same content share one parse."""
+        for name in ('a', 'b'):
+            (self.temp_dir / name).mkdir()
+            (self.temp_dir / name / 'package.json').write_text('{"name": "pkg"}')
+
+        with mock.patch('builder.discovery.enhanced_engine._json_loads', wraps=enhanced_engine_module._json_loads) as load:
+            first = self.engine._load_json(self.temp_dir / 'a' / 'package.json')
+            second = self.engine._load_json(self.temp_dir / 'b' / 'package.json')
+            (self.temp_dir / 'a' / 'package.json').write_text('{"name": "pkh"}')
+            changed = self.engine._load_json(self.temp_dir / 'a' / 'package.json')
+
+        self.assertEqual(load.call_count, 2)
+        self.assertIs(first, second)
+        self.assertEqual(changed, {'name': 'pkh'})
+
+    def test_unchanged_tree_reuses_stored_results(self):
+        """Test that a repeat analysis of an unchanged tree skips the detectors."""
+        (self.temp_dir / 'pkg').mkdir()
+        (self.temp_dir / 'pkg' / 'main.py').write_text('print(1)\n')
+
+        with mock.patch.object(self.engine, '_update_project_state'):
+            first = self.engine.analyze_project(depth=0)
+            with mock.patch.object(self.engine, '_run_analysis') as run:
+                second = self.engine.analyze_project(depth=0, ci_mode=True)
+
+            run.assert_not_called()
+            self.assertEqual(second['structure'], first['structure'])
+            self.assertTrue(second['metadata']['ci_mode'])
+
+            (self.temp_dir / 'pkg' / 'main.py').write_text('print(12)\n')
+            third = self.engine.analyze_project(depth=0)
+            self.assertEqual(third['project_info']['size_bytes'], first['project_info']['size_bytes'] + 1)
+
+            other_depth = self.engine.analyze_project(depth=1)
+            self.assertEqual(other_depth['languages']['file_counts'], {})
+
+    def test_stored_results_keep_default_permissions(self):
+        """Test that stored results are created like a plain open(), not owner-only."""
+        plain = self.out_dir / 'plain.json'
+        plain.write_text('{}')
+        cache_path = self.out_dir / 'results.json'
+        self.engine.analysis_results = {'metadata': {'depth': 0}}
+
+        with mock.patch.object(DiscoveryEngine, '_write_via_tmpfile', return_value=False):
+            self.engine._write_cached_results(cache_path)
+
+        self.assertEqual(json.loads(cache_path.read_text()), {'metadata': {'depth': 0}})
+        self.assertEqual(stat.S_IMODE(cache_path.stat().st_mode), stat.S_IMODE(plain.stat().st_mode))
+
+    def test_in_tree_outputs_do_not_invalidate_stored_results(self):
+        """Test that the engine's own report and cache writes keep the fingerprint stable."""
+        (self.temp_dir / 'main.py').write_text('print(1)\n')
+        with mock.patch('builder.discovery.enhanced_engine.overlay_paths', None):
+            engine = EnhancedDiscoveryEngine(self.temp_dir)
+
+        with mock.patch.object(engine, '_run_analysis', wraps=engine._run_analysis) as run:
+            engine.analyze_project(depth=0)
+            engine.analyze_project(depth=0)
+
+        self.assertEqual(run.call_count, 1)
+        self.assertTrue((self.temp_dir / 'cb_docs' / 'discovery' / 'report.json').exists())
+
+    def test_root_indicators_answered_from_listing(self):
+        """Test that top-level indicator checks use the scan instead of stat calls."""
+        (self.temp_dir / 'pages').mkdir()
+        (self.temp_dir / 'src').mkdir()
+        (self.temp_dir / 'src' / 'App.vue').write_text('')
+        (self.temp_dir / 'Gemfile').symlink_to(self.temp_dir / 'missing')
+
+        original_exists = Path.exists
+        probed = []
+
+        def exists(path):
+            probed.append(path.relative_to(self.temp_dir).as_posix())
+            return original_exists(path)
+
+        with mock.patch.object(Path, 'exists', exists):
+            frameworks = self.engine._detect_frameworks(0, [])['detected']
+            self.assertTrue(self.engine._exists('pages/'))
+            self.assertFalse(self.engine._exists('Gemfile'))
+
+        self.assertIn('vue', frameworks)
+        self.assertIn('next', frameworks)
+        self.assertNotIn('rails', frameworks)
+        self.assertTrue(probed)
+        self.assertTrue(all('/' in path for path in probed))
+        self.assertEqual(len(probed), len(set(probed)))
+
+    def test_shared_configs_checked_once(self):
+        """Test that tools sharing a config file resolve to their preferred indicator."""
+        (self.temp_dir / 'setup.cfg').write_text('')
+        (self.temp_dir / 'pyproject.toml').write_text('')
+        (self.temp_dir / '.flake8').write_text('')
+
+        with mock.patch.object(self.engine, '_exists', wraps=self.engine._exists) as exists:
+            config_files = self.engine._detect_lint_formatters(0, [])['config_files']
+
+        self.assertEqual(config_files, {
+            'pylint': 'setup.cfg', 'flake8': '.flake8', 'black': 'pyproject.toml',
+            'isort': 'pyproject.toml', 'mypy': 'pyproject.toml'
+        })
+        checked = [call.args[0] for call in exists.call_args_list]
+        self.assertEqual(len(checked), len(set(checked)))
+
+    def test_report_json_sorted_and_loadable(self):
+        """Test that report.json is written with sorted keys and round-trips."""
+        (self.temp_dir / 'main.py').write_text('print(1)\n')
+
+        with mock.patch.object(self.engine, '_update_project_state'):
+            results = self.engine.analyze_project(depth=1)
+
+        text = (self.engine.output_dir / 'report.json').read_text(encoding='utf-8')
+        report = json.loads(text)
+        self.assertEqual(list(report), sorted(report))
+        self.assertEqual(report['languages']['file_counts'], {'Python': 1})
+        self.assertEqual(report['metadata']['analysis_depth'], results['metadata']['analysis_depth'])
+        self.assertIn('\n  "configuration": ', text)
+
+
+if __name__ == '__main__':
+    unittest.main()